@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Metrics Rollups
+
+Hourly and daily aggregates of the metrics store, maintained incrementally,
+so reports read O(hours) precomputed rows instead of raw samples.
+
+- Per bucket and metric: count, sum, min, max, sum of squares and a
+  log-bucketed histogram sketch for p95 (~5% relative error)
+- Completed hours are folded in from samples stored since the last update
+  and appended as fixed-width records; completed days are merged from
+  their hours
+- Window summaries combine hourly rows with the still-open hour, read raw
+- Aggregates are mergeable, so 24h / 7d / 30d windows cost the same to read
+
+Usage:
+    python3 ai_ops/metrics_rollup.py update
+    python3 ai_ops/metrics_rollup.py summary --hours 168
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from ai_ops.metrics_store import MetricsStore, _to_epoch, _to_datetime
+except ImportError:
+    from metrics_store import MetricsStore, _to_epoch, _to_datetime
+
+logger = logging.getLogger('metrics_store')
+
+DEFAULT_ROLLUP_PATH = Path('ai_ops/models/metrics_rollup')
+
+LEVELS = {'hour': 3600, 'day': 86400}
+STATS = ['count', 'sum', 'min', 'max', 'sumsq']
+
+# p95 sketch: bin 0 holds values <= SKETCH_MIN, then log-spaced bins of ratio SKETCH_GAMMA
+SKETCH_MIN = 1e-2
+SKETCH_GAMMA = 1.1
+SKETCH_BINS = 2 + int(np.ceil(np.log(1e5 / SKETCH_MIN) / np.log(SKETCH_GAMMA)))
+
+
+def sketch_bins(values: np.ndarray) -> np.ndarray:
+    """Sketch bin index per value (NaN -> -1)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bins = 1 + np.floor(np.log(values / SKETCH_MIN) / np.log(SKETCH_GAMMA))
+    bins = np.where(values <= SKETCH_MIN, 0, np.clip(bins, 1, SKETCH_BINS - 1))
+    return np.where(np.isnan(values), -1, bins).astype(np.int64)
+
+
+def sketch_quantile(counts: np.ndarray, q: float) -> float:
+    """Approximate quantile from sketch counts (bin midpoint)"""
+    total = counts.sum()
+    if total == 0:
+        return float('nan')
+    i = int(np.searchsorted(np.cumsum(counts), q * total, side='left'))
+    if i == 0:
+        return 0.0
+    low = SKETCH_MIN * SKETCH_GAMMA ** (i - 1)
+    return float(low * (1 + SKETCH_GAMMA) / 2)
+
+
+class Aggregate:
+    """Mergeable per-bucket aggregates: stats (n, k, 5) and sketch (n, k, SKETCH_BINS)"""
+
+    def __init__(self, starts: np.ndarray, stats: np.ndarray, sketch: np.ndarray):
+        self.starts = starts
+        self.stats = stats
+        self.sketch = sketch
+
+    @classmethod
+    def empty(cls, n_columns: int) -> 'Aggregate':
+        return cls(np.empty(0), np.empty((0, n_columns, len(STATS))),
+                   np.empty((0, n_columns, SKETCH_BINS), dtype=np.uint32))
+
+    @classmethod
+    def from_samples(cls, timestamps: np.ndarray, values: np.ndarray, bucket_seconds: int) -> 'Aggregate':
+        """Aggregate raw samples into buckets of `bucket_seconds`"""
+        k = values.shape[1]
+        if len(timestamps) == 0:
+            return cls.empty(k)
+
+        buckets = np.floor(timestamps / bucket_seconds) * bucket_seconds
+        starts, inverse = np.unique(buckets, return_inverse=True)
+        n = len(starts)
+
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0.0)
+        rows = np.repeat(inverse, k)
+        cols = np.tile(np.arange(k), len(values))
+
+        stats = np.zeros((n, k, len(STATS)))
+        stats[:, :, 2] = np.inf
+        stats[:, :, 3] = -np.inf
+        np.add.at(stats[:, :, 0], (rows, cols), present.ravel())
+        np.add.at(stats[:, :, 1], (rows, cols), filled.ravel())
+        np.fmin.at(stats[:, :, 2], (rows, cols), values.ravel())
+        np.fmax.at(stats[:, :, 3], (rows, cols), values.ravel())
+        np.add.at(stats[:, :, 4], (rows, cols), (filled ** 2).ravel())
+
+        sketch = np.zeros((n, k, SKETCH_BINS), dtype=np.uint32)
+        bins = sketch_bins(values).ravel()
+        valid = bins >= 0
+        np.add.at(sketch, (rows[valid], cols[valid], bins[valid]), 1)
+
+        return cls(starts, stats, sketch)
+
+    def regroup(self, bucket_seconds: int) -> 'Aggregate':
+        """Merge buckets into coarser ones (e.g. hours -> days)"""
+        if len(self) == 0:
+            return self
+        buckets = np.floor(self.starts / bucket_seconds) * bucket_seconds
+        starts, inverse = np.unique(buckets, return_inverse=True)
+        n, k = len(starts), self.stats.shape[1]
+
+        stats = np.zeros((n, k, len(STATS)))
+        stats[:, :, 2] = np.inf
+        stats[:, :, 3] = -np.inf
+        for i in (0, 1, 4):
+            np.add.at(stats[:, :, i], inverse, self.stats[:, :, i])
+        np.fmin.at(stats[:, :, 2], inverse, self.stats[:, :, 2])
+        np.fmax.at(stats[:, :, 3], inverse, self.stats[:, :, 3])
+
+        sketch = np.zeros((n, k, SKETCH_BINS), dtype=np.uint32)
+        np.add.at(sketch, inverse, self.sketch)
+        return Aggregate(starts, stats, sketch)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: slice) -> 'Aggregate':
+        return Aggregate(self.starts[index], self.stats[index], self.sketch[index])
+
+    def concat(self, other: 'Aggregate') -> 'Aggregate':
+        return Aggregate(np.concatenate([self.starts, other.starts]),
+                         np.concatenate([self.stats, other.stats]),
+                         np.concatenate([self.sketch, other.sketch]))
+
+
+class MetricsRollup:
+    """
+    Hourly / daily aggregates of a MetricsStore.
+
+    Files per level: `<level>.stats.f64` records of [bucket_start, k x 5 stats]
+    and `<level>.sketch.u32` records of k x SKETCH_BINS counts, appended in
+    step. `state.json` tracks how far each level has been rolled up.
+    Samples stored after their hour was rolled up (late arrivals) are not
+    added to that hour.
+    """
+
+    def __init__(self, store: MetricsStore, root: Path = DEFAULT_ROLLUP_PATH):
+        self.store = store
+        self.columns = store.columns
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        self.state_path = self.root / 'state.json'
+        self.state = {'columns': self.columns, 'sketch': [SKETCH_MIN, SKETCH_GAMMA, SKETCH_BINS],
+                      'hour_until': None, 'day_until': None}
+        if self.state_path.exists():
+            with open(self.state_path, 'r') as f:
+                state = json.load(f)
+            if state.get('columns') == self.state['columns'] and state.get('sketch') == self.state['sketch']:
+                self.state = state
+            else:
+                logger.warning("Rollup layout changed, rebuilding from the metrics store")
+                for level in LEVELS:
+                    for path in self._paths(level):
+                        path.unlink(missing_ok=True)
+
+    # ==================== Storage ====================
+
+    def _paths(self, level: str) -> Tuple[Path, Path]:
+        return self.root / f"{level}.stats.f64", self.root / f"{level}.sketch.u32"
+
+    def _append(self, level: str, agg: Aggregate) -> None:
+        if len(agg) == 0:
+            return
+        stats_path, sketch_path = self._paths(level)
+        records = np.concatenate([agg.starts[:, None], agg.stats.reshape(len(agg.starts), -1)], axis=1)
+        with open(stats_path, 'ab') as f:
+            f.write(records.astype('<f8').tobytes())
+        with open(sketch_path, 'ab') as f:
+            f.write(agg.sketch.astype('<u4').tobytes())
+
+    def _layout(self, level: str) -> Tuple[int, int, np.ndarray]:
+        """(stats record width, sketch record width, bucket starts of complete records)"""
+        k = len(self.columns)
+        stats_width, sketch_width = 1 + k * len(STATS), k * SKETCH_BINS
+        stats_path, sketch_path = self._paths(level)
+        if not stats_path.exists() or not sketch_path.exists():
+            return stats_width, sketch_width, np.empty(0)
+
+        # Ignore a torn tail in either file
+        n = min(stats_path.stat().st_size // (8 * stats_width), sketch_path.stat().st_size // (4 * sketch_width))
+        if n == 0:
+            return stats_width, sketch_width, np.empty(0)
+        records = np.memmap(stats_path, dtype='<f8', mode='r', shape=(n, stats_width))
+        return stats_width, sketch_width, np.array(records[:, 0])
+
+    def read(self, level: str, start=None, end=None) -> Aggregate:
+        """Stored buckets of a level with start <= bucket_start < end (reads only that range)"""
+        k = len(self.columns)
+        stats_width, sketch_width, starts = self._layout(level)
+        first = int(np.searchsorted(starts, _to_epoch(start), side='left')) if start is not None else 0
+        last = int(np.searchsorted(starts, _to_epoch(end), side='left')) if end is not None else len(starts)
+        if last <= first:
+            return Aggregate.empty(k)
+
+        stats_path, sketch_path = self._paths(level)
+        count = last - first
+        records = np.fromfile(stats_path, dtype='<f8', count=count * stats_width,
+                              offset=first * stats_width * 8).reshape(count, stats_width)
+        sketch = np.fromfile(sketch_path, dtype='<u4', count=count * sketch_width,
+                             offset=first * sketch_width * 4).reshape(count, k, SKETCH_BINS)
+        return Aggregate(records[:, 0], records[:, 1:].reshape(count, k, len(STATS)), sketch)
+
+    def _truncate(self, level: str, since: Optional[float]) -> None:
+        """
+        Drop buckets starting at or after `since` (and torn tails), so a
+        crash between appending and saving state cannot duplicate buckets.
+        """
+        stats_width, sketch_width, starts = self._layout(level)
+        keep = int(np.searchsorted(starts, since, side='left')) if since is not None else 0
+        stats_path, sketch_path = self._paths(level)
+        for path, size in ((stats_path, keep * stats_width * 8), (sketch_path, keep * sketch_width * 4)):
+            if path.exists() and path.stat().st_size != size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+
+    def _save_state(self) -> None:
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    # ==================== Updates ====================
+
+    def update(self, now: Optional[datetime] = None) -> int:
+        """
+        Roll up hours (and days) completed since the last update.
+
+        Reads only samples stored since the last completed hour.
+        Returns the number of hourly buckets written.
+        """
+        hour = LEVELS['hour']
+        now_ts = _to_epoch(now) if now is not None else datetime.now(timezone.utc).timestamp()
+        closed_until = np.floor(now_ts / hour) * hour  # Start of the open hour
+
+        with self._lock:
+            since = self.state['hour_until']
+            self._truncate('hour', since)
+            if since is not None and since >= closed_until:
+                return 0
+
+            written = 0
+            pending = None  # Last bucket of the previous chunk, which may continue in the next
+            for timestamps, values in self.store.iter_chunks(start=since, end=closed_until):
+                closed = timestamps < closed_until
+                if since is not None:
+                    closed &= timestamps >= since
+                agg = Aggregate.from_samples(timestamps[closed], values[closed], hour)
+                if len(agg) == 0:
+                    continue
+
+                if pending is not None and pending.starts[0] == agg.starts[0]:
+                    agg = pending.concat(agg).regroup(hour)
+                elif pending is not None:
+                    self._append('hour', pending)
+                    written += 1
+                self._append('hour', agg[:-1])
+                written += len(agg) - 1
+                pending = agg[-1:]
+
+            if pending is not None:
+                self._append('hour', pending)
+                written += 1
+
+            self.state['hour_until'] = float(closed_until)
+            self._roll_days()
+            self._save_state()
+
+        if written:
+            logger.info(f"✓ Rolled up {written} hour(s) of metrics")
+        return written
+
+    def _roll_days(self) -> None:
+        """Merge hourly buckets of completed days into daily buckets"""
+        day = LEVELS['day']
+        days_until = np.floor(self.state['hour_until'] / day) * day
+        since = self.state['day_until']
+        if since is not None and since >= days_until:
+            return
+        hours = self.read('hour', start=since, end=days_until)
+        self._truncate('day', since)
+        self._append('day', hours.regroup(day))
+        self.state['day_until'] = float(days_until)
+
+    # ==================== Queries ====================
+
+    def window(self, start, end=None, use_days: bool = True) -> Aggregate:
+        """
+        Buckets from the hour containing `start` up to `end` (default now):
+        daily rows for whole rolled-up days (if `use_days`), hourly rows for
+        the rest, and the open hour aggregated from raw samples.
+        """
+        hour, day = LEVELS['hour'], LEVELS['day']
+        cursor = np.floor(_to_epoch(start) / hour) * hour
+        end_ts = _to_epoch(end) if end is not None else None
+
+        parts = []
+        day_until = self.state['day_until']
+        if use_days and day_until is not None:
+            first_day = np.ceil(cursor / day) * day
+            last_day = min(day_until, np.floor(end_ts / day) * day) if end_ts is not None else day_until
+            if last_day > first_day:
+                parts.append(self.read('hour', start=cursor, end=first_day))
+                parts.append(self.read('day', start=first_day, end=last_day))
+                cursor = last_day
+        parts.append(self.read('hour', start=cursor, end=end_ts))
+
+        hour_until = self.state['hour_until']
+        if end_ts is None or hour_until is None or end_ts > hour_until:
+            tail_start = max(cursor, hour_until) if hour_until is not None else cursor
+            timestamps, values = self.store.query(start=tail_start, end=end_ts)
+            parts.append(Aggregate.from_samples(timestamps, values, hour))
+
+        agg = parts[0]
+        for part in parts[1:]:
+            agg = agg.concat(part)
+        return agg
+
+    def summary(self, start, end=None) -> Dict[str, Dict[str, float]]:
+        """Per-metric count / mean / std / min / max / p95 over a window"""
+        agg = self.window(start, end)
+        stats = agg.stats
+        count = stats[:, :, 0].sum(axis=0)
+        total = stats[:, :, 1].sum(axis=0)
+        sumsq = stats[:, :, 4].sum(axis=0)
+        sketch = agg.sketch.sum(axis=0)
+
+        result = {}
+        for i, column in enumerate(self.columns):
+            n = count[i]
+            if n == 0:
+                result[column] = {'count': 0, 'mean': float('nan'), 'std': float('nan'),
+                                  'min': float('nan'), 'max': float('nan'), 'p95': float('nan')}
+                continue
+            mean = total[i] / n
+            variance = max(0.0, (sumsq[i] - n * mean ** 2) / (n - 1)) if n > 1 else 0.0
+            low, high = np.nanmin(stats[:, i, 2]), np.nanmax(stats[:, i, 3])
+            result[column] = {
+                'count': int(n),
+                'mean': float(mean),
+                'std': float(np.sqrt(variance)),
+                'min': float(low),
+                'max': float(high),
+                'p95': float(np.clip(sketch_quantile(sketch[i], 0.95), low, high))
+            }
+        return result
+
+    def series(self, start, end=None, level: str = 'hour') -> pd.DataFrame:
+        """Per-bucket means with a naive-UTC `timestamp` column (hourly or daily)"""
+        agg = self.window(start, end, use_days=level != 'hour')
+        if level != 'hour':
+            agg = agg.regroup(LEVELS[level])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = agg.stats[:, :, 1] / agg.stats[:, :, 0]
+        df = pd.DataFrame(means, columns=self.columns)
+        df.insert(0, 'timestamp', _to_datetime(agg.starts))
+        df['samples'] = agg.stats[:, 0, 0].astype(np.int64) if len(agg.starts) else np.empty(0, dtype=np.int64)
+        return df
+
+
+def main():
+    """Main entry point"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Hourly / daily metrics rollups')
+    parser.add_argument('command', choices=['update', 'summary'], help='Roll up completed hours, or print a window summary')
+    parser.add_argument('--hours', type=int, default=24, help='Summary window')
+    args = parser.parse_args()
+
+    rollup = MetricsRollup(MetricsStore())
+    if args.command == 'update':
+        written = rollup.update()
+        print(f"Rolled up {written} hour(s); hours until "
+              f"{rollup.state['hour_until'] and datetime.utcfromtimestamp(rollup.state['hour_until'])}")
+        return
+
+    rollup.update()
+    summary = rollup.summary(datetime.utcnow() - timedelta(hours=args.hours))
+    print(json.dumps({k: {s: round(v, 3) for s, v in stats.items()} for k, stats in summary.items()}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Metrics History Store
+
+Shared append-only store of collected metrics for Ops Brain, the Anomaly
+Trainer and the Daily Report.
+
+- One partition file per UTC day of fixed-width float64 records
+  (timestamp + one column per metric), plus a schema file
+- O(1) appends: a sample is a single write to the end of its day's file
+- Range queries open only the partitions overlapping the window and
+  return aligned arrays or a DataFrame
+- Chunked iteration for streaming consumers (one partition in memory)
+- Migration from the legacy metrics_history.json
+
+Usage:
+    python3 ai_ops/metrics_store.py migrate
+    python3 ai_ops/metrics_store.py info
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import argparse
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('metrics_store')
+
+DEFAULT_STORE_PATH = Path('ai_ops/models/metrics_store')
+LEGACY_HISTORY_PATH = Path('ai_ops/models/metrics_history.json')
+
+# Metrics dataclass fields collected by Ops Brain
+DEFAULT_COLUMNS = [
+    'cpu_usage',
+    'memory_usage',
+    'p95_latency',
+    'p99_latency',
+    'error_rate',
+    'request_rate',
+    'active_instances',
+    'database_query_time',
+    'cost_current'
+]
+
+
+def _to_epoch(timestamp) -> float:
+    """ISO string / datetime (naive = UTC) / pandas Timestamp -> unix seconds"""
+    if isinstance(timestamp, (int, float, np.floating)):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    raise ValueError(f"Unsupported timestamp: {timestamp!r}")
+
+
+def _to_datetime(timestamps: np.ndarray) -> pd.DatetimeIndex:
+    """Unix seconds -> naive-UTC datetimes, rounded to the microsecond"""
+    return pd.to_datetime(np.round(timestamps * 1e6).astype(np.int64), unit='us')
+
+
+class MetricsStore:
+    """
+    Day-partitioned, append-only metrics history.
+
+    Records are `[timestamp, *columns]` as little-endian float64, so a
+    partition is read with a single np.fromfile. A torn trailing record
+    (crash mid-write) is ignored on read.
+    """
+
+    def __init__(self, root: Path = DEFAULT_STORE_PATH, columns: Optional[List[str]] = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        schema_path = self.root / 'schema.json'
+        if schema_path.exists():
+            with open(schema_path, 'r') as f:
+                self.columns = json.load(f)['columns']
+            if columns is not None and list(columns) != self.columns:
+                raise ValueError(f"Metrics store at {self.root} has columns {self.columns}, not {list(columns)}")
+        else:
+            self.columns = list(columns or DEFAULT_COLUMNS)
+            with open(schema_path, 'w') as f:
+                json.dump({'columns': self.columns, 'dtype': '<f8', 'partition': 'utc_day'}, f, indent=2)
+
+        self.record_width = 1 + len(self.columns)
+
+    # ==================== Writes ====================
+
+    def _partition_path(self, day: str) -> Path:
+        return self.root / f"{day}.f64"
+
+    def _encode(self, sample: Dict) -> Tuple[str, np.ndarray]:
+        ts = _to_epoch(sample['timestamp'])
+        row = np.empty(self.record_width, dtype='<f8')
+        row[0] = ts
+        for i, column in enumerate(self.columns, start=1):
+            value = sample.get(column)
+            row[i] = np.nan if value is None else float(value)
+        day = datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%d')
+        return day, row
+
+    def append(self, sample: Dict) -> None:
+        """Append one sample ({'timestamp': ..., metric: value, ...})"""
+        self.append_many([sample])
+
+    def append_many(self, samples: Iterable[Dict]) -> int:
+        """Append samples, one write per touched partition; returns the number written"""
+        by_day: Dict[str, List[np.ndarray]] = {}
+        for sample in samples:
+            day, row = self._encode(sample)
+            by_day.setdefault(day, []).append(row)
+
+        with self._lock:
+            for day, rows in by_day.items():
+                with open(self._partition_path(day), 'ab') as f:
+                    f.write(np.stack(rows).tobytes())
+
+        return sum(len(rows) for rows in by_day.values())
+
+    # ==================== Reads ====================
+
+    def partitions(self) -> List[str]:
+        """Days held, oldest first"""
+        return sorted(p.stem for p in self.root.glob('*.f64'))
+
+    def _read_partition(self, day: str) -> np.ndarray:
+        path = self._partition_path(day)
+        if not path.exists():
+            return np.empty((0, self.record_width))
+        data = np.fromfile(path, dtype='<f8')
+        usable = len(data) - len(data) % self.record_width
+        return data[:usable].reshape(-1, self.record_width)
+
+    def query(
+        self,
+        start=None,
+        end=None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Samples with start <= timestamp <= end, in time order.
+
+        Args:
+            start, end: Window bounds (datetime / ISO string / unix seconds; None = unbounded)
+            columns: Subset of columns (default all)
+
+        Returns:
+            (timestamps in unix seconds, values of shape (n, len(columns)))
+        """
+        start_ts, end_ts, days = self._window(start, end)
+
+        blocks = [self._read_partition(day) for day in days]
+        data = np.concatenate(blocks) if blocks else np.empty((0, self.record_width))
+        data = self._select(data, start_ts, end_ts, columns)
+        return data[:, 0], data[:, 1:]
+
+    def iter_chunks(
+        self,
+        start=None,
+        end=None,
+        columns: Optional[List[str]] = None,
+        chunk_size: int = 2048
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Like query(), but yields (timestamps, values) chunks of at most
+        `chunk_size` samples, holding one partition in memory at a time.
+        """
+        start_ts, end_ts, days = self._window(start, end)
+        for day in days:
+            data = self._select(self._read_partition(day), start_ts, end_ts, columns)
+            for offset in range(0, len(data), chunk_size):
+                chunk = data[offset:offset + chunk_size]
+                yield chunk[:, 0], chunk[:, 1:]
+
+    def _window(self, start, end) -> Tuple[float, float, List[str]]:
+        """Epoch bounds and the partitions overlapping them"""
+        start_ts = _to_epoch(start) if start is not None else -np.inf
+        end_ts = _to_epoch(end) if end is not None else np.inf
+
+        days = self.partitions()
+        if start is not None:
+            first = datetime.fromtimestamp(start_ts, tz=timezone.utc).strftime('%Y-%m-%d')
+            days = [d for d in days if d >= first]
+        if end is not None:
+            last = datetime.fromtimestamp(end_ts, tz=timezone.utc).strftime('%Y-%m-%d')
+            days = [d for d in days if d <= last]
+        return start_ts, end_ts, days
+
+    def _select(self, data: np.ndarray, start_ts: float, end_ts: float, columns: Optional[List[str]]) -> np.ndarray:
+        """Filter records to the window, sort by time, keep timestamp + requested columns"""
+        data = data[(data[:, 0] >= start_ts) & (data[:, 0] <= end_ts)]
+
+        if len(data) and np.any(np.diff(data[:, 0]) < 0):
+            data = data[np.argsort(data[:, 0], kind='stable')]
+
+        idx = [0] + [self.columns.index(c) + 1 for c in (columns or self.columns)]
+        return data[:, idx]
+
+    def query_frame(self, start=None, end=None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Like query(), as a DataFrame with a naive-UTC `timestamp` column"""
+        timestamps, values = self.query(start, end, columns)
+        df = pd.DataFrame(values, columns=columns or self.columns)
+        df.insert(0, 'timestamp', _to_datetime(timestamps))
+        return df
+
+    def latest(self, n: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """The most recent `n` samples, reading partitions newest-first until enough are found"""
+        blocks, found = [], 0
+        for day in reversed(self.partitions()):
+            block = self._read_partition(day)
+            blocks.append(block)
+            found += len(block)
+            if found >= n:
+                break
+
+        if not blocks:
+            return self.query_frame(0, 0, columns)
+
+        data = np.concatenate(blocks[::-1])
+        data = data[np.argsort(data[:, 0], kind='stable')][-n:] if n > 0 else data[:0]
+        idx = [self.columns.index(c) + 1 for c in (columns or self.columns)]
+        df = pd.DataFrame(data[:, idx], columns=columns or self.columns)
+        df.insert(0, 'timestamp', _to_datetime(data[:, 0]))
+        return df
+
+    def count(self) -> int:
+        """Samples held (from file sizes)"""
+        record_bytes = self.record_width * 8
+        return sum(p.stat().st_size // record_bytes for p in self.root.glob('*.f64'))
+
+    # ==================== Maintenance ====================
+
+    def drop_before(self, day: str) -> int:
+        """Delete whole partitions older than `day` (YYYY-MM-DD); returns partitions removed"""
+        removed = 0
+        with self._lock:
+            for partition in self.partitions():
+                if partition < day:
+                    os.remove(self._partition_path(partition))
+                    removed += 1
+        return removed
+
+    def import_json(self, history_path: Path = LEGACY_HISTORY_PATH, rename: bool = True) -> int:
+        """
+        Import a legacy metrics_history.json (list of Metrics dicts).
+        Samples already in the store (same timestamp) are skipped.
+        """
+        history_path = Path(history_path)
+        if not history_path.exists():
+            return 0
+
+        with open(history_path, 'r') as f:
+            history = json.load(f)
+
+        existing = set(self.query()[0].tolist()) if self.count() else set()
+        new = [s for s in history if 'timestamp' in s and _to_epoch(s['timestamp']) not in existing]
+        imported = self.append_many(new)
+
+        if rename:
+            history_path.rename(history_path.with_suffix(history_path.suffix + '.migrated'))
+        logger.info(f"✓ Imported {imported} metrics samples from {history_path}")
+        return imported
+
+
+def main():
+    """Main entry point"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='NeuroPilot metrics history store')
+    parser.add_argument('command', choices=['migrate', 'info'], help='Import legacy JSON history, or show store info')
+    parser.add_argument('--store', default=str(DEFAULT_STORE_PATH), help='Store directory')
+    parser.add_argument('--history', default=str(LEGACY_HISTORY_PATH), help='Legacy metrics_history.json')
+    parser.add_argument('--keep', action='store_true', help='Do not rename the JSON file after import')
+    args = parser.parse_args()
+
+    store = MetricsStore(Path(args.store))
+
+    if args.command == 'migrate':
+        imported = store.import_json(Path(args.history), rename=not args.keep)
+        print(f"Imported {imported} samples into {store.root}")
+
+    partitions = store.partitions()
+    print(json.dumps({
+        'root': str(store.root),
+        'columns': store.columns,
+        'samples': store.count(),
+        'partitions': len(partitions),
+        'first_day': partitions[0] if partitions else None,
+        'last_day': partitions[-1] if partitions else None
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Multivariate Anomaly Scoring
+
+Joint-likelihood scoring of metric vectors with the trained GaussianMixture.
+
+- One score_samples() call over the current sample plus any backlog of
+  samples not yet scored
+- Thresholds calibrated from training-set log-likelihood quantiles and
+  stored next to the model
+- Per-sample severity from the quantile band the likelihood falls into,
+  with the features furthest from the most likely component
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('ops_brain')
+
+# Features the Anomaly Trainer fits the scaler and mixture on
+FEATURE_COLUMNS = [
+    'cpu_usage',
+    'memory_usage',
+    'p95_latency',
+    'p99_latency',
+    'error_rate',
+    'request_rate',
+    'database_query_time'
+]
+
+# Severity -> training-set log-likelihood quantile below which it applies
+SEVERITY_QUANTILES = {
+    'medium': 0.05,
+    'high': 0.01,
+    'critical': 0.001
+}
+
+DEFAULT_THRESHOLDS_PATH = Path('ai_ops/models/anomaly_thresholds.json')
+
+
+def calibrate_thresholds(model, X_scaled: np.ndarray, quantiles: Optional[Dict[str, float]] = None) -> Dict:
+    """
+    Log-likelihood thresholds from the training distribution.
+
+    Returns:
+        {'thresholds': {severity: log-likelihood}, 'quantiles', 'n_samples', 'features', 'calibrated_at'}
+    """
+    quantiles = quantiles or SEVERITY_QUANTILES
+    log_likelihood = model.score_samples(X_scaled)
+    return {
+        'thresholds': {severity: float(np.quantile(log_likelihood, q)) for severity, q in quantiles.items()},
+        'quantiles': dict(quantiles),
+        'n_samples': int(len(X_scaled)),
+        'features': FEATURE_COLUMNS,
+        'calibrated_at': datetime.utcnow().isoformat()
+    }
+
+
+def save_thresholds(calibration: Dict, path: Path = DEFAULT_THRESHOLDS_PATH) -> None:
+    """Persist a calibration (write-then-rename)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(calibration, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_thresholds(path: Path = DEFAULT_THRESHOLDS_PATH) -> Optional[Dict]:
+    """Load a calibration; None if missing or for a different feature set"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r') as f:
+            calibration = json.load(f)
+        if calibration.get('features') != FEATURE_COLUMNS:
+            logger.warning("Anomaly thresholds were calibrated on other features, ignoring")
+            return None
+        return calibration
+    except Exception as e:
+        logger.warning(f"Failed to load anomaly thresholds: {e}")
+        return None
+
+
+class MultivariateScorer:
+    """Scores metric frames against a fitted scaler + GaussianMixture"""
+
+    def __init__(self, model, scaler, calibration: Dict):
+        self.model = model
+        self.scaler = scaler
+        self.calibration = calibration
+        # Most severe first
+        self.bands = sorted(calibration['thresholds'].items(), key=lambda item: item[1])
+
+    @staticmethod
+    def is_usable(model, scaler) -> bool:
+        """Model fitted and scaler fitted on FEATURE_COLUMNS"""
+        return (
+            hasattr(model, 'means_') and
+            getattr(scaler, 'n_features_in_', None) == len(FEATURE_COLUMNS) and
+            model.means_.shape[1] == len(FEATURE_COLUMNS)
+        )
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        X = df[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        X = np.nan_to_num(X, nan=0.0, posinf=0.0, neginf=0.0)
+        return self.scaler.transform(X)
+
+    def severity(self, log_likelihood: np.ndarray) -> np.ndarray:
+        """Severity label per sample ('' = normal)"""
+        labels = np.full(len(log_likelihood), '', dtype=object)
+        for severity, threshold in reversed(self.bands):  # Least severe first, overwritten by worse
+            labels[log_likelihood < threshold] = severity
+        return labels
+
+    def score(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score a batch of samples in one call.
+
+        Returns:
+            Frame with timestamp, log_likelihood, severity and the two
+            features furthest (in scaled units) from the most likely component
+        """
+        X = self.transform(df)
+        log_likelihood = self.model.score_samples(X)
+        components = self.model.predict(X)
+
+        distance = np.abs(X - self.model.means_[components])
+        top = np.argsort(-distance, axis=1)[:, :2]
+        drivers = [', '.join(FEATURE_COLUMNS[i] for i in row) for row in top]
+
+        return pd.DataFrame({
+            'timestamp': df['timestamp'].to_numpy() if 'timestamp' in df else np.arange(len(df)),
+            'log_likelihood': log_likelihood,
+            'severity': self.severity(log_likelihood),
+            'drivers': drivers
+        })
+
+    @property
+    def threshold(self) -> float:
+        """Least severe threshold (anomalous below this)"""
+        return self.bands[-1][1]
+
+    def summary(self, scored: pd.DataFrame) -> Dict[str, int]:
+        """Counts per severity in a scored batch"""
+        counts: Dict[str, int] = {'scored': len(scored)}
+        for severity, _ in self.bands:
+            counts[severity] = int((scored['severity'] == severity).sum())
+        return counts
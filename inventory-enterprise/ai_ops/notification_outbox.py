@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Notification Outbox
+
+Persistent queue for Slack / Notion / Grafana notifications, drained by
+background workers so cycles and remediations only pay for an insert.
+
+- SQLite outbox (WAL): messages survive restarts and are delivered by the
+  next process if this one exits first
+- One worker thread per channel with its own keep-alive session, so a slow
+  endpoint cannot hold up the others
+- Coalescing: a message with a coalesce key replaces an undelivered one
+  with the same key; queued plain-text Slack messages to the same webhook
+  go out as one post
+- Retries with exponential backoff and jitter (Retry-After honoured on
+  429), dead-lettering after max attempts or on other 4xx responses
+- Per-channel rate limits (token bucket)
+- Queue depth and enqueue-to-delivery latency stats
+
+Usage:
+    python3 ai_ops/notification_outbox.py stats
+    python3 ai_ops/notification_outbox.py drain --timeout 30
+    python3 ai_ops/notification_outbox.py retry-dead
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger('notification_outbox')
+
+DEFAULT_OUTBOX_PATH = Path('ai_ops/models/notification_outbox.db')
+
+# Channel -> (messages per second, burst)
+DEFAULT_RATE_LIMITS = {
+    'slack': (1.0, 3),  # Incoming webhooks allow about one message per second
+    'notion': (3.0, 3),  # Notion API average request limit
+    'grafana': (10.0, 10)
+}
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 300.0
+LEASE_SECONDS = 60.0  # A claimed message not settled within this is picked up again
+SLACK_MERGE_LIMIT = 20  # Plain-text Slack messages merged into one post at most
+
+
+class TokenBucket:
+    """Blocking rate limiter"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def acquire(self, stop: threading.Event) -> bool:
+        """Wait for a token; False if `stop` is set first"""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            if stop.wait((1 - self.tokens) / self.rate):
+                return False
+
+
+class NotificationOutbox:
+    """
+    Persistent, background-delivered notification queue.
+
+    Use `get_outbox()` to share one instance (and its workers) per outbox
+    file within a process. Messages hold their full request, headers
+    included, so the database is created owner-readable only.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_OUTBOX_PATH,
+        rate_limits: Optional[Dict[str, tuple]] = None,
+        max_attempts: int = MAX_ATTEMPTS,
+        timeout: float = 10.0,
+        autostart: bool = True
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rate_limits = {**DEFAULT_RATE_LIMITS, **(rate_limits or {})}
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.autostart = autostart
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._workers: Dict[str, threading.Thread] = {}
+        self._wake: Dict[str, threading.Event] = {}
+
+        # Delivery accounting for this process
+        self.counters = {'enqueued': 0, 'coalesced': 0, 'merged': 0, 'delivered': 0,
+                         'retries': 0, 'dead': 0, 'rate_limited': 0}
+        self.latencies_ms = deque(maxlen=500)
+
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection (one per call; sqlite3 connections aren't shared across threads)"""
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self) -> None:
+        """Create the outbox table"""
+        if not self.path.exists():
+            self.path.touch(mode=0o600)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    headers TEXT,
+                    payload TEXT NOT NULL,
+                    coalesce_key TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    next_attempt_at REAL NOT NULL,
+                    lease_until REAL,
+                    delivered_at REAL,
+                    last_error TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, channel, next_attempt_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_key ON outbox (coalesce_key)")
+
+    # ==================== Producer side ====================
+
+    def enqueue(
+        self,
+        channel: str,
+        url: str,
+        payload: Dict,
+        headers: Optional[Dict[str, str]] = None,
+        coalesce_key: Optional[str] = None
+    ) -> int:
+        """
+        Queue a JSON POST and return immediately.
+
+        Args:
+            channel: Rate-limit / worker group ('slack', 'notion', 'grafana', ...)
+            url: Endpoint
+            payload: JSON body
+            headers: Extra request headers
+            coalesce_key: Replace an undelivered message with the same key instead of adding one
+
+        Returns:
+            Outbox message id
+        """
+        now = time.time()
+        body = json.dumps(payload)
+        header_json = json.dumps(headers) if headers else None
+
+        with self._connect() as conn:
+            if coalesce_key:
+                row = conn.execute(
+                    "SELECT id FROM outbox WHERE coalesce_key = ? AND status = 'pending' AND attempts = 0 "
+                    "ORDER BY id DESC LIMIT 1",
+                    (coalesce_key,)
+                ).fetchone()
+                if row:
+                    conn.execute("UPDATE outbox SET url = ?, headers = ?, payload = ? WHERE id = ?",
+                                 (url, header_json, body, row[0]))
+                    with self._lock:
+                        self.counters['coalesced'] += 1
+                    self._notify(channel)
+                    return row[0]
+
+            cursor = conn.execute(
+                "INSERT INTO outbox (channel, url, headers, payload, coalesce_key, created_at, next_attempt_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (channel, url, header_json, body, coalesce_key, now, now)
+            )
+            message_id = cursor.lastrowid
+
+        with self._lock:
+            self.counters['enqueued'] += 1
+        self._notify(channel)
+        return message_id
+
+    def _notify(self, channel: str) -> None:
+        """Wake (or start) the channel's worker"""
+        if not self.autostart:
+            return
+        with self._lock:
+            if channel not in self._workers or not self._workers[channel].is_alive():
+                self._start_worker(channel)
+            self._wake[channel].set()
+
+    def start(self) -> None:
+        """Start workers for every channel with queued messages (e.g. left by a previous process)"""
+        with self._connect() as conn:
+            channels = [row[0] for row in conn.execute(
+                "SELECT DISTINCT channel FROM outbox WHERE status IN ('pending', 'sending')"
+            )]
+        with self._lock:
+            for channel in channels:
+                if channel not in self._workers or not self._workers[channel].is_alive():
+                    self._start_worker(channel)
+                self._wake[channel].set()
+
+    def _start_worker(self, channel: str) -> None:
+        """Start a channel worker (caller holds the lock)"""
+        self._stop.clear()
+        self._wake.setdefault(channel, threading.Event())
+        worker = threading.Thread(target=self._run_worker, args=(channel,), daemon=True,
+                                  name=f'outbox-{channel}')
+        self._workers[channel] = worker
+        worker.start()
+
+    # ==================== Worker side ====================
+
+    def _claim(self, channel: str, limit: int = 50) -> List[tuple]:
+        """Atomically lease due messages of a channel"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, url, headers, payload, created_at, attempts FROM outbox "
+                "WHERE channel = ? AND next_attempt_at <= ? "
+                "AND (status = 'pending' OR (status = 'sending' AND lease_until < ?)) "
+                "ORDER BY id LIMIT ?",
+                (channel, now, now, limit)
+            ).fetchall()
+            if rows:
+                conn.executemany("UPDATE outbox SET status = 'sending', lease_until = ? WHERE id = ?",
+                                 [(now + LEASE_SECONDS, row[0]) for row in rows])
+            conn.execute("COMMIT")
+            return rows
+        finally:
+            conn.close()
+
+    def _next_due_in(self, channel: str) -> float:
+        """Seconds until the channel's next queued message is due (capped idle wait)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MIN(CASE WHEN status = 'sending' THEN lease_until ELSE next_attempt_at END) "
+                "FROM outbox WHERE channel = ? AND status IN ('pending', 'sending')",
+                (channel,)
+            ).fetchone()
+        if row[0] is None:
+            return 5.0
+        return min(5.0, max(0.0, row[0] - time.time()))
+
+    @staticmethod
+    def _batches(rows: List[tuple]) -> List[List[tuple]]:
+        """Group plain-text messages to the same URL into one delivery; others go alone"""
+        batches, text_groups = [], {}
+        for row in rows:
+            payload = json.loads(row[3])
+            if set(payload) == {'text'} and row[2] is None:
+                group = text_groups.get(row[1])
+                if group is None or len(group) >= SLACK_MERGE_LIMIT:
+                    group = []
+                    text_groups[row[1]] = group
+                    batches.append(group)
+                group.append(row)
+            else:
+                batches.append([row])
+        return batches
+
+    def _run_worker(self, channel: str) -> None:
+        rate, burst = self.rate_limits.get(channel, (5.0, 5))
+        limiter = TokenBucket(rate, burst)
+        session = requests.Session()
+        session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+        wake = self._wake[channel]
+
+        while not self._stop.is_set():
+            try:
+                rows = self._claim(channel)
+            except sqlite3.Error as e:
+                logger.warning(f"Outbox claim failed: {e}")
+                rows = []
+
+            if not rows:
+                wake.wait(self._next_due_in(channel))
+                wake.clear()
+                continue
+
+            for batch in self._batches(rows):
+                if not limiter.acquire(self._stop):
+                    return
+                self._deliver(session, batch)
+
+    def _deliver(self, session: requests.Session, batch: List[tuple]) -> None:
+        """POST one (possibly merged) message and settle its rows"""
+        ids = [row[0] for row in batch]
+        url, headers = batch[0][1], json.loads(batch[0][2]) if batch[0][2] else None
+        if len(batch) > 1:
+            payload = {'text': "\n\n".join(json.loads(row[3])['text'] for row in batch)}
+        else:
+            payload = json.loads(batch[0][3])
+
+        retry_after = None
+        try:
+            response = session.post(url, json=payload, headers=headers, timeout=self.timeout)
+            if response.status_code < 300:
+                self._settle_delivered(batch)
+                return
+            error = f"HTTP {response.status_code}: {response.text[:200]}"
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if response.status_code == 429:
+                with self._lock:
+                    self.counters['rate_limited'] += 1
+                try:
+                    retry_after = float(response.headers.get('Retry-After', ''))
+                except ValueError:
+                    retry_after = None
+        except requests.RequestException as e:
+            error, retryable = str(e), True
+
+        self._settle_failed(batch, error, retryable, retry_after)
+        logger.warning(f"Notification delivery failed ({len(ids)} message(s) to {url}): {error}")
+
+    def _settle_delivered(self, batch: List[tuple]) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany("UPDATE outbox SET status = 'sent', delivered_at = ?, attempts = attempts + 1, "
+                             "lease_until = NULL WHERE id = ?", [(now, row[0]) for row in batch])
+        with self._lock:
+            self.counters['delivered'] += len(batch)
+            if len(batch) > 1:
+                self.counters['merged'] += len(batch) - 1
+            self.latencies_ms.extend((now - row[4]) * 1000 for row in batch)
+
+    def _settle_failed(self, batch: List[tuple], error: str, retryable: bool, retry_after: Optional[float]) -> None:
+        now = time.time()
+        updates = []
+        for row in batch:
+            attempts = row[5] + 1
+            if retryable and attempts < self.max_attempts:
+                delay = retry_after if retry_after is not None else \
+                    min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1)) * (0.5 + random.random() / 2)
+                updates.append(('pending', attempts, now + delay, error, row[0]))
+            else:
+                updates.append(('dead', attempts, now, error, row[0]))
+
+        with self._connect() as conn:
+            conn.executemany("UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, "
+                             "lease_until = NULL WHERE id = ?", updates)
+        with self._lock:
+            dead = sum(1 for update in updates if update[0] == 'dead')
+            self.counters['dead'] += dead
+            self.counters['retries'] += len(updates) - dead
+
+    # ==================== Control / stats ====================
+
+    def depth(self, channel: Optional[str] = None) -> int:
+        """Messages not yet delivered or dead-lettered"""
+        query = "SELECT COUNT(*) FROM outbox WHERE status IN ('pending', 'sending')"
+        params: tuple = ()
+        if channel:
+            query += " AND channel = ?"
+            params = (channel,)
+        with self._connect() as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until every due message is settled; True if the queue drained in time"""
+        self.start()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._connect() as conn:
+                due = conn.execute(
+                    "SELECT COUNT(*) FROM outbox WHERE status = 'sending' "
+                    "OR (status = 'pending' AND next_attempt_at <= ?)",
+                    (time.time(),)
+                ).fetchone()[0]
+            if due == 0:
+                return True
+            time.sleep(0.05)
+        return False
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop workers (queued messages stay in the outbox)"""
+        self._stop.set()
+        for event in self._wake.values():
+            event.set()
+        for worker in list(self._workers.values()):
+            worker.join(timeout)
+
+    def retry_dead(self) -> int:
+        """Requeue dead-lettered messages"""
+        with self._connect() as conn:
+            count = conn.execute(
+                "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ? WHERE status = 'dead'",
+                (time.time(),)
+            ).rowcount
+        self.start()
+        return count
+
+    def prune(self, older_than_hours: float = 168) -> int:
+        """Delete delivered messages older than the cutoff"""
+        cutoff = time.time() - older_than_hours * 3600
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM outbox WHERE status = 'sent' AND delivered_at < ?", (cutoff,)).rowcount
+
+    def get_stats(self) -> Dict:
+        """Queue depth per channel / status, oldest undelivered age, and this process's delivery stats"""
+        with self._connect() as conn:
+            by_status = conn.execute(
+                "SELECT channel, status, COUNT(*) FROM outbox GROUP BY channel, status"
+            ).fetchall()
+            oldest = conn.execute(
+                "SELECT MIN(created_at) FROM outbox WHERE status IN ('pending', 'sending')"
+            ).fetchone()[0]
+
+        channels: Dict[str, Dict[str, int]] = {}
+        for channel, status, count in by_status:
+            channels.setdefault(channel, {})[status] = count
+
+        with self._lock:
+            latencies = np.asarray(self.latencies_ms) if self.latencies_ms else None
+            counters = dict(self.counters)
+
+        return {
+            'depth': sum(counts.get('pending', 0) + counts.get('sending', 0) for counts in channels.values()),
+            'channels': channels,
+            'oldest_pending_seconds': round(time.time() - oldest, 1) if oldest else 0.0,
+            'delivery_p50_ms': round(float(np.percentile(latencies, 50)), 1) if latencies is not None else None,
+            'delivery_p95_ms': round(float(np.percentile(latencies, 95)), 1) if latencies is not None else None,
+            **counters
+        }
+
+
+_outboxes: Dict[str, NotificationOutbox] = {}
+_outboxes_lock = threading.Lock()
+
+
+def get_outbox(path: Path = DEFAULT_OUTBOX_PATH, **kwargs) -> NotificationOutbox:
+    """
+    Process-wide outbox for a database file (created on first use).
+
+    On interpreter exit, waits briefly for due messages; anything left is
+    delivered by the next process that opens the outbox.
+    """
+    key = str(Path(path).resolve())
+    with _outboxes_lock:
+        if key not in _outboxes:
+            outbox = NotificationOutbox(path, **kwargs)
+            outbox.start()
+            atexit.register(outbox.flush, float(os.getenv('NOTIFICATION_FLUSH_SECONDS', '10')))
+            _outboxes[key] = outbox
+        return _outboxes[key]
+
+
+def main():
+    """Main entry point"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Notification outbox')
+    parser.add_argument('command', choices=['stats', 'drain', 'retry-dead', 'prune'], help='Action')
+    parser.add_argument('--path', default=str(DEFAULT_OUTBOX_PATH), help='Outbox database')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Drain timeout (seconds)')
+    args = parser.parse_args()
+
+    outbox = NotificationOutbox(Path(args.path))
+    if args.command == 'drain':
+        drained = outbox.flush(args.timeout)
+        print(f"{'Drained' if drained else 'Not drained'} - {outbox.depth()} message(s) still queued")
+    elif args.command == 'retry-dead':
+        print(f"Requeued {outbox.retry_dead()} message(s)")
+        outbox.flush(args.timeout)
+    elif args.command == 'prune':
+        print(f"Pruned {outbox.prune()} delivered message(s)")
+    print(json.dumps(outbox.get_stats(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
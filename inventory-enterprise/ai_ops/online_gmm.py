@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Streaming Gaussian Mixture Updates
+
+Online EM for the Anomaly Trainer's GaussianMixture, so a training run only
+touches samples collected since the previous run.
+
+- Per-component sufficient statistics (soft counts, first and second
+  moments) kept in raw feature units, so scaler updates never invalidate
+  what has been accumulated
+- E-step on each new chunk with the current model, exponential forgetting
+  of older statistics, closed-form M-step written back into the sklearn
+  model (usable by score_samples / predict as before)
+- Fixed-size reservoir sample of everything streamed, for silhouette, BIC
+  and threshold calibration without holding the full history
+- Parallel n_components selection by BIC across processes
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.linalg import solve_triangular
+from sklearn.mixture import GaussianMixture
+
+logger = logging.getLogger('anomaly_trainer')
+
+DEFAULT_STATE_PATH = Path('ai_ops/models/online_gmm.npz')
+
+
+class ReservoirSample:
+    """Uniform fixed-size sample of a stream (Algorithm R, vectorized per chunk)"""
+
+    def __init__(self, capacity: int, n_features: int, seed: int = 42):
+        self.capacity = int(capacity)
+        self.data = np.empty((self.capacity, n_features))
+        self.seen = 0
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, X: np.ndarray) -> None:
+        """Offer a chunk of rows to the reservoir"""
+        n = len(X)
+        if n == 0:
+            return
+
+        positions = self.seen + np.arange(n)  # Stream index of each row
+        fill = positions < self.capacity
+        self.data[positions[fill]] = X[fill]
+
+        rest = ~fill
+        if rest.any():
+            slots = (self._rng.random(rest.sum()) * (positions[rest] + 1)).astype(np.int64)
+            accepted = slots < self.capacity
+            # Later rows overwrite earlier ones on the same slot, as in the sequential algorithm
+            self.data[slots[accepted]] = X[rest][accepted]
+
+        self.seen += n
+
+    @property
+    def sample(self) -> np.ndarray:
+        return self.data[:min(self.seen, self.capacity)]
+
+
+class OnlineGMMStats:
+    """
+    Sufficient statistics of a full-covariance GaussianMixture in raw units.
+
+    `memory_samples` sets the forgetting rate: statistics decay by
+    exp(-n / memory_samples) per n new samples, so the model tracks roughly
+    the last `memory_samples` samples.
+    """
+
+    def __init__(self, n_components: int, n_features: int, memory_samples: float = 20000):
+        self.memory_samples = float(memory_samples)
+        self.counts = np.zeros(n_components)
+        self.sums = np.zeros((n_components, n_features))
+        self.squares = np.zeros((n_components, n_features, n_features))
+        self.trained_until: Optional[float] = None  # Unix seconds of the newest sample folded in
+
+    @staticmethod
+    def supports(model) -> bool:
+        return getattr(model, 'covariance_type', None) == 'full' and hasattr(model, 'means_')
+
+    @classmethod
+    def from_model(cls, model: GaussianMixture, scaler, n_samples: int, memory_samples: float = 20000) -> 'OnlineGMMStats':
+        """Seed statistics from a batch-fitted model, as if it had seen `n_samples` samples"""
+        k, d = model.means_.shape
+        stats = cls(k, d, memory_samples)
+        weight = min(n_samples, memory_samples)
+
+        scale = scaler.scale_
+        means = model.means_ * scale + scaler.mean_
+        # Fitted covariances include reg_covar, which apply() adds back
+        covariances = (model.covariances_ - model.reg_covar * np.eye(d)) * np.outer(scale, scale)
+
+        stats.counts = model.weights_ * weight
+        stats.sums = stats.counts[:, None] * means
+        stats.squares = stats.counts[:, None, None] * (covariances + np.einsum('ki,kj->kij', means, means))
+        return stats
+
+    def update(self, model: GaussianMixture, scaler, X: np.ndarray) -> None:
+        """
+        One online EM step on a chunk of raw samples.
+
+        The scaler should already include the chunk (partial_fit) so the
+        E-step sees it in the model's current units.
+        """
+        resp = model.predict_proba(scaler.transform(X))
+
+        decay = np.exp(-len(X) / self.memory_samples)
+        self.counts = decay * self.counts + resp.sum(axis=0)
+        self.sums = decay * self.sums + resp.T @ X
+        self.squares = decay * self.squares + np.einsum('nk,ni,nj->kij', resp, X, X)
+
+        self.apply(model, scaler)
+
+    def apply(self, model: GaussianMixture, scaler) -> None:
+        """M-step: write weights / means / covariances (in scaled units) into the model"""
+        counts = np.maximum(self.counts, 10 * np.finfo(float).eps)
+        means = self.sums / counts[:, None]
+        covariances = self.squares / counts[:, None, None] - np.einsum('ki,kj->kij', means, means)
+
+        scale = scaler.scale_
+        d = means.shape[1]
+        model.weights_ = counts / counts.sum()
+        model.means_ = (means - scaler.mean_) / scale
+        model.covariances_ = covariances / np.outer(scale, scale) + model.reg_covar * np.eye(d)
+
+        precisions_chol = np.empty_like(model.covariances_)
+        for k, covariance in enumerate(model.covariances_):
+            cov_chol = np.linalg.cholesky(covariance)
+            precisions_chol[k] = solve_triangular(cov_chol, np.eye(d), lower=True).T
+        model.precisions_cholesky_ = precisions_chol
+        model.precisions_ = np.einsum('kij,klj->kil', precisions_chol, precisions_chol)
+
+    def save(self, path: Path, reservoir: Optional[ReservoirSample] = None) -> None:
+        """Persist statistics and the reservoir (write-then-rename)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp.npz')
+        extra = {}
+        if reservoir is not None:
+            extra = {'reservoir': reservoir.sample, 'reservoir_seen': np.array(reservoir.seen),
+                     'reservoir_capacity': np.array(reservoir.capacity)}
+        np.savez(
+            tmp_path,
+            counts=self.counts,
+            sums=self.sums,
+            squares=self.squares,
+            memory_samples=np.array(self.memory_samples),
+            trained_until=np.array(np.nan if self.trained_until is None else self.trained_until),
+            **extra
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Tuple[Optional['OnlineGMMStats'], Optional[ReservoirSample]]:
+        """(stats, reservoir), or (None, None) if missing or unreadable"""
+        path = Path(path)
+        if not path.exists():
+            return None, None
+
+        try:
+            with np.load(path) as state:
+                k, d = state['sums'].shape
+                stats = cls(k, d, float(state['memory_samples']))
+                stats.counts = state['counts'].copy()
+                stats.sums = state['sums'].copy()
+                stats.squares = state['squares'].copy()
+                trained_until = float(state['trained_until'])
+                stats.trained_until = None if np.isnan(trained_until) else trained_until
+
+                reservoir = None
+                if 'reservoir' in state:
+                    reservoir = ReservoirSample(int(state['reservoir_capacity']), d)
+                    sample = state['reservoir']
+                    reservoir.data[:len(sample)] = sample
+                    reservoir.seen = int(state['reservoir_seen'])
+            return stats, reservoir
+
+        except Exception as e:
+            logger.warning(f"Failed to load online GMM state: {e}")
+            return None, None
+
+
+def _fit_candidate(n_components: int, X: np.ndarray, random_state: int) -> Tuple[int, float, GaussianMixture]:
+    """Fit one candidate (runs in a worker process)"""
+    model = GaussianMixture(
+        n_components=n_components,
+        covariance_type='full',
+        max_iter=100,
+        random_state=random_state
+    )
+    model.fit(X)
+    return n_components, float(model.bic(X)), model
+
+
+def select_n_components(
+    X: np.ndarray,
+    candidates: List[int],
+    max_workers: Optional[int] = None,
+    random_state: int = 42
+) -> Tuple[GaussianMixture, Dict[int, float]]:
+    """
+    Fit one GaussianMixture per candidate n_components in parallel processes.
+
+    Returns:
+        (model with the lowest BIC, {n_components: BIC})
+    """
+    candidates = [k for k in candidates if k < len(X)]
+    if not candidates:
+        raise ValueError("No candidate n_components smaller than the sample")
+
+    workers = min(len(candidates), max_workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_fit_candidate, candidates, [X] * len(candidates),
+                                        [random_state] * len(candidates)))
+    else:
+        results = [_fit_candidate(k, X, random_state) for k in candidates]
+
+    bics = {k: bic for k, bic, _ in results}
+    best = min(results, key=lambda result: result[1])[2]
+    return best, bics
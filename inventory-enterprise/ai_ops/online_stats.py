@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Online Anomaly Statistics
+
+Per-metric sliding-window statistics for Ops Brain anomaly detection.
+
+- Welford mean / variance over the last `window` samples (add + remove, O(1))
+- Bias-corrected EWMA state, as pandas ewm(span=N, adjust=True)
+- Ring buffer of window values, so the oldest sample can be retired exactly
+- Exact recompute once per window pass bounds floating-point drift
+- Persisted as one compact .npz file
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+logger = logging.getLogger('ops_brain')
+
+
+class OnlineMetricStats:
+    """
+    Sliding-window Welford statistics plus EWMA for a fixed set of metrics.
+
+    Each `update()` folds one sample per metric in and, once the window is
+    full, retires the oldest. `mean`/`std` then equal pandas mean()/std()
+    (ddof=1) over the last `window` samples, and `ewma` equals
+    ewm(span=ewma_span).mean().iloc[-1] over that window to within
+    (1 - alpha) ** window (about 1e-15 at span 20 / window 336).
+    """
+
+    def __init__(self, metrics: List[str], window: int = 336, ewma_span: int = 20):
+        self.metrics = list(metrics)
+        self.window = int(window)
+        self.ewma_span = int(ewma_span)
+        self.alpha = 2.0 / (self.ewma_span + 1.0)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all samples"""
+        k = len(self.metrics)
+        self.buffer = np.zeros((self.window, k))
+        self.count = 0  # Samples ever seen
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        # EWMA as weighted sum / sum of weights (adjust=True)
+        self.ewma_num = np.zeros(k)
+        self.ewma_den = 0.0
+
+    @property
+    def n(self) -> int:
+        """Samples currently in the window"""
+        return min(self.count, self.window)
+
+    @property
+    def std(self) -> np.ndarray:
+        """Sample standard deviation (ddof=1); 0 with fewer than two samples"""
+        if self.n < 2:
+            return np.zeros(len(self.metrics))
+        return np.sqrt(np.maximum(self.m2, 0.0) / (self.n - 1))
+
+    @property
+    def ewma(self) -> np.ndarray:
+        if self.ewma_den == 0:
+            return np.zeros(len(self.metrics))
+        return self.ewma_num / self.ewma_den
+
+    def update(self, sample: Dict[str, float]) -> None:
+        """Fold in one sample ({metric: value}; missing metrics count as 0.0)"""
+        x = np.array([float(sample.get(metric, 0.0) or 0.0) for metric in self.metrics])
+        slot = self.count % self.window
+
+        if self.count >= self.window:
+            # Retire the oldest sample (reverse Welford step)
+            old = self.buffer[slot].copy()
+            n = self.window
+            mean_without = (n * self.mean - old) / (n - 1) if n > 1 else np.zeros_like(old)
+            self.m2 -= (old - self.mean) * (old - mean_without)
+            self.mean = mean_without
+            n_before = n - 1
+        else:
+            n_before = self.count
+
+        # Add the new sample (forward Welford step)
+        delta = x - self.mean
+        self.mean = self.mean + delta / (n_before + 1)
+        self.m2 += delta * (x - self.mean)
+
+        self.buffer[slot] = x
+        self.count += 1
+
+        decay = 1.0 - self.alpha
+        self.ewma_num = decay * self.ewma_num + x
+        self.ewma_den = decay * self.ewma_den + 1.0
+
+        # Remove/add steps accumulate rounding error; resync once per window
+        if self.count % self.window == 0:
+            self._recompute()
+
+    def _recompute(self) -> None:
+        """Exact mean / M2 from the buffered window"""
+        values = self.window_values()
+        if len(values):
+            self.mean = values.mean(axis=0)
+            self.m2 = ((values - self.mean) ** 2).sum(axis=0)
+
+    def window_values(self) -> np.ndarray:
+        """Buffered samples, oldest first, shape (n, metrics)"""
+        if self.count <= self.window:
+            return self.buffer[:self.count].copy()
+        start = self.count % self.window
+        return np.concatenate([self.buffer[start:], self.buffer[:start]])
+
+    def bootstrap(self, history: Iterable[Dict]) -> int:
+        """Replay past samples (oldest first); returns the number folded in"""
+        self.reset()
+        added = 0
+        for sample in history:
+            self.update(sample)
+            added += 1
+        return added
+
+    def get(self, metric: str) -> Dict[str, float]:
+        """mean / std / ewma for one metric"""
+        i = self.metrics.index(metric)
+        return {'mean': float(self.mean[i]), 'std': float(self.std[i]), 'ewma': float(self.ewma[i])}
+
+    def save(self, path: Path) -> None:
+        """Persist state (write-then-rename)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez_compressed(
+            tmp_path,
+            metrics=np.array(self.metrics),
+            config=np.array([self.window, self.ewma_span, self.count]),
+            buffer=self.window_values(),
+            mean=self.mean,
+            m2=self.m2,
+            ewma_num=self.ewma_num,
+            ewma_den=np.array([self.ewma_den])
+        )
+        os.replace(tmp_path, path)
+
+    def load(self, path: Path) -> bool:
+        """Load persisted state; False if missing or for a different metric set / window"""
+        path = Path(path)
+        if not path.exists():
+            return False
+
+        try:
+            with np.load(path) as state:
+                window, ewma_span, count = (int(v) for v in state['config'])
+                if list(state['metrics']) != self.metrics or window != self.window or ewma_span != self.ewma_span:
+                    logger.warning("Online stats layout changed, rebuilding from history")
+                    return False
+
+                values = state['buffer']
+                self.reset()
+                self.buffer[:len(values)] = values
+                # Keep the ring aligned so the oldest value sits at count % window
+                self.buffer = np.roll(self.buffer, count % self.window if count >= self.window else 0, axis=0)
+                self.count = count
+                self.mean = state['mean'].copy()
+                self.m2 = state['m2'].copy()
+                self.ewma_num = state['ewma_num'].copy()
+                self.ewma_den = float(state['ewma_den'][0])
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to load online stats: {e}")
+            return False
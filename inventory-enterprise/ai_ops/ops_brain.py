@@ -19,12 +19,34 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 import yaml
-import requests
 from scipy import stats
 from sklearn.preprocessing import StandardScaler
 from sklearn.mixture import GaussianMixture
 from statsmodels.tsa.seasonal import seasonal_decompose
 
+try:
+    from ai_ops.online_stats import OnlineMetricStats
+    from ai_ops.metrics_store import MetricsStore
+    from ai_ops.metrics_rollup import MetricsRollup
+    from ai_ops.notification_outbox import get_outbox
+    from ai_ops.sla_tracker import get_sla_tracker
+    from ai_ops.prometheus_collector import get_collector
+    from ai_ops.seasonal_profile import SeasonalProfile, MAD_TO_SIGMA
+    from ai_ops.multivariate_scorer import (
+        MultivariateScorer, FEATURE_COLUMNS, calibrate_thresholds, load_thresholds, save_thresholds
+    )
+except ImportError:
+    from online_stats import OnlineMetricStats
+    from metrics_store import MetricsStore
+    from metrics_rollup import MetricsRollup
+    from notification_outbox import get_outbox
+    from sla_tracker import get_sla_tracker
+    from prometheus_collector import get_collector
+    from seasonal_profile import SeasonalProfile, MAD_TO_SIGMA
+    from multivariate_scorer import (
+        MultivariateScorer, FEATURE_COLUMNS, calibrate_thresholds, load_thresholds, save_thresholds
+    )
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -88,17 +110,33 @@ class OpsBrain:
     - Reporting to Slack and Notion
     """
 
+    # Metrics checked by detect_anomalies()
+    ANOMALY_METRICS = ['cpu_usage', 'memory_usage', 'p95_latency', 'error_rate', 'database_query_time']
+
     def __init__(self, config_path: str = 'ai_ops/config/ops_config.yaml'):
         """Initialize Ops Brain with configuration"""
         self.config = self._load_config(config_path)
         self.model_path = Path('ai_ops/models/anomaly_model.pkl')
         self.scaler_path = Path('ai_ops/models/scaler.pkl')
-        self.history_path = Path('ai_ops/models/metrics_history.json')
+        self.history_path = Path('ai_ops/models/metrics_history.json')  # Legacy, migrated on startup
+        self.online_stats_path = Path('ai_ops/models/online_stats.npz')
+        self.seasonal_profile_path = Path('ai_ops/models/seasonal_profile.npz')
+        self.thresholds_path = Path('ai_ops/models/anomaly_thresholds.json')
+        self.multivariate_state_path = Path('ai_ops/models/multivariate_state.json')
 
         # Load or initialize models
         self.anomaly_model = self._load_or_init_model()
         self.scaler = self._load_or_init_scaler()
-        self.metrics_history = self._load_history()
+        self.metrics_store = self._open_metrics_store()
+        self.metrics_rollup = MetricsRollup(self.metrics_store)
+        self.sla_tracker = get_sla_tracker(self.metrics_store)
+        self.outbox = get_outbox()
+        self.online_stats = self._load_or_init_online_stats()
+        self.seasonal_profile = self._load_or_init_seasonal_profile()
+        self.multivariate = self._init_multivariate_scorer()
+        self.last_scored_at = self._load_last_scored_at()
+        self.last_multivariate: Dict = {}
+        self.collector = self._init_collector()
 
         # Reward tracking for RL
         self.reward_history = []
@@ -133,6 +171,7 @@ class OpsBrain:
             'anomaly_sensitivity': 0.92,
             'learning_rate': 0.01,
             'sla_target': 99.95,
+            'sla_window': {'samples': 100, 'hours': None},
             'cost_budget': 50.0
         }
 
@@ -172,18 +211,102 @@ class OpsBrain:
         logger.info("✓ Initialized new scaler")
         return scaler
 
-    def _load_history(self) -> List[Dict]:
-        """Load metrics history"""
+    def _init_collector(self):
+        """Shared Prometheus collector for the configured URL"""
+        collection = self.config.get('prometheus_collection', {})
+        collector = get_collector(self.config.get('prometheus_url', 'http://localhost:9090'))
+        collector.configure(
+            query_timeout=collection.get('query_timeout_seconds', 10),
+            deadline_seconds=collection.get('deadline_seconds', 15),
+            staleness_seconds=collection.get('staleness_seconds', 60)
+        )
+        return collector
+
+    def _init_multivariate_scorer(self) -> Optional[MultivariateScorer]:
+        """Joint-likelihood scorer, if the trainer has fitted the mixture and scaler"""
+        if not self.config.get('anomaly_detection', {}).get('multivariate', {}).get('enabled', True):
+            return None
+        if not MultivariateScorer.is_usable(self.anomaly_model, self.scaler):
+            logger.info("Multivariate scoring inactive (anomaly model not trained yet)")
+            return None
+
+        calibration = load_thresholds(self.thresholds_path)
+        if calibration is None:
+            # Model trained before thresholds were stored: calibrate on the last week
+            df = self.metrics_store.query_frame(start=datetime.utcnow() - timedelta(days=7), columns=FEATURE_COLUMNS)
+            if len(df) < 48:
+                logger.info("Multivariate scoring inactive (no thresholds and too little history to calibrate)")
+                return None
+            scaled = np.nan_to_num(df[FEATURE_COLUMNS].to_numpy(), nan=0.0, posinf=0.0, neginf=0.0)
+            calibration = calibrate_thresholds(self.anomaly_model, self.scaler.transform(scaled))
+            save_thresholds(calibration, self.thresholds_path)
+            logger.info(f"✓ Calibrated anomaly thresholds on {len(df)} recent samples")
+
+        return MultivariateScorer(self.anomaly_model, self.scaler, calibration)
+
+    def _load_last_scored_at(self) -> Optional[datetime]:
+        """Timestamp of the newest sample already scored by the multivariate path"""
+        if self.multivariate_state_path.exists():
+            try:
+                with open(self.multivariate_state_path, 'r') as f:
+                    return datetime.fromisoformat(json.load(f)['last_scored_at'])
+            except Exception as e:
+                logger.warning(f"Failed to load multivariate state: {e}")
+        return None
+
+    def _load_or_init_seasonal_profile(self) -> Optional[SeasonalProfile]:
+        """Load hour-of-week baselines, or rebuild them from the metrics store"""
+        seasonal = self.config.get('anomaly_detection', {}).get('seasonal', {})
+        if not seasonal.get('enabled', True):
+            return None
+
+        profile = SeasonalProfile(
+            self.ANOMALY_METRICS,
+            samples_per_bucket=seasonal.get('samples_per_bucket', 48),
+            min_samples=seasonal.get('min_samples', 6)
+        )
+
+        if profile.load(self.seasonal_profile_path):
+            logger.info("✓ Loaded seasonal baseline profiles")
+        elif self.metrics_store.count():
+            df = self.metrics_store.query_frame(
+                start=datetime.utcnow() - timedelta(weeks=seasonal.get('rebuild_weeks', 8)),
+                columns=self.ANOMALY_METRICS
+            )
+            profile.rebuild(df['timestamp'], df[self.ANOMALY_METRICS].values)
+            ready = int((profile.counts >= profile.min_samples).sum())
+            logger.info(f"✓ Rebuilt seasonal profiles from {len(df)} samples ({ready}/168 hours ready)")
+
+        return profile
+
+    def _load_or_init_online_stats(self) -> OnlineMetricStats:
+        """Load anomaly baseline state, or rebuild it from metrics history"""
+        detection = self.config.get('anomaly_detection', {})
+        baseline = OnlineMetricStats(
+            self.ANOMALY_METRICS,
+            window=detection.get('baseline_window', 336),
+            ewma_span=detection.get('ewma_span', 20)
+        )
+
+        if baseline.load(self.online_stats_path):
+            logger.info(f"✓ Loaded anomaly baseline ({baseline.n} samples)")
+        elif self.metrics_store.count():
+            baseline.bootstrap(self.metrics_store.latest(baseline.window).to_dict('records'))
+            logger.info(f"✓ Rebuilt anomaly baseline from {baseline.n} historical metrics")
+
+        return baseline
+
+    def _open_metrics_store(self) -> MetricsStore:
+        """Open the metrics history store, importing the legacy JSON history once"""
+        store = MetricsStore()
         if self.history_path.exists():
             try:
-                with open(self.history_path, 'r') as f:
-                    history = json.load(f)
-                logger.info(f"✓ Loaded {len(history)} historical metrics")
-                return history
+                store.import_json(self.history_path)
             except Exception as e:
-                logger.warning(f"Failed to load history: {e}")
+                logger.warning(f"Failed to import metrics history: {e}")
 
-        return []
+        logger.info(f"✓ Metrics store holds {store.count()} historical metrics")
+        return store
 
     def _save_models(self):
         """Save models and scaler"""
@@ -195,8 +318,13 @@ class OpsBrain:
         with open(self.scaler_path, 'wb') as f:
             pickle.dump(self.scaler, f)
 
-        with open(self.history_path, 'w') as f:
-            json.dump(self.metrics_history[-1000:], f, indent=2)  # Keep last 1000
+        self.online_stats.save(self.online_stats_path)
+        if self.seasonal_profile is not None:
+            self.seasonal_profile.save(self.seasonal_profile_path)
+
+        if self.last_scored_at is not None:
+            with open(self.multivariate_state_path, 'w') as f:
+                json.dump({'last_scored_at': self.last_scored_at.isoformat()}, f)
 
         logger.info("✓ Saved models and history")
 
@@ -219,13 +347,12 @@ class OpsBrain:
             'cost_current': 'sum(neuropilot_cost_total)'
         }
 
-        for metric_name, query in queries.items():
-            try:
-                value = self._query_prometheus(query)
-                metrics_data[metric_name] = value
-            except Exception as e:
-                logger.warning(f"Failed to query {metric_name}: {e}")
-                metrics_data[metric_name] = 0.0
+        # All queries concurrently, bounded by the collection deadline
+        results = self.collector.query_many(queries)
+        for metric_name, value in results.items():
+            if value is None:
+                logger.warning(f"Failed to query {metric_name}")
+            metrics_data[metric_name] = value if value is not None else 0.0
 
         metrics = Metrics(
             timestamp=datetime.utcnow(),
@@ -234,73 +361,68 @@ class OpsBrain:
 
         logger.info(f"✓ Collected metrics: CPU={metrics.cpu_usage:.1f}%, "
                    f"Latency={metrics.p95_latency:.0f}ms, "
-                   f"Errors={metrics.error_rate:.2f}%")
+                   f"Errors={metrics.error_rate:.2f}% "
+                   f"({self.collector.last_collection.get('elapsed_ms', 0):.0f}ms)")
 
         return metrics
 
     def _query_prometheus(self, query: str) -> float:
         """Query Prometheus and return single value"""
-        prometheus_url = self.config.get('prometheus_url', 'http://localhost:9090')
-
-        try:
-            response = requests.get(
-                f"{prometheus_url}/api/v1/query",
-                params={'query': query},
-                timeout=10
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            if data['status'] == 'success' and data['data']['result']:
-                return float(data['data']['result'][0]['value'][1])
-
-            return 0.0
-        except Exception as e:
-            logger.error(f"Prometheus query failed: {e}")
-            return 0.0
+        value = self.collector.query(query)
+        return value if value is not None else 0.0
 
     def detect_anomalies(self, metrics: Metrics) -> List[Anomaly]:
         """
         Detect anomalies using multiple algorithms:
         1. Z-score for statistical outliers
-        2. Seasonal decomposition for patterns
+        2. Hour-of-week seasonal baseline (median/MAD) as the expected value
         3. EWMA for trend detection
+        4. Joint likelihood of all metrics under the trained GaussianMixture
         """
         logger.info("🔍 Running anomaly detection...")
 
         anomalies = []
 
-        # Add to history
+        # Seasonal expectation for this hour-of-week, looked up before the sample joins its bucket
+        seasonal = {}
+        if self.seasonal_profile is not None:
+            seasonal = {
+                metric_name: self.seasonal_profile.baseline(metric_name, metrics.timestamp)
+                for metric_name in self.ANOMALY_METRICS
+            }
+
+        # Add to history and fold into the sliding and seasonal baselines (O(1) per metric)
         metrics_dict = asdict(metrics)
         metrics_dict['timestamp'] = metrics.timestamp.isoformat()
-        self.metrics_history.append(metrics_dict)
+        self.metrics_store.append(metrics_dict)
+        self.metrics_rollup.update()  # No-op until an hour completes
+        self.sla_tracker.observe(metrics_dict)
+        self.online_stats.update(metrics_dict)
+        if self.seasonal_profile is not None:
+            self.seasonal_profile.update(metrics_dict, metrics.timestamp)
 
         # Need at least 48 data points (8 hours at 10-min intervals)
-        if len(self.metrics_history) < 48:
+        if self.online_stats.count < 48:
             logger.info("Insufficient history for anomaly detection")
             return []
 
-        # Convert to DataFrame
-        df = pd.DataFrame(self.metrics_history[-336:])  # Last 7 days
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df.set_index('timestamp', inplace=True)
-
         # Check each metric
-        metric_names = ['cpu_usage', 'memory_usage', 'p95_latency', 'error_rate', 'database_query_time']
-
-        for metric_name in metric_names:
-            if metric_name not in df.columns:
-                continue
-
+        for metric_name in self.ANOMALY_METRICS:
             current_value = metrics_dict[metric_name]
-
-            # Method 1: Z-score
-            mean = df[metric_name].mean()
-            std = df[metric_name].std()
+            baseline = self.online_stats.get(metric_name)
+
+            # Method 1: Z-score against the hour-of-week median/MAD once that
+            # bucket is populated, otherwise against the flat window
+            mean = baseline['mean']
+            std = baseline['std']
+            if seasonal.get(metric_name) is not None:
+                mean = seasonal[metric_name]['median']
+                scale = MAD_TO_SIGMA * seasonal[metric_name]['mad']
+                std = scale if scale > 0 else std
             z_score = abs((current_value - mean) / std) if std > 0 else 0
 
             # Method 2: EWMA
-            ewma = df[metric_name].ewm(span=20).mean().iloc[-1]
+            ewma = baseline['ewma']
             ewma_deviation = abs((current_value - ewma) / ewma) if ewma > 0 else 0
 
             # Determine if anomalous
@@ -325,9 +447,57 @@ class OpsBrain:
                 logger.warning(f"⚠️  Anomaly detected: {metric_name}={current_value:.2f} "
                              f"(expected={mean:.2f}, z-score={z_score:.2f})")
 
+        # Method 4: Joint likelihood (current sample + unscored backlog in one call)
+        if self.multivariate is not None:
+            try:
+                anomalies.extend(self._detect_multivariate(metrics))
+            except Exception as e:
+                logger.warning(f"Multivariate scoring failed: {e}")
+
         logger.info(f"✓ Detected {len(anomalies)} anomalies")
         return anomalies
 
+    def _detect_multivariate(self, metrics: Metrics) -> List[Anomaly]:
+        """Score samples since the last scored one; raise an anomaly for the current sample if unlikely"""
+        max_backlog = self.config.get('anomaly_detection', {}).get('multivariate', {}).get('max_backlog', 144)
+
+        if self.last_scored_at is not None:
+            batch = self.metrics_store.query_frame(start=self.last_scored_at, columns=FEATURE_COLUMNS)
+            batch = batch[batch['timestamp'] > pd.Timestamp(self.last_scored_at)]
+        else:
+            batch = self.metrics_store.latest(1, columns=FEATURE_COLUMNS)
+        batch = batch.tail(max_backlog)
+
+        if batch.empty:
+            current = asdict(metrics)
+            batch = pd.DataFrame([{**{c: current[c] for c in FEATURE_COLUMNS}, 'timestamp': metrics.timestamp}])
+
+        scored = self.multivariate.score(batch)
+        self.last_scored_at = metrics.timestamp
+        self.last_multivariate = self.multivariate.summary(scored)
+
+        backlog_flagged = int((scored['severity'].iloc[:-1] != '').sum())
+        if backlog_flagged:
+            logger.info(f"Multivariate: {backlog_flagged} of {len(scored) - 1} backlog samples below likelihood threshold")
+
+        current = scored.iloc[-1]
+        if not current['severity']:
+            return []
+
+        threshold = self.multivariate.threshold
+        logger.warning(f"⚠️  Anomaly detected: joint likelihood {current['log_likelihood']:.2f} "
+                       f"(threshold={threshold:.2f}, drivers: {current['drivers']})")
+        return [Anomaly(
+            metric_name='joint_likelihood',
+            severity=current['severity'],
+            value=float(current['log_likelihood']),
+            expected_value=threshold,
+            deviation=float(threshold - current['log_likelihood']),
+            timestamp=metrics.timestamp,
+            recommendation=f"Correlated deviation across metrics, led by {current['drivers']}. "
+                           f"Check for a shared cause (deployment, dependency, traffic shift)"
+        )]
+
     def _determine_severity(self, z_score: float, ewma_deviation: float) -> str:
         """Determine anomaly severity"""
         if z_score > 5 or ewma_deviation > 0.5:
@@ -409,21 +579,17 @@ class OpsBrain:
         return decision
 
     def _calculate_sla(self) -> float:
-        """Calculate current SLA from metrics history"""
-        if len(self.metrics_history) < 10:
+        """Calculate current SLA from the shared prefix counts (last N samples or last N hours)"""
+        window = self.config.get('sla_window', {})
+        if window.get('hours'):
+            counts = self.sla_tracker.window(start=datetime.utcnow() - timedelta(hours=window['hours']))
+        else:
+            counts = self.sla_tracker.last(window.get('samples', 100))
+        if counts['total'] < 10:
             return 99.9
 
-        df = pd.DataFrame(self.metrics_history[-100:])
-
         # SLA = percentage of time with acceptable metrics
-        acceptable = (
-            (df['p95_latency'] < 400) &
-            (df['error_rate'] < 5.0) &
-            (df['cpu_usage'] < 95)
-        )
-
-        sla = (acceptable.sum() / len(df)) * 100
-        return sla
+        return counts['sla']
 
     def apply_decision(self, decision: Decision) -> bool:
         """Apply decision by updating Terraform variables"""
@@ -475,8 +641,8 @@ class OpsBrain:
         return re.sub(pattern, replacement, content, flags=re.MULTILINE)
 
     def send_notifications(self, metrics: Metrics, anomalies: List[Anomaly], decision: Decision):
-        """Send notifications to Slack and Notion"""
-        logger.info("📤 Sending notifications...")
+        """Queue notifications to Slack and Notion (delivered by the outbox workers)"""
+        logger.info("📤 Queueing notifications...")
 
         # Send to Slack
         if self.config.get('slack_webhook_url'):
@@ -486,7 +652,7 @@ class OpsBrain:
         if self.config.get('notion_api_key'):
             self._send_notion_notification(metrics, anomalies, decision)
 
-        logger.info("✓ Notifications sent")
+        logger.info(f"✓ Notifications queued (outbox depth: {self.outbox.depth()})")
 
     def _send_slack_notification(self, metrics: Metrics, anomalies: List[Anomaly], decision: Decision):
         """Send Slack notification"""
@@ -536,11 +702,11 @@ class OpsBrain:
         })
 
         try:
-            response = requests.post(webhook_url, json=message, timeout=10)
-            response.raise_for_status()
-            logger.info("✓ Slack notification sent")
+            # A newer cycle report replaces one still waiting in the outbox
+            self.outbox.enqueue('slack', webhook_url, message, coalesce_key='ops_brain_slack_report')
+            logger.info("✓ Slack notification queued")
         except Exception as e:
-            logger.error(f"Failed to send Slack notification: {e}")
+            logger.error(f"Failed to queue Slack notification: {e}")
 
     def _send_notion_notification(self, metrics: Metrics, anomalies: List[Anomaly], decision: Decision):
         """Send Notion database entry"""
@@ -572,16 +738,10 @@ class OpsBrain:
         }
 
         try:
-            response = requests.post(
-                "https://api.notion.com/v1/pages",
-                headers=headers,
-                json=page_data,
-                timeout=10
-            )
-            response.raise_for_status()
-            logger.info("✓ Notion entry created")
+            self.outbox.enqueue('notion', "https://api.notion.com/v1/pages", page_data, headers=headers)
+            logger.info("✓ Notion entry queued")
         except Exception as e:
-            logger.error(f"Failed to create Notion entry: {e}")
+            logger.error(f"Failed to queue Notion entry: {e}")
 
     def run_cycle(self):
         """Run complete AI Ops cycle"""
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Prometheus Instant-Query Collector
+
+Concurrent, pooled collection of instant PromQL queries.
+
+- All queries of a collection run concurrently over one keep-alive session
+- Overall deadline: queries still running when it expires count as failed
+  and do not hold up the cycle
+- Per-query result cache with a staleness window: repeats of the same query
+  within the window (e.g. a retried collection, or late results from a
+  missed deadline) are served without a request
+- One instance per Prometheus URL per process, so its session, pool and
+  stats are shared; components issue different queries, so the cache is
+  not a cross-component result store
+- Per-query latency / failure / timeout / cache-hit accounting
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger('prometheus_collector')
+
+
+class QueryStats:
+    """Latency and outcome counters for one query"""
+
+    def __init__(self, window: int = 100):
+        self.requests = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.cache_hits = 0
+        self.empty = 0  # Successful queries with no series
+        self.latencies_ms = deque(maxlen=window)
+
+    def to_dict(self) -> Dict:
+        latencies = np.asarray(self.latencies_ms) if self.latencies_ms else None
+        return {
+            'requests': self.requests,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'cache_hits': self.cache_hits,
+            'empty': self.empty,
+            'p50_ms': round(float(np.percentile(latencies, 50)), 1) if latencies is not None else None,
+            'p95_ms': round(float(np.percentile(latencies, 95)), 1) if latencies is not None else None,
+            'last_ms': round(float(latencies[-1]), 1) if latencies is not None else None
+        }
+
+
+class PrometheusCollector:
+    """
+    Instant-query client with a thread pool, pooled session and result cache.
+
+    Use `get_collector(url)` to share one instance (session, pool, stats)
+    per Prometheus URL within a process.
+    """
+
+    def __init__(
+        self,
+        prometheus_url: str,
+        query_timeout: float = 10.0,
+        deadline_seconds: float = 15.0,
+        staleness_seconds: float = 60.0,
+        max_workers: int = 9
+    ):
+        self.prometheus_url = prometheus_url.rstrip('/')
+        self.query_timeout = query_timeout
+        self.deadline_seconds = deadline_seconds
+        self.staleness_seconds = staleness_seconds
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prom-query')
+
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, float]] = {}  # query -> (fetched_at, value)
+        self.stats: Dict[str, QueryStats] = {}
+        self.last_collection: Dict = {}
+
+    def configure(self, query_timeout=None, deadline_seconds=None, staleness_seconds=None) -> None:
+        """Update timeouts / staleness in place (shared instances keep their cache)"""
+        if query_timeout is not None:
+            self.query_timeout = query_timeout
+        if deadline_seconds is not None:
+            self.deadline_seconds = deadline_seconds
+        if staleness_seconds is not None:
+            self.staleness_seconds = staleness_seconds
+
+    def _query_stats(self, query: str) -> QueryStats:
+        """Stats entry for a query (caller holds the lock)"""
+        if query not in self.stats:
+            self.stats[query] = QueryStats()
+        return self.stats[query]
+
+    def cached(self, query: str, max_age: Optional[float] = None) -> Optional[float]:
+        """Cached value if fetched within `max_age` seconds (default: staleness window)"""
+        max_age = self.staleness_seconds if max_age is None else max_age
+        with self._lock:
+            entry = self._cache.get(query)
+        if entry is not None and time.time() - entry[0] <= max_age:
+            return entry[1]
+        return None
+
+    def _fetch(self, query: str) -> Optional[float]:
+        """One HTTP instant query; caches and returns the value, None on failure or an empty result"""
+        started = time.perf_counter()
+        try:
+            response = self._session.get(
+                f"{self.prometheus_url}/api/v1/query",
+                params={'query': query},
+                timeout=self.query_timeout
+            )
+            response.raise_for_status()
+
+            data = response.json()
+            if data['status'] != 'success':
+                raise RuntimeError(data.get('error', 'query failed'))
+
+            value = None
+            if data['data']['result']:
+                value = float(data['data']['result'][0]['value'][1])
+
+            with self._lock:
+                if value is not None:
+                    self._cache[query] = (time.time(), value)
+                stats = self._query_stats(query)
+                stats.requests += 1
+                if value is None:
+                    stats.empty += 1
+                stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+            return value
+
+        except Exception as e:
+            with self._lock:
+                stats = self._query_stats(query)
+                stats.requests += 1
+                stats.failures += 1
+                if isinstance(e, requests.Timeout):
+                    stats.timeouts += 1
+                stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+            logger.error(f"Prometheus query failed: {e}")
+            return None
+
+    def query(self, query: str, max_age: Optional[float] = None) -> Optional[float]:
+        """Single instant query, served from cache when fresh enough"""
+        value = self.cached(query, max_age)
+        if value is not None:
+            with self._lock:
+                self._query_stats(query).cache_hits += 1
+            return value
+        return self._fetch(query)
+
+    def query_many(
+        self,
+        queries: Dict[str, str],
+        deadline_seconds: Optional[float] = None,
+        max_age: Optional[float] = None
+    ) -> Dict[str, Optional[float]]:
+        """
+        Run named queries concurrently.
+
+        Args:
+            queries: {name: PromQL}
+            deadline_seconds: Overall budget (default: configured deadline)
+            max_age: Accept cached values this fresh (default: staleness window)
+
+        Returns:
+            {name: value or None (failed, no data or past the deadline)}
+        """
+        started = time.perf_counter()
+        deadline = self.deadline_seconds if deadline_seconds is None else deadline_seconds
+
+        results: Dict[str, Optional[float]] = {}
+        pending = {}
+        cache_hits = 0
+        for name, query in queries.items():
+            value = self.cached(query, max_age)
+            if value is not None:
+                results[name] = value
+                cache_hits += 1
+                with self._lock:
+                    self._query_stats(query).cache_hits += 1
+            else:
+                pending[self._executor.submit(self._fetch, query)] = name
+
+        done, not_done = wait(pending, timeout=deadline) if pending else (set(), set())
+        for future in done:
+            results[pending[future]] = future.result()
+        for future in not_done:
+            # Left running in the background; a late result still lands in the cache
+            name = pending[future]
+            results[name] = None
+            with self._lock:
+                self._query_stats(queries[name]).timeouts += 1
+            logger.warning(f"Prometheus query '{name}' missed the {deadline:.1f}s collection deadline")
+
+        self.last_collection = {
+            'queries': len(queries),
+            'fetched': len(pending),
+            'cache_hits': cache_hits,
+            'missing': sum(1 for name in pending.values() if results.get(name) is None),
+            'deadline_exceeded': len(not_done),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+        return results
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per-query stats, keyed by PromQL"""
+        with self._lock:
+            return {query: stats.to_dict() for query, stats in self.stats.items()}
+
+
+_collectors: Dict[str, PrometheusCollector] = {}
+_collectors_lock = threading.Lock()
+
+
+def get_collector(prometheus_url: str, **kwargs) -> PrometheusCollector:
+    """Process-wide collector for a Prometheus URL (created on first use)"""
+    key = prometheus_url.rstrip('/')
+    with _collectors_lock:
+        if key not in _collectors:
+            _collectors[key] = PrometheusCollector(key, **kwargs)
+        return _collectors[key]
@@ -3,6 +3,11 @@
 NeuroPilot v17.3 - Anomaly Detection Trainer
 Incremental learning system that trains on historical metrics
 to improve anomaly detection accuracy over time.
+
+Modes (v17.7):
+    full       Refit on the whole lookback window
+    streaming  Online EM over samples stored since the last run, in chunks
+    select     Parallel n_components search by BIC on a reservoir sample
 """
 
 import os
@@ -22,6 +27,13 @@ from sklearn.cluster import MiniBatchKMeans
 from sklearn.metrics import silhouette_score
 
 # Configure logging
+# Add ai_ops to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from metrics_store import MetricsStore
+from multivariate_scorer import FEATURE_COLUMNS, calibrate_thresholds, save_thresholds
+from online_gmm import OnlineGMMStats, ReservoirSample, select_n_components
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -39,13 +51,18 @@ class AnomalyTrainer:
         self.lookback_hours = lookback_hours
         self.model_path = Path('ai_ops/models/anomaly_model.pkl')
         self.scaler_path = Path('ai_ops/models/scaler.pkl')
-        self.history_path = Path('ai_ops/models/metrics_history.json')
+        self.history_path = Path('ai_ops/models/metrics_history.json')  # Legacy, migrated on first read
+        self.metrics_store = MetricsStore()
         self.training_log_path = Path('ai_ops/models/training_log.json')
+        self.thresholds_path = Path('ai_ops/models/anomaly_thresholds.json')
+        self.online_state_path = Path('ai_ops/models/online_gmm.npz')
 
         # Load existing models or initialize
         self.model = self._load_or_init_model()
         self.scaler = self._load_or_init_scaler()
         self.training_log = self._load_training_log()
+        self.calibration: Dict = {}
+        self.online_state = None  # (OnlineGMMStats, ReservoirSample) after a streaming / select run
 
     def _load_or_init_model(self) -> GaussianMixture:
         """Load existing model or initialize"""
@@ -90,37 +107,20 @@ class AnomalyTrainer:
         """Load historical metrics from last 24 hours"""
         logger.info(f"Loading last {self.lookback_hours} hours of metrics...")
 
-        if not self.history_path.exists():
-            logger.warning("No metrics history found")
-            return pd.DataFrame()
-
-        with open(self.history_path, 'r') as f:
-            history = json.load(f)
+        if self.history_path.exists():
+            self.metrics_store.import_json(self.history_path)
 
-        df = pd.DataFrame(history)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-
-        # Filter to lookback period
+        # Read only the lookback window's partitions
         cutoff = datetime.utcnow() - timedelta(hours=self.lookback_hours)
-        df = df[df['timestamp'] >= cutoff]
+        df = self.metrics_store.query_frame(start=cutoff)
 
         logger.info(f"✓ Loaded {len(df)} data points")
         return df
 
     def prepare_features(self, df: pd.DataFrame) -> np.ndarray:
         """Extract and normalize features for training"""
-        feature_cols = [
-            'cpu_usage',
-            'memory_usage',
-            'p95_latency',
-            'p99_latency',
-            'error_rate',
-            'request_rate',
-            'database_query_time'
-        ]
-
-        # Select features
-        X = df[feature_cols].values
+        # Select features (shared with the Ops Brain multivariate scorer)
+        X = df[FEATURE_COLUMNS].values
 
         # Handle NaN/inf
         X = np.nan_to_num(X, nan=0.0, posinf=0.0, neginf=0.0)
@@ -169,6 +169,9 @@ class AnomalyTrainer:
             # Training loss (negative log-likelihood)
             loss = -log_likelihood
 
+            # Log-likelihood thresholds for Ops Brain joint scoring
+            self.calibration = calibrate_thresholds(self.model, X)
+
             metrics = {
                 'loss': loss,
                 'log_likelihood': log_likelihood,
@@ -176,7 +179,8 @@ class AnomalyTrainer:
                 'bic': bic,
                 'aic': aic,
                 'n_components': self.model.n_components,
-                'n_samples': len(X)
+                'n_samples': len(X),
+                'thresholds': self.calibration['thresholds']
             }
 
             logger.info(f"✓ Training complete - Loss: {loss:.4f}, Silhouette: {silhouette:.4f}")
@@ -231,8 +235,143 @@ class AnomalyTrainer:
         with open(self.scaler_path, 'wb') as f:
             pickle.dump(self.scaler, f)
 
+        if self.calibration:
+            save_thresholds(self.calibration, self.thresholds_path)
+
+        if self.online_state is not None:
+            stats, reservoir = self.online_state
+            stats.save(self.online_state_path, reservoir)
+
         logger.info("✓ Models saved")
 
+    # ==================== Streaming / Model Selection ====================
+
+    def _stream(self, start, chunk_size: int, reservoir: ReservoirSample, fit_scaler: bool = True):
+        """
+        Yield raw feature chunks from the metrics store since `start`, folding
+        each into the scaler and the reservoir first.
+        """
+        for timestamps, X in self.metrics_store.iter_chunks(start=start, columns=FEATURE_COLUMNS, chunk_size=chunk_size):
+            X = np.nan_to_num(X, nan=0.0, posinf=0.0, neginf=0.0)
+            if fit_scaler:
+                self.scaler.partial_fit(X)
+            reservoir.add(X)
+            yield timestamps, X
+
+    def _score_reservoir(self, reservoir: ReservoirSample, n_new: int) -> Tuple[float, Dict]:
+        """Training metrics and thresholds on the reservoir sample instead of the full history"""
+        X = self.scaler.transform(reservoir.sample)
+        predictions = self.model.predict(X)
+
+        try:
+            silhouette = float(silhouette_score(X, predictions, sample_size=min(len(X), 2000), random_state=42))
+        except ValueError:
+            silhouette = 0.0  # Single cluster in the sample
+
+        log_likelihood = float(self.model.score(X))
+        self.calibration = calibrate_thresholds(self.model, X)
+
+        metrics = {
+            'loss': -log_likelihood,
+            'log_likelihood': log_likelihood,
+            'silhouette_score': silhouette,
+            'bic': float(self.model.bic(X)),
+            'aic': float(self.model.aic(X)),
+            'n_components': int(self.model.n_components),
+            'n_samples': n_new,
+            'reservoir_samples': len(X),
+            'samples_seen': reservoir.seen,
+            'thresholds': self.calibration['thresholds']
+        }
+        return -log_likelihood, metrics
+
+    def train_streaming(self, chunk_size: int = 2048, reservoir_size: int = 5000,
+                        memory_samples: float = 20000) -> Tuple[float, Dict]:
+        """
+        Fold samples stored since the previous streaming run into the model
+        with online EM. The first run (or a model that cannot be updated
+        online) is bootstrapped from the lookback window.
+
+        Returns: (loss, metrics)
+        """
+        stats, reservoir = OnlineGMMStats.load(self.online_state_path)
+
+        if (stats is None or stats.trained_until is None or not OnlineGMMStats.supports(self.model)
+                or len(stats.counts) != self.model.n_components):
+            logger.info("No online state - bootstrapping from the lookback window")
+            self.scaler = StandardScaler()
+            reservoir = ReservoirSample(reservoir_size, len(FEATURE_COLUMNS))
+            cutoff = datetime.utcnow() - timedelta(hours=self.lookback_hours)
+
+            last_ts = None
+            for timestamps, _ in self._stream(cutoff, chunk_size, reservoir):
+                last_ts = timestamps[-1]
+            if reservoir.seen < 10:
+                logger.warning("Insufficient samples for training")
+                return float('inf'), {}
+
+            self.model.fit(self.scaler.transform(reservoir.sample))
+            stats = OnlineGMMStats.from_model(self.model, self.scaler, reservoir.seen, memory_samples)
+            stats.trained_until = float(last_ts)
+            n_new = reservoir.seen
+
+        else:
+            if reservoir is None:
+                reservoir = ReservoirSample(reservoir_size, len(FEATURE_COLUMNS))
+
+            n_new = 0
+            for timestamps, X in self._stream(stats.trained_until, chunk_size, reservoir):
+                new = timestamps > stats.trained_until  # Window start is inclusive
+                if not new.any():
+                    continue
+                stats.update(self.model, self.scaler, X[new])
+                stats.trained_until = float(timestamps[-1])
+                n_new += int(new.sum())
+
+            if n_new == 0:
+                logger.info("No new samples since the last run")
+                return float('inf'), {'n_samples': 0}
+            logger.info(f"Folded {n_new} new samples into the model")
+
+        self.online_state = (stats, reservoir)
+        loss, metrics = self._score_reservoir(reservoir, n_new)
+        logger.info(f"✓ Streaming update complete - Loss: {loss:.4f}, Silhouette: {metrics['silhouette_score']:.4f}")
+        return loss, metrics
+
+    def select_model(self, candidates: List[int], max_workers: int = None, chunk_size: int = 2048,
+                     reservoir_size: int = 5000, memory_samples: float = 20000) -> Tuple[float, Dict]:
+        """
+        Refit the scaler over the lookback window (streamed), then fit one
+        mixture per candidate n_components on the reservoir sample in
+        parallel processes and keep the lowest BIC. Resets the online state.
+
+        Returns: (loss, metrics)
+        """
+        self.scaler = StandardScaler()
+        reservoir = ReservoirSample(reservoir_size, len(FEATURE_COLUMNS))
+        cutoff = datetime.utcnow() - timedelta(hours=self.lookback_hours)
+
+        last_ts = None
+        for timestamps, _ in self._stream(cutoff, chunk_size, reservoir):
+            last_ts = timestamps[-1]
+        if reservoir.seen < 10:
+            logger.warning("Insufficient samples for training")
+            return float('inf'), {}
+
+        X = self.scaler.transform(reservoir.sample)
+        self.model, bics = select_n_components(X, candidates, max_workers)
+        self.model.warm_start = True
+        logger.info("BIC by n_components: " + ", ".join(f"{k}={bic:.1f}" for k, bic in sorted(bics.items())))
+
+        stats = OnlineGMMStats.from_model(self.model, self.scaler, reservoir.seen, memory_samples)
+        stats.trained_until = float(last_ts)
+        self.online_state = (stats, reservoir)
+
+        loss, metrics = self._score_reservoir(reservoir, reservoir.seen)
+        metrics['bic_by_components'] = {str(k): bic for k, bic in bics.items()}
+        logger.info(f"✓ Selected n_components={self.model.n_components} - Loss: {loss:.4f}")
+        return loss, metrics
+
     def log_training_run(self, loss: float, train_metrics: Dict, eval_metrics: Dict):
         """Log training run to history"""
         log_entry = {
@@ -254,6 +393,45 @@ class AnomalyTrainer:
 
         logger.info("✓ Training run logged")
 
+    def run_incremental(self, mode: str, candidates: List[int] = None, max_workers: int = None,
+                        chunk_size: int = 2048, reservoir_size: int = 5000) -> bool:
+        """Streaming or model-selection cycle"""
+        logger.info("=" * 60)
+        logger.info(f"🎓 Starting Anomaly Trainer ({mode})")
+        logger.info("=" * 60)
+
+        try:
+            if self.history_path.exists():
+                self.metrics_store.import_json(self.history_path)
+
+            if mode == 'select':
+                loss, train_metrics = self.select_model(candidates or [2, 3, 4, 5, 6], max_workers,
+                                                        chunk_size, reservoir_size)
+            else:
+                loss, train_metrics = self.train_streaming(chunk_size, reservoir_size)
+
+            if loss == float('inf'):
+                # Model already up to date is not a failure
+                return train_metrics.get('n_samples') == 0
+
+            _, reservoir = self.online_state
+            eval_metrics = self.evaluate_model(self.scaler.transform(reservoir.sample))
+
+            self.save_models()
+            self.log_training_run(loss, train_metrics, eval_metrics)
+
+            logger.info("=" * 60)
+            logger.info("✅ Anomaly Trainer completed successfully")
+            logger.info(f"   Loss: {loss:.4f}")
+            logger.info(f"   Anomaly Rate: {eval_metrics.get('anomaly_rate', 0):.2%}")
+            logger.info("=" * 60)
+
+            return True
+
+        except Exception as e:
+            logger.error(f"❌ Anomaly Trainer failed: {e}", exc_info=True)
+            return False
+
     def run(self) -> bool:
         """Execute complete training cycle"""
         logger.info("=" * 60)
@@ -281,6 +459,15 @@ class AnomalyTrainer:
             # 4. Evaluate model
             eval_metrics = self.evaluate_model(X)
 
+            # Re-seed the streaming state from the refit model
+            if OnlineGMMStats.supports(self.model):
+                raw = np.nan_to_num(df[FEATURE_COLUMNS].values, nan=0.0, posinf=0.0, neginf=0.0)
+                reservoir = ReservoirSample(5000, len(FEATURE_COLUMNS))
+                reservoir.add(raw)
+                stats = OnlineGMMStats.from_model(self.model, self.scaler, len(raw))
+                stats.trained_until = df['timestamp'].iloc[-1].timestamp()
+                self.online_state = (stats, reservoir)
+
             # 5. Save models
             self.save_models()
 
@@ -307,10 +494,24 @@ def main():
     parser = argparse.ArgumentParser(description='Train anomaly detection model')
     parser.add_argument('--lookback-hours', type=int, default=24,
                        help='Hours of historical data to train on')
+    parser.add_argument('--mode', choices=['full', 'streaming', 'select'], default='full',
+                       help='full refit, online update with new samples, or parallel n_components search')
+    parser.add_argument('--components', type=int, nargs='+', default=[2, 3, 4, 5, 6],
+                       help='Candidate n_components for --mode select')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Processes for --mode select (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=2048,
+                       help='Samples per streamed chunk')
+    parser.add_argument('--reservoir-size', type=int, default=5000,
+                       help='Reservoir sample used for silhouette, BIC and thresholds')
     args = parser.parse_args()
 
     trainer = AnomalyTrainer(lookback_hours=args.lookback_hours)
-    success = trainer.run()
+    if args.mode == 'full':
+        success = trainer.run()
+    else:
+        success = trainer.run_incremental(args.mode, args.components, args.workers,
+                                          args.chunk_size, args.reservoir_size)
 
     sys.exit(0 if success else 1)
 
@@ -16,7 +16,14 @@ from typing import Dict, List, Any
 import pandas as pd
 import numpy as np
 import yaml
-import requests
+
+# Add ai_ops to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from metrics_store import MetricsStore
+from metrics_rollup import MetricsRollup
+from notification_outbox import get_outbox
+from sla_tracker import get_sla_tracker
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,7 +37,11 @@ class DailyReportGenerator:
 
     def __init__(self, config_path: str = 'ai_ops/config/ops_config.yaml'):
         self.config = self._load_config(config_path)
-        self.history_path = Path('ai_ops/models/metrics_history.json')
+        self.history_path = Path('ai_ops/models/metrics_history.json')  # Legacy, migrated on first read
+        self.metrics_store = MetricsStore()
+        self.rollup = MetricsRollup(self.metrics_store)
+        self.sla_tracker = get_sla_tracker(self.metrics_store)
+        self.outbox = get_outbox()
         self.training_log_path = Path('ai_ops/models/training_log.json')
 
     def _load_config(self, config_path: str) -> Dict:
@@ -41,19 +52,25 @@ class DailyReportGenerator:
         except:
             return {}
 
-    def calculate_health_score(self, df: pd.DataFrame) -> float:
+    @staticmethod
+    def _mean(summary: Dict[str, Dict[str, float]], metric: str) -> float:
+        """Window mean of a metric from a rollup summary (0 if no samples)"""
+        stats = summary.get(metric, {})
+        return stats['mean'] if stats.get('count') else 0.0
+
+    def calculate_health_score(self, summary: Dict[str, Dict[str, float]]) -> float:
         """
         Calculate system health score (0-100)
         Based on: latency, error rate, CPU, memory, availability
         """
-        if df.empty:
+        if not summary.get('p95_latency', {}).get('count'):
             return 50.0
 
         # Component scores (0-100 each)
-        latency_score = max(0, 100 - (df['p95_latency'].mean() / 4))  # 400ms = 0 points
-        error_score = max(0, 100 - (df['error_rate'].mean() * 20))  # 5% = 0 points
-        cpu_score = max(0, 100 - df['cpu_usage'].mean())
-        memory_score = max(0, 100 - df['memory_usage'].mean())
+        latency_score = max(0, 100 - (self._mean(summary, 'p95_latency') / 4))  # 400ms = 0 points
+        error_score = max(0, 100 - (self._mean(summary, 'error_rate') * 20))  # 5% = 0 points
+        cpu_score = max(0, 100 - self._mean(summary, 'cpu_usage'))
+        memory_score = max(0, 100 - self._mean(summary, 'memory_usage'))
 
         # Weighted average
         health_score = (
@@ -65,20 +82,19 @@ class DailyReportGenerator:
 
         return min(100, max(0, health_score))
 
-    def analyze_trends(self, df: pd.DataFrame) -> Dict[str, str]:
-        """Analyze metric trends over time"""
+    def analyze_trends(self, recent: Dict[str, Dict[str, float]],
+                       previous: Dict[str, Dict[str, float]]) -> Dict[str, str]:
+        """Analyze metric trends over time (last 24h vs previous 24h rollup summaries)"""
         trends = {}
 
         metrics = ['cpu_usage', 'memory_usage', 'p95_latency', 'error_rate']
 
         for metric in metrics:
-            if metric not in df.columns:
+            if metric not in recent:
                 continue
 
-            # Calculate trend (last 24h vs previous 24h)
-            midpoint = len(df) // 2
-            recent_avg = df[metric].iloc[midpoint:].mean()
-            previous_avg = df[metric].iloc[:midpoint].mean()
+            recent_avg = self._mean(recent, metric)
+            previous_avg = self._mean(previous, metric)
 
             if previous_avg == 0:
                 trend = "stable"
@@ -175,87 +191,85 @@ class DailyReportGenerator:
         """Generate complete daily report"""
         logger.info("📊 Generating daily report...")
 
-        # Load last 48 hours of data
-        if not self.history_path.exists():
-            logger.warning("No metrics history found")
-            return {}
-
-        with open(self.history_path, 'r') as f:
-            history = json.load(f)
-
-        df = pd.DataFrame(history)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        if self.history_path.exists():
+            self.metrics_store.import_json(self.history_path)
 
-        # Filter to last 48 hours
-        cutoff = datetime.utcnow() - timedelta(hours=48)
-        df = df[df['timestamp'] >= cutoff]
+        # Fold completed hours into the rollups and new samples into the SLA counts, then read windows from them
+        self.rollup.update()
+        self.sla_tracker.update()
+        now = datetime.utcnow()
+        last_24h = self.rollup.summary(now - timedelta(hours=24))
+        previous_24h = self.rollup.summary(now - timedelta(hours=48), end=now - timedelta(hours=24))
 
-        if df.empty:
+        if not last_24h['p95_latency']['count'] and not previous_24h['p95_latency']['count']:
             logger.warning("No data in last 48 hours")
             return {}
 
+        baseline_7d = self.rollup.summary(now - timedelta(days=7))
+        baseline_30d = self.rollup.summary(now - timedelta(days=30))
+
+        # Per-sample views the aggregates cannot answer: latest values, instance changes
+        latest = self.metrics_store.latest(1)
+        df = self.metrics_store.query_frame(start=now - timedelta(hours=24), columns=['active_instances'])
+        sla_windows = self.sla_tracker.standard_windows(now)
+
         # Calculate components
-        health_score = self.calculate_health_score(df)
-        trends = self.analyze_trends(df)
+        health_score = self.calculate_health_score(last_24h)
+        trends = self.analyze_trends(last_24h, previous_24h)
         scaling_actions = self.get_scaling_actions(df)
-        cost_projection = self.get_cost_projection(df)
+        cost_projection = self.get_cost_projection(latest)
         ai_status = self.get_ai_learning_status()
 
-        # Get 7-day baseline for comparison
-        df_7day = df[df['timestamp'] >= (datetime.utcnow() - timedelta(days=7))]
+        def current(metric: str) -> float:
+            return float(latest[metric].iloc[-1]) if len(latest) > 0 else 0
 
         report = {
-            'generated_at': datetime.utcnow().isoformat(),
+            'generated_at': now.isoformat(),
             'period': 'Last 24 hours',
             'health_score': health_score,
             'metrics': {
                 'p95_latency': {
-                    'current': df['p95_latency'].iloc[-1] if len(df) > 0 else 0,
-                    'avg_24h': df['p95_latency'].mean(),
-                    'avg_7d_baseline': df_7day['p95_latency'].mean() if len(df_7day) > 0 else 0
+                    'current': current('p95_latency'),
+                    'avg_24h': self._mean(last_24h, 'p95_latency'),
+                    'p95_24h': last_24h['p95_latency']['p95'],
+                    'avg_7d_baseline': self._mean(baseline_7d, 'p95_latency'),
+                    'avg_30d_baseline': self._mean(baseline_30d, 'p95_latency')
                 },
                 'error_rate': {
-                    'current': df['error_rate'].iloc[-1] if len(df) > 0 else 0,
-                    'avg_24h': df['error_rate'].mean(),
-                    'max_24h': df['error_rate'].max()
+                    'current': current('error_rate'),
+                    'avg_24h': self._mean(last_24h, 'error_rate'),
+                    'max_24h': last_24h['error_rate']['max'],
+                    'avg_7d_baseline': self._mean(baseline_7d, 'error_rate')
                 },
                 'cpu_usage': {
-                    'current': df['cpu_usage'].iloc[-1] if len(df) > 0 else 0,
-                    'avg_24h': df['cpu_usage'].mean(),
-                    'max_24h': df['cpu_usage'].max()
+                    'current': current('cpu_usage'),
+                    'avg_24h': self._mean(last_24h, 'cpu_usage'),
+                    'max_24h': last_24h['cpu_usage']['max']
                 },
                 'memory_usage': {
-                    'current': df['memory_usage'].iloc[-1] if len(df) > 0 else 0,
-                    'avg_24h': df['memory_usage'].mean(),
-                    'max_24h': df['memory_usage'].max()
+                    'current': current('memory_usage'),
+                    'avg_24h': self._mean(last_24h, 'memory_usage'),
+                    'max_24h': last_24h['memory_usage']['max']
                 }
             },
             'trends': trends,
             'scaling_actions': scaling_actions,
             'cost_projection': cost_projection,
             'ai_learning': ai_status,
-            'sla': self._calculate_sla(df),
-            'recommendations': self._generate_recommendations(df, health_score, cost_projection)
+            'sla': sla_windows['24h'] if sla_windows['24h'] is not None else 99.9,
+            'sla_windows': sla_windows,
+            'recommendations': self._generate_recommendations(last_24h, health_score, cost_projection)
         }
 
         logger.info(f"✓ Report generated - Health Score: {health_score:.1f}/100")
 
         return report
 
-    def _calculate_sla(self, df: pd.DataFrame) -> float:
-        """Calculate SLA from dataframe"""
-        if df.empty:
-            return 99.9
-
-        acceptable = (
-            (df['p95_latency'] < 400) &
-            (df['error_rate'] < 5.0) &
-            (df['cpu_usage'] < 95)
-        )
-
-        return (acceptable.sum() / len(df)) * 100
+    @staticmethod
+    def _format_sla(sla) -> str:
+        return f"{sla:.2f}%" if sla is not None else "n/a"
 
-    def _generate_recommendations(self, df: pd.DataFrame, health_score: float,
+    def _generate_recommendations(self, summary: Dict[str, Dict[str, float]], health_score: float,
                                   cost_projection: Dict) -> List[str]:
         """Generate actionable recommendations"""
         recommendations = []
@@ -265,11 +279,11 @@ class DailyReportGenerator:
             recommendations.append("⚠️ System health is degraded. Review error logs and consider scaling up.")
 
         # Latency recommendations
-        if df['p95_latency'].mean() > 200:
+        if self._mean(summary, 'p95_latency') > 200:
             recommendations.append("🐌 Latency is elevated. Consider adding database indexes or scaling.")
 
         # Error rate recommendations
-        if df['error_rate'].mean() > 2:
+        if self._mean(summary, 'error_rate') > 2:
             recommendations.append("🔴 Error rate above target. Investigate recent deployments.")
 
         # Cost recommendations
@@ -279,9 +293,9 @@ class DailyReportGenerator:
             recommendations.append("💡 Running under budget. Consider enabling multi-region HA for better SLA.")
 
         # CPU recommendations
-        if df['cpu_usage'].mean() > 80:
+        if self._mean(summary, 'cpu_usage') > 80:
             recommendations.append("📈 High CPU usage. Scale up or optimize application code.")
-        elif df['cpu_usage'].mean() < 30:
+        elif self._mean(summary, 'cpu_usage') < 30:
             recommendations.append("📉 Low CPU usage. Consider scaling down to reduce costs.")
 
         if not recommendations:
@@ -324,7 +338,7 @@ class DailyReportGenerator:
                     "type": "section",
                     "fields": [
                         {"type": "mrkdwn", "text": f"*Health Score:*\n{health_score:.1f}/100 ({status})"},
-                        {"type": "mrkdwn", "text": f"*SLA:*\n{report['sla']:.2f}%"},
+                        {"type": "mrkdwn", "text": f"*SLA (24h / 30d):*\n{report['sla']:.2f}% / {self._format_sla(report['sla_windows']['30d'])}"},
                         {"type": "mrkdwn", "text": f"*p95 Latency:*\n{report['metrics']['p95_latency']['current']:.0f}ms"},
                         {"type": "mrkdwn", "text": f"*Cost:*\n${report['cost_projection']['current']:.2f}"}
                     ]
@@ -357,11 +371,10 @@ class DailyReportGenerator:
         }
 
         try:
-            response = requests.post(webhook_url, json=message, timeout=10)
-            response.raise_for_status()
-            logger.info("✓ Slack report sent")
+            self.outbox.enqueue('slack', webhook_url, message, coalesce_key='daily_report_slack')
+            logger.info("✓ Slack report queued")
         except Exception as e:
-            logger.error(f"Failed to send Slack report: {e}")
+            logger.error(f"Failed to queue Slack report: {e}")
 
     def send_notion_report(self, report: Dict):
         """Send report to Notion database"""
@@ -396,16 +409,10 @@ class DailyReportGenerator:
         }
 
         try:
-            response = requests.post(
-                "https://api.notion.com/v1/pages",
-                headers=headers,
-                json=page_data,
-                timeout=10
-            )
-            response.raise_for_status()
-            logger.info("✓ Notion report sent")
+            self.outbox.enqueue('notion', "https://api.notion.com/v1/pages", page_data, headers=headers)
+            logger.info("✓ Notion report queued")
         except Exception as e:
-            logger.error(f"Failed to send Notion report: {e}")
+            logger.error(f"Failed to queue Notion report: {e}")
 
     def run(self) -> bool:
         """Generate and send daily report"""
@@ -424,6 +431,8 @@ class DailyReportGenerator:
             # Send to channels
             self.send_slack_report(report)
             self.send_notion_report(report)
+            if not self.outbox.flush(timeout=30):
+                logger.warning(f"Report notifications still queued ({self.outbox.depth()}), next run will deliver")
 
             # Save report locally
             report_path = Path('ai_ops/reports')
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Seasonal Baseline Profiles
+
+Hour-of-week robust baselines for Ops Brain anomaly detection.
+
+- 168 buckets (UTC weekday x hour) per metric
+- Per bucket: ring of the last N samples, with median and MAD kept as
+  compact (168, k) arrays
+- Incremental update touches one bucket: O(N) for fixed N, independent of
+  history length
+- Scoring is an array lookup: robust z = |x - median| / (1.4826 * MAD)
+- Vectorized bulk rebuild from the metrics store
+- Persisted as one .npz file
+
+Usage:
+    python3 ai_ops/seasonal_profile.py rebuild --weeks 8
+    python3 ai_ops/seasonal_profile.py show --metric cpu_usage
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import argparse
+import json
+import logging
+import os
+import warnings
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger('ops_brain')
+
+HOURS_PER_WEEK = 168
+MAD_TO_SIGMA = 1.4826  # MAD of a normal distribution = 0.6745 sigma
+
+DEFAULT_PROFILE_PATH = Path('ai_ops/models/seasonal_profile.npz')
+
+
+def hour_of_week(timestamp) -> int:
+    """UTC hour-of-week bucket (Monday 00:00 = 0)"""
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return timestamp.weekday() * 24 + timestamp.hour
+
+
+class SeasonalProfile:
+    """
+    Per-metric, per-hour-of-week median / MAD baselines.
+
+    A bucket is usable once it holds `min_samples` samples; until then
+    `score()` returns None for it and callers fall back to the flat baseline.
+    """
+
+    def __init__(self, metrics: List[str], samples_per_bucket: int = 48, min_samples: int = 6):
+        self.metrics = list(metrics)
+        self.capacity = int(samples_per_bucket)
+        self.min_samples = int(min_samples)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all samples"""
+        k = len(self.metrics)
+        self.samples = np.full((HOURS_PER_WEEK, self.capacity, k), np.nan)
+        self.counts = np.zeros(HOURS_PER_WEEK, dtype=np.int64)  # Samples ever seen per bucket
+        self.median = np.full((HOURS_PER_WEEK, k), np.nan)
+        self.mad = np.full((HOURS_PER_WEEK, k), np.nan)
+
+    def _refresh(self, buckets) -> None:
+        """Recompute median / MAD for the given buckets"""
+        window = self.samples[buckets]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # Empty buckets stay NaN
+            median = np.nanmedian(window, axis=-2)
+            mad = np.nanmedian(np.abs(window - np.expand_dims(median, -2)), axis=-2)
+        self.median[buckets] = median
+        self.mad[buckets] = mad
+
+    def update(self, sample: Dict[str, float], timestamp=None) -> None:
+        """Fold one sample into its hour-of-week bucket"""
+        bucket = hour_of_week(timestamp if timestamp is not None else sample['timestamp'])
+        slot = self.counts[bucket] % self.capacity
+        self.samples[bucket, slot] = [float(sample.get(metric, np.nan)) for metric in self.metrics]
+        self.counts[bucket] += 1
+
+        window = self.samples[bucket, :min(self.counts[bucket], self.capacity)]
+        if np.isnan(window).any():
+            self._refresh(bucket)
+        else:
+            median = np.median(window, axis=0)
+            self.median[bucket] = median
+            self.mad[bucket] = np.median(np.abs(window - median), axis=0)
+
+    def ready(self, timestamp) -> bool:
+        """Whether the bucket for `timestamp` has enough samples to score against"""
+        return self.counts[hour_of_week(timestamp)] >= self.min_samples
+
+    def baseline(self, metric: str, timestamp) -> Optional[Dict[str, float]]:
+        """Median / MAD / sample count for a metric at a time, or None if the bucket is not ready"""
+        bucket = hour_of_week(timestamp)
+        if self.counts[bucket] < self.min_samples:
+            return None
+        i = self.metrics.index(metric)
+        return {
+            'median': float(self.median[bucket, i]),
+            'mad': float(self.mad[bucket, i]),
+            'samples': int(min(self.counts[bucket], self.capacity))
+        }
+
+    def score(self, metric: str, value: float, timestamp) -> Optional[float]:
+        """
+        Robust z-score of `value` against its hour-of-week baseline.
+
+        Returns None if the bucket is not ready or has zero spread (MAD = 0),
+        so the caller can fall back to another scale.
+        """
+        baseline = self.baseline(metric, timestamp)
+        if baseline is None or not baseline['mad'] > 0:
+            return None
+        return abs(value - baseline['median']) / (MAD_TO_SIGMA * baseline['mad'])
+
+    def rebuild(self, timestamps: pd.Series, values: np.ndarray) -> int:
+        """
+        Rebuild all buckets in one vectorized pass.
+
+        Args:
+            timestamps: Sample times (naive UTC), any order
+            values: (n, len(metrics)) array aligned with timestamps
+
+        Returns:
+            Samples retained (at most samples_per_bucket per bucket, newest kept)
+        """
+        self.reset()
+        timestamps = pd.to_datetime(pd.Series(timestamps)).reset_index(drop=True)
+        values = np.asarray(values, dtype=np.float64).reshape(len(timestamps), len(self.metrics))
+        if len(values) == 0:
+            return 0
+
+        buckets = (timestamps.dt.weekday * 24 + timestamps.dt.hour).to_numpy()
+        order = np.lexsort((timestamps.to_numpy(), buckets))  # By bucket, then time
+        buckets, values = buckets[order], values[order]
+
+        # Position of each sample within its bucket (0 = oldest)
+        starts = np.searchsorted(buckets, np.arange(HOURS_PER_WEEK))
+        ends = np.searchsorted(buckets, np.arange(HOURS_PER_WEEK), side='right')
+        rank = np.arange(len(buckets)) - starts[buckets]
+        per_bucket = ends - starts
+
+        # Keep the newest `capacity` per bucket, laid out as the ring would hold them
+        keep = rank >= per_bucket[buckets] - self.capacity
+        slots = rank[keep] % self.capacity
+        self.samples[buckets[keep], slots] = values[keep]
+        self.counts = per_bucket.astype(np.int64)
+
+        self._refresh(slice(None))
+        return int(keep.sum())
+
+    def save(self, path: Path = DEFAULT_PROFILE_PATH) -> None:
+        """Persist profiles and bucket samples (write-then-rename)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp.npz')
+        np.savez_compressed(
+            tmp_path,
+            metrics=np.array(self.metrics),
+            config=np.array([self.capacity, self.min_samples]),
+            samples=self.samples.astype(np.float32),
+            counts=self.counts,
+            median=self.median,
+            mad=self.mad
+        )
+        os.replace(tmp_path, path)
+
+    def load(self, path: Path = DEFAULT_PROFILE_PATH) -> bool:
+        """Load persisted profiles; False if missing or for a different metric set / capacity"""
+        path = Path(path)
+        if not path.exists():
+            return False
+
+        try:
+            with np.load(path) as state:
+                capacity = int(state['config'][0])
+                if list(state['metrics']) != self.metrics or capacity != self.capacity:
+                    logger.warning("Seasonal profile layout changed, rebuilding from history")
+                    return False
+
+                self.samples = state['samples'].astype(np.float64)
+                self.counts = state['counts'].copy()
+                self.median = state['median'].copy()
+                self.mad = state['mad'].copy()
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to load seasonal profile: {e}")
+            return False
+
+
+def main():
+    """Main entry point"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from metrics_store import MetricsStore
+
+    parser = argparse.ArgumentParser(description='Hour-of-week seasonal baselines')
+    parser.add_argument('command', choices=['rebuild', 'show'], help='Rebuild from the metrics store, or print a profile')
+    parser.add_argument('--weeks', type=int, default=8, help='History to rebuild from')
+    parser.add_argument('--metric', default='cpu_usage', help='Metric to show')
+    parser.add_argument('--path', default=str(DEFAULT_PROFILE_PATH), help='Profile file')
+    parser.add_argument('--samples-per-bucket', type=int, default=48, help='Samples kept per hour-of-week')
+    args = parser.parse_args()
+
+    metrics = ['cpu_usage', 'memory_usage', 'p95_latency', 'error_rate', 'database_query_time']
+    profile = SeasonalProfile(metrics, samples_per_bucket=args.samples_per_bucket)
+
+    if args.command == 'rebuild':
+        store = MetricsStore()
+        df = store.query_frame(start=datetime.utcnow() - timedelta(weeks=args.weeks), columns=metrics)
+        retained = profile.rebuild(df['timestamp'], df[metrics].values)
+        profile.save(Path(args.path))
+        print(f"Rebuilt {int((profile.counts >= profile.min_samples).sum())}/{HOURS_PER_WEEK} buckets "
+              f"from {len(df)} samples ({retained} retained) -> {args.path}")
+        return
+
+    if not profile.load(Path(args.path)):
+        print(f"No profile at {args.path}")
+        return
+
+    i = metrics.index(args.metric)
+    rows = [
+        {'hour_of_week': b, 'samples': int(min(profile.counts[b], profile.capacity)),
+         'median': round(float(profile.median[b, i]), 3), 'mad': round(float(profile.mad[b, i]), 3)}
+        for b in range(HOURS_PER_WEEK)
+    ]
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == '__main__':
+    main()
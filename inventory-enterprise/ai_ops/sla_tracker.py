@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - SLA Tracker
+
+Incremental SLA compliance from prefix counts, shared by Ops Brain and the
+Daily Report.
+
+- A sample is "good" when p95 latency, error rate and CPU are all under
+  their SLA limits
+- Append-only prefix file of (timestamp, cumulative good count), so the
+  SLA of any window is two binary searches and a subtraction, whatever
+  its length (1h, 24h, 7d, 30d, last N samples)
+- Observed per sample by Ops Brain; other readers catch up from the
+  metrics store
+
+Usage:
+    python3 ai_ops/sla_tracker.py --rebuild
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import argparse
+import fcntl
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+try:
+    from ai_ops.metrics_store import MetricsStore, _to_epoch
+except ImportError:
+    from metrics_store import MetricsStore, _to_epoch
+
+logger = logging.getLogger('metrics_store')
+
+DEFAULT_PREFIX_PATH = Path('ai_ops/models/sla_prefix.f64')
+
+# Metric -> limit; a sample meets the SLA when every metric is strictly below its limit
+SLA_CRITERIA = {
+    'p95_latency': 400.0,
+    'error_rate': 5.0,
+    'cpu_usage': 95.0
+}
+
+STANDARD_WINDOWS = {'1h': timedelta(hours=1), '24h': timedelta(hours=24),
+                    '7d': timedelta(days=7), '30d': timedelta(days=30)}
+
+
+class SLATracker:
+    """
+    Prefix counts of SLA-compliant samples.
+
+    Records are little-endian float64 pairs [timestamp, cumulative good]; the
+    sample count of a range is its index span. Samples older than the newest
+    tracked one (late arrivals) are skipped. Appends hold an flock on the file
+    and first adopt records written by other processes (Ops Brain loop,
+    Daily Report cron), so every process sees the same counts.
+    """
+
+    def __init__(self, store: MetricsStore, path: Path = DEFAULT_PREFIX_PATH,
+                 criteria: Optional[Dict[str, float]] = None):
+        self.store = store
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.criteria = dict(criteria or SLA_CRITERIA)
+        self._lock = threading.Lock()
+
+        self.meta_path = self.path.with_suffix('.json')
+        if self.meta_path.exists():
+            with open(self.meta_path, 'r') as f:
+                if json.load(f).get('criteria') != self.criteria:
+                    logger.warning("SLA criteria changed, rebuilding prefix counts from the metrics store")
+                    self.path.unlink(missing_ok=True)
+        tmp_path = self.meta_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'criteria': self.criteria}, f)
+        os.replace(tmp_path, self.meta_path)
+
+        self._load()
+
+    def _load(self) -> None:
+        data = np.fromfile(self.path, dtype='<f8') if self.path.exists() else np.empty(0)
+        n = len(data) // 2  # Ignore a torn trailing record
+        self._ts = np.empty(max(1024, 2 * n))
+        self._good = np.empty(max(1024, 2 * n))
+        self.n = 0
+        self._extend(data[0:2 * n:2], data[1:2 * n:2])
+        if len(data) != 2 * n:
+            with open(self.path, 'r+b') as f:
+                f.truncate(2 * n * 8)
+
+    def _extend(self, timestamps: np.ndarray, cumulative: np.ndarray) -> None:
+        end = self.n + len(timestamps)
+        if end > len(self._ts):
+            capacity = max(2 * len(self._ts), end)
+            self._ts = np.resize(self._ts, capacity)
+            self._good = np.resize(self._good, capacity)
+        self._ts[self.n:end] = timestamps
+        self._good[self.n:end] = cumulative
+        self.n = end
+
+    @contextmanager
+    def _locked(self) -> Iterator:
+        """Exclusive append handle, after adopting records other processes appended"""
+        with open(self.path, 'a+b') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(self.n * 16)
+                tail = np.frombuffer(f.read(), dtype='<f8')
+                whole = len(tail) // 2 * 2
+                if whole:
+                    self._extend(tail[0:whole:2], tail[1:whole:2])
+                yield f
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    # ==================== Updates ====================
+
+    def _is_good(self, values: Dict[str, np.ndarray]) -> np.ndarray:
+        good = None
+        for metric, limit in self.criteria.items():
+            ok = np.asarray(values[metric], dtype=np.float64) < limit  # NaN counts as a miss
+            good = ok if good is None else good & ok
+        return good
+
+    def _append(self, f, timestamps: np.ndarray, good: np.ndarray) -> int:
+        """Append samples newer than the last tracked one; returns how many"""
+        if self.n:
+            newer = timestamps > self._ts[self.n - 1]
+            timestamps, good = timestamps[newer], good[newer]
+        if len(timestamps) == 0:
+            return 0
+
+        base = self._good[self.n - 1] if self.n else 0.0
+        cumulative = base + np.cumsum(good, dtype=np.float64)
+        f.write(np.column_stack([timestamps, cumulative]).astype('<f8').tobytes())
+        f.flush()
+        self._extend(timestamps, cumulative)
+        return len(timestamps)
+
+    def observe(self, sample: Dict) -> None:
+        """Fold one sample ({'timestamp': ..., metric: value, ...}) in, O(1)"""
+        values = {metric: [np.nan if sample.get(metric) is None else sample[metric]] for metric in self.criteria}
+        with self._lock, self._locked() as f:
+            self._append(f, np.array([_to_epoch(sample['timestamp'])]), self._is_good(values))
+
+    def update(self) -> int:
+        """Catch up with samples stored since the newest tracked one"""
+        columns = list(self.criteria)
+        added = 0
+        with self._lock, self._locked() as f:
+            since = self._ts[self.n - 1] if self.n else None
+            for timestamps, values in self.store.iter_chunks(start=since, columns=columns):
+                added += self._append(f, timestamps, self._is_good(dict(zip(columns, values.T))))
+        return added
+
+    def rebuild(self) -> int:
+        """Recompute all prefix counts from the metrics store"""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
+            self._load()
+        return self.update()
+
+    # ==================== Queries ====================
+
+    def _counts(self, first: int, last: int) -> tuple:
+        """(good, total) for records [first, last)"""
+        if last <= first:
+            return 0.0, 0
+        before = self._good[first - 1] if first > 0 else 0.0
+        return self._good[last - 1] - before, last - first
+
+    def window(self, start=None, end=None) -> Dict[str, float]:
+        """Good / total samples and SLA % with start <= timestamp <= end"""
+        with self._lock:
+            ts = self._ts[:self.n]
+            first = int(np.searchsorted(ts, _to_epoch(start), side='left')) if start is not None else 0
+            last = int(np.searchsorted(ts, _to_epoch(end), side='right')) if end is not None else self.n
+            good, total = self._counts(first, last)
+        return {'good': int(good), 'total': int(total), 'sla': float(good / total * 100) if total else None}
+
+    def last(self, n: int) -> Dict[str, float]:
+        """Good / total samples and SLA % over the newest `n` samples"""
+        with self._lock:
+            good, total = self._counts(max(0, self.n - n), self.n)
+        return {'good': int(good), 'total': int(total), 'sla': float(good / total * 100) if total else None}
+
+    def standard_windows(self, now: Optional[datetime] = None) -> Dict[str, Optional[float]]:
+        """SLA % over the last 1h / 24h / 7d / 30d"""
+        now = now or datetime.utcnow()
+        return {name: self.window(start=now - span)['sla'] for name, span in STANDARD_WINDOWS.items()}
+
+
+_trackers: Dict[str, SLATracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_sla_tracker(store: MetricsStore, path: Path = DEFAULT_PREFIX_PATH) -> SLATracker:
+    """Process-wide tracker for a prefix file (created and caught up on first use)"""
+    key = str(Path(path).resolve())
+    with _trackers_lock:
+        if key not in _trackers:
+            tracker = SLATracker(store, path)
+            tracker.update()
+            _trackers[key] = tracker
+        return _trackers[key]
+
+
+def main():
+    """Main entry point"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='SLA compliance from prefix counts')
+    parser.add_argument('--rebuild', action='store_true', help='Recompute from the metrics store')
+    args = parser.parse_args()
+
+    tracker = SLATracker(MetricsStore())
+    added = tracker.rebuild() if args.rebuild else tracker.update()
+    print(json.dumps({'samples': tracker.n, 'added': added, 'sla': tracker.standard_windows()}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
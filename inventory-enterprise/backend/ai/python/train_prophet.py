@@ -6,9 +6,11 @@ Reads training data from stdin, trains model, outputs forecast and metrics to st
 
 import sys
 import json
+import hashlib
 import pandas as pd
 import numpy as np
 from prophet import Prophet
+from prophet.serialize import model_to_json, model_from_json
 from datetime import datetime, timedelta
 import joblib
 import os
@@ -49,6 +51,48 @@ def calculate_metrics(y_true, y_pred):
         'r2': round(float(r2), 4)
     }
 
+def fingerprint_training_data(df, hyperparameters):
+    """Fingerprint training rows (ds, y) plus hyperparameters for refit skipping"""
+    row_hashes = pd.util.hash_pandas_object(df[['ds', 'y']], index=False).values
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update(json.dumps(hyperparameters, sort_keys=True).encode())
+    return digest.hexdigest()
+
+def warm_start_params(model):
+    """Extract Stan init values (k, m, sigma_obs, delta, beta) from a fitted model"""
+    params = {}
+    for name in ['k', 'm', 'sigma_obs']:
+        if model.mcmc_samples == 0:
+            params[name] = float(model.params[name][0][0])
+        else:
+            params[name] = float(np.mean(model.params[name]))
+    for name in ['delta', 'beta']:
+        if model.mcmc_samples == 0:
+            params[name] = model.params[name][0]
+        else:
+            params[name] = np.mean(model.params[name], axis=0)
+    return params
+
+def load_model(model_path):
+    """Load a model saved as Prophet JSON (current) or joblib pickle (legacy)"""
+    if model_path.endswith('.json'):
+        with open(model_path, 'r') as f:
+            return model_from_json(f.read())
+    return joblib.load(model_path)
+
+def load_training_state(state_path):
+    """Load fingerprint/model pointer from the previous training run"""
+    if not os.path.exists(state_path):
+        return None
+    try:
+        with open(state_path, 'r') as f:
+            state = json.load(f)
+        if os.path.exists(state.get('model_path', '')):
+            return state
+    except Exception:
+        pass
+    return None
+
 def train_prophet_model(training_data, config):
     """
     Train Prophet model on consumption data
@@ -100,23 +144,52 @@ def train_prophet_model(training_data, config):
         train_df = df_clean.iloc[:split_idx]
         test_df = df_clean.iloc[split_idx:]
 
-        # Initialize Prophet model
-        model = Prophet(
-            seasonality_mode=seasonality_mode,
-            changepoint_prior_scale=changepoint_prior_scale,
-            seasonality_prior_scale=seasonality_prior_scale,
-            yearly_seasonality=yearly_seasonality,
-            weekly_seasonality=weekly_seasonality,
-            daily_seasonality=daily_seasonality,
-            interval_width=0.95
-        )
+        hyperparameters = {
+            'seasonality_mode': seasonality_mode,
+            'changepoint_prior_scale': changepoint_prior_scale,
+            'seasonality_prior_scale': seasonality_prior_scale,
+            'yearly_seasonality': yearly_seasonality,
+            'weekly_seasonality': weekly_seasonality,
+            'daily_seasonality': daily_seasonality
+        }
+
+        def build_model():
+            model = Prophet(interval_width=0.95, **hyperparameters)
 
-        # Add custom seasonalities if data is sufficient
-        if len(train_df) > 365:
-            model.add_seasonality(name='monthly', period=30.5, fourier_order=5)
+            # Add custom seasonalities if data is sufficient
+            if len(train_df) > 365:
+                model.add_seasonality(name='monthly', period=30.5, fourier_order=5)
 
-        # Fit model
-        model.fit(train_df)
+            return model
+
+        # Skip the refit when this entity's training data is unchanged;
+        # otherwise warm-start Stan from the previous fit's parameters
+        os.makedirs(model_dir, exist_ok=True)
+        state_path = os.path.join(model_dir, f'prophet_{entity_type}_{entity_id}.state.json')
+        fingerprint = fingerprint_training_data(train_df, hyperparameters)
+        previous_state = load_training_state(state_path)
+
+        model = None
+        fit_mode = 'cold_start'
+
+        if previous_state is not None:
+            try:
+                previous_model = load_model(previous_state['model_path'])
+                if previous_state.get('fingerprint') == fingerprint:
+                    model = previous_model
+                    fit_mode = 'skipped'
+                else:
+                    model = build_model()
+                    model.fit(train_df, init=warm_start_params(previous_model))
+                    fit_mode = 'warm_start'
+            except Exception:
+                # Incompatible parameter shapes (e.g. seasonality added) - refit cold
+                model = None
+                fit_mode = 'cold_start'
+
+        if model is None:
+            model = build_model()
+            model.fit(train_df)
 
         # Backtest on test set
         if len(test_df) > 0:
@@ -145,18 +218,30 @@ def train_prophet_model(training_data, config):
                 'yearly_effect': round(float(row.get('yearly', 0)), 4)
             })
 
-        # Save model to disk
-        os.makedirs(model_dir, exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        model_filename = f'prophet_{entity_type}_{entity_id}_{timestamp}.pkl'
-        model_path = os.path.join(model_dir, model_filename)
-        joblib.dump(model, model_path)
+        # Save model to disk (Prophet JSON is far smaller/faster than pickling the model)
+        if fit_mode == 'skipped':
+            model_path = previous_state['model_path']
+        else:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            model_filename = f'prophet_{entity_type}_{entity_id}_{timestamp}.json'
+            model_path = os.path.join(model_dir, model_filename)
+            with open(model_path, 'w') as f:
+                f.write(model_to_json(model))
+
+            with open(state_path, 'w') as f:
+                json.dump({
+                    'fingerprint': fingerprint,
+                    'model_path': model_path,
+                    'fit_mode': fit_mode,
+                    'trained_at': datetime.now().isoformat()
+                }, f, indent=2)
 
         # Return results
         return {
             'success': True,
             'model_path': model_path,
             'model_type': 'prophet',
+            'fit_mode': fit_mode,
             'entity_type': entity_type,
             'entity_id': entity_id,
             'training_data_range': {
@@ -167,14 +252,7 @@ def train_prophet_model(training_data, config):
                 'test_size': len(test_df)
             },
             'accuracy_metrics': metrics,
-            'hyperparameters': {
-                'seasonality_mode': seasonality_mode,
-                'changepoint_prior_scale': changepoint_prior_scale,
-                'seasonality_prior_scale': seasonality_prior_scale,
-                'yearly_seasonality': yearly_seasonality,
-                'weekly_seasonality': weekly_seasonality,
-                'daily_seasonality': daily_seasonality
-            },
+            'hyperparameters': hyperparameters,
             'forecast': forecast_results
         }
 
@@ -199,7 +277,7 @@ def predict_with_model(model_path, start_date, periods):
     """
     try:
         # Load model
-        model = joblib.load(model_path)
+        model = load_model(model_path)
 
         # Create future dataframe
         future_dates = pd.date_range(start=start_date, periods=periods, freq='D')
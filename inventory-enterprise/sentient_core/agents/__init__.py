@@ -4,6 +4,7 @@ Autonomous Agents Module
 Self-healing remediation with verified playbooks.
 """
 
+from .playbook_registry import DryRunCache, PlaybookRegistry, validate_playbook
 from .remediator import Remediator
 
-__all__ = ["Remediator"]
+__all__ = ["Remediator", "PlaybookRegistry", "DryRunCache", "validate_playbook"]
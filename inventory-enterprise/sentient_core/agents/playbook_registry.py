@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Playbook Registry
+
+Preloaded, schema-validated remediation playbooks and cached dry-run checks.
+
+- Every playbook is parsed and validated once at startup; edited files are
+  reloaded on the next lookup (an invalid edit keeps the last good version)
+- Lookups return a private copy, so step mutations never leak into the cache
+- Dry-run check results are cached per check kind: command presence (long
+  TTL), API reachability (short TTL), terraform plan (keyed by a hash of
+  the state and configuration files, with a TTL bound for remote state)
+
+Usage:
+    python3 sentient_core/agents/playbook_registry.py --validate
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+STEP_TYPES = {'command', 'api', 'terraform', 'wait'}
+CONDITIONS = {'less_than', 'greater_than'}
+
+# Files whose contents decide what `terraform plan` reports
+TERRAFORM_INPUTS = ('*.tf', '*.tfvars', 'terraform.tfstate', '.terraform.lock.hcl', '.terraform/terraform.tfstate')
+
+DEFAULT_TTLS = {
+    'command': 3600.0,  # Installed binaries rarely change
+    'api': 60.0,  # Reachability is volatile
+    'terraform': 900.0,  # Upper bound when state lives in a remote backend
+    'failure': 30.0  # Failed checks are retried soon, whatever their kind
+}
+
+
+def _validate_step(step, where: str) -> List[str]:
+    if not isinstance(step, dict):
+        return [f"{where}: step must be a mapping"]
+
+    errors = []
+    if not isinstance(step.get('name'), str):
+        errors.append(f"{where}: missing step name")
+    step_type = step.get('type')
+    if step_type not in STEP_TYPES:
+        errors.append(f"{where}: unknown step type {step_type!r} (expected one of {sorted(STEP_TYPES)})")
+
+    params = step.get('params', {})
+    if not isinstance(params, dict):
+        return errors + [f"{where}: params must be a mapping"]
+    if step_type == 'command' and not str(params.get('command', '')).strip():
+        errors.append(f"{where}: command step needs params.command")
+    if step_type == 'api' and not params.get('url'):
+        errors.append(f"{where}: api step needs params.url")
+    if step_type == 'wait' and not isinstance(params.get('seconds', 10), (int, float)):
+        errors.append(f"{where}: wait step params.seconds must be a number")
+
+    unknown = set(step) - {'name', 'type', 'params', 'verification', 'rollback', 'conditions'}
+    if unknown:
+        errors.append(f"{where}: unknown step keys {sorted(unknown)}")  # PlaybookStep(**step) would fail
+    return errors
+
+
+def validate_playbook(playbook) -> List[str]:
+    """Schema errors for a parsed playbook (empty list = valid)"""
+    if not isinstance(playbook, dict):
+        return ["playbook must be a mapping"]
+
+    errors = []
+    if not isinstance(playbook.get('name'), str):
+        errors.append("missing name")
+
+    steps = playbook.get('steps')
+    if not isinstance(steps, list) or not steps:
+        errors.append("steps must be a non-empty list")
+    else:
+        for i, step in enumerate(steps):
+            errors.extend(_validate_step(step, f"steps[{i}]"))
+
+    for i, step in enumerate(playbook.get('rollback') or []):
+        errors.extend(_validate_step(step, f"rollback[{i}]"))
+
+    resources = playbook.get('resources', [])
+    if not isinstance(resources, list) or not all(isinstance(r, str) for r in resources):
+        errors.append("resources must be a list of names")
+
+    verification = playbook.get('verification') or {}
+    if not isinstance(verification, dict):
+        return errors + ["verification must be a mapping"]
+    for metric, check in (verification.get('metrics_check') or {}).items():
+        if not isinstance(check, dict):
+            errors.append(f"verification.metrics_check.{metric}: must be a mapping")
+            continue
+        if not isinstance(check.get('threshold', 100), (int, float)):
+            errors.append(f"verification.metrics_check.{metric}: threshold must be a number")
+        if check.get('condition', 'less_than') not in CONDITIONS:
+            errors.append(f"verification.metrics_check.{metric}: condition must be one of {sorted(CONDITIONS)}")
+    health_check = verification.get('health_check')
+    if health_check is not None and not (isinstance(health_check, dict) and health_check.get('url')):
+        errors.append("verification.health_check needs a url")
+
+    return errors
+
+
+class PlaybookRegistry:
+    """
+    Validated playbooks by file name, reloaded when their file changes.
+
+    A file is re-read when its (mtime, size) differs from the loaded
+    version, checked on every lookup - one stat() instead of a YAML parse.
+    """
+
+    def __init__(self, playbooks_dir: Path):
+        self.playbooks_dir = Path(playbooks_dir)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Tuple[int, int], Dict]] = {}  # file -> ((mtime_ns, size), playbook)
+        self.errors: Dict[str, Tuple[Tuple[int, int], List[str]]] = {}  # file -> (signature, errors) of a rejected version
+        self.reload_all()
+
+    def _signature(self, path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, filename: str) -> Optional[Dict]:
+        """(Re)load one playbook if its file changed; returns the current valid version"""
+        path = self.playbooks_dir / filename
+        signature = self._signature(path)
+        entry = self._entries.get(filename)
+
+        if signature is None:
+            if entry is not None:
+                logger.warning(f"Playbook removed: {path}")
+                del self._entries[filename]
+            return None
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        if filename in self.errors and self.errors[filename][0] == signature:
+            return entry[1] if entry else None  # Same rejected version, already reported
+
+        try:
+            with open(path, 'r') as f:
+                playbook = yaml.safe_load(f)
+            errors = validate_playbook(playbook)
+        except Exception as e:
+            errors = [f"parse error: {e}"]
+
+        if errors:
+            self.errors[filename] = (signature, errors)
+            kept = " (keeping previous version)" if entry else ""
+            logger.error(f"❌ Invalid playbook {filename}{kept}: {'; '.join(errors)}")
+            return entry[1] if entry else None
+
+        self.errors.pop(filename, None)
+        self._entries[filename] = (signature, playbook)
+        logger.info(f"✓ Loaded playbook {filename}: {playbook['name']}")
+        return playbook
+
+    def reload_all(self) -> int:
+        """Load every *.yaml / *.yml playbook; returns how many are valid"""
+        with self._lock:
+            files = {p.name for p in self.playbooks_dir.glob('*.y*ml')} | set(self._entries)
+            for filename in sorted(files):
+                self._load(filename)
+            return len(self._entries)
+
+    def get(self, filename: str) -> Optional[Dict]:
+        """Private copy of a valid playbook, reloaded first if its file changed"""
+        with self._lock:
+            playbook = self._load(filename)
+        return copy.deepcopy(playbook) if playbook is not None else None
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._entries)
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                'loaded': {name: entry[1]['name'] for name, entry in self._entries.items()},
+                'invalid': {name: errors for name, (_, errors) in self.errors.items()}
+            }
+
+
+def terraform_fingerprint(directory: Path) -> Optional[str]:
+    """SHA-256 over the terraform state and configuration files (None if the directory is missing)"""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return None
+
+    digest = hashlib.sha256()
+    for pattern in TERRAFORM_INPUTS:
+        for path in sorted(directory.glob(pattern)):
+            digest.update(str(path.relative_to(directory)).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class DryRunCache:
+    """TTL cache of dry-run check results, keyed by (kind, target)"""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._lock = threading.Lock()
+        self._results: Dict[Tuple[str, str], Tuple[float, bool]] = {}  # key -> (expires_at, ok)
+        self.hits = 0
+        self.misses = 0
+
+    def check(self, kind: str, target: str, run: Callable[[], bool]) -> bool:
+        """Cached result of `run()`; failures expire after the short failure TTL"""
+        key = (kind, target)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        ok = bool(run())
+        ttl = self.ttls[kind] if ok else min(self.ttls[kind], self.ttls['failure'])
+        with self._lock:
+            self._results[key] = (time.monotonic() + ttl, ok)
+        return ok
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        with self._lock:
+            self._results = {k: v for k, v in self._results.items() if kind is not None and k[0] != kind}
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._results), 'hits': self.hits, 'misses': self.misses}
+
+
+def main():
+    """Main entry point"""
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description='Remediation playbook registry')
+    parser.add_argument('--dir', default='sentient_core/playbooks', help='Playbooks directory')
+    parser.add_argument('--validate', action='store_true', help='Exit non-zero if any playbook is invalid')
+    args = parser.parse_args()
+
+    registry = PlaybookRegistry(Path(args.dir))
+    status = registry.status()
+    print(json.dumps(status, indent=2))
+    if args.validate and status['invalid']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,11 @@ NeuroPilot v17.4 - Autonomous Remediation Agent
 Self-healing agent that executes remediation playbooks autonomously.
 Verifies actions before and after execution, with automatic rollback capability.
 
+v17.7: Verification polls metrics and health checks instead of sleeping a
+fixed time - recovery is declared after N consecutive passing samples and
+a regression past the pre-remediation baseline fails fast. Playbooks can
+run concurrently via submit(), serialized per resource they touch.
+
 Author: NeuroPilot AI Ops Team
 Version: 17.4.0
 """
@@ -13,11 +18,16 @@ import json
 import logging
 import os
 import subprocess
+import sys
+import threading
 import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import requests
 import yaml
@@ -25,6 +35,26 @@ import yaml
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared notification outbox (delivery off the remediation path)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+try:
+    from ai_ops.notification_outbox import get_outbox
+    OUTBOX_AVAILABLE = True
+except ImportError:
+    OUTBOX_AVAILABLE = False
+
+try:
+    from sentient_core.agents.playbook_registry import DryRunCache, PlaybookRegistry, terraform_fingerprint
+except ImportError:
+    from playbook_registry import DryRunCache, PlaybookRegistry, terraform_fingerprint
+
+# Shared Prometheus client (concurrent verification queries)
+try:
+    from ai_ops.prometheus_collector import get_collector
+    COLLECTOR_AVAILABLE = True
+except ImportError:
+    COLLECTOR_AVAILABLE = False
+
 
 @dataclass
 class RemediationResult:
@@ -47,6 +77,7 @@ class PlaybookStep:
     params: Dict
     verification: Optional[Dict] = None
     rollback: Optional[Dict] = None
+    conditions: Optional[Dict] = None  # Preconditions, recorded but not evaluated
 
 
 class Remediator:
@@ -54,8 +85,11 @@ class Remediator:
     Autonomous remediation agent with safety guardrails.
 
     Features:
-    - Dry-run validation before execution
+    - Preloaded, validated playbooks (hot-reloaded on change)
+    - Dry-run validation before execution, cached per check
     - Step-by-step verification
+    - Polled verification with early success and fail-fast on regression
+    - Concurrent playbooks (submit) under per-resource locks
     - Automatic rollback on failure
     - Notifications to Slack, Notion, Grafana
     """
@@ -76,14 +110,32 @@ class Remediator:
         self.railway_api_token = os.getenv("RAILWAY_API_TOKEN", "")
 
         # Safety settings
-        self.dry_run_enabled = self.config.get('dry_run_first', True)
-        self.verification_required = self.config.get('verification_required', True)
-        self.auto_rollback = self.config.get('auto_rollback', True)
+        self.dry_run_enabled = self._setting('dry_run_first', True)
+        self.verification_required = self._setting('verification_required', True)
+        self.auto_rollback = self._setting('auto_rollback', True)
+
+        # Concurrent playbooks; each holds locks on the resources it touches
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._setting('max_concurrent_playbooks', 3),
+            thread_name_prefix='remediation'
+        )
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._stop = threading.Event()  # Interrupts polling waits on shutdown
+
+        # Playbooks parsed once; dry-run checks cached (warmed in the background)
+        self.playbooks = PlaybookRegistry(self.playbooks_dir)
+        self.dry_run_cache = DryRunCache(self._setting('dry_run_cache_ttls', None))
+        if self.dry_run_enabled and self._setting('prewarm_dry_run', True):
+            threading.Thread(target=self.warm_up, name='dry-run-warmup', daemon=True).start()
 
         logger.info("🤖 Remediation Agent initialized")
 
     def _load_config(self) -> Dict:
         """Load remediation configuration"""
+        if isinstance(self.config_path, dict):
+            return self.config_path  # Already-loaded controller config
+
         try:
             if Path(self.config_path).exists():
                 with open(self.config_path, 'r') as f:
@@ -99,6 +151,49 @@ class Remediator:
             'verification_wait_seconds': 30
         }
 
+    def _setting(self, key: str, default):
+        """Setting from remediation.safety (sentient_config.yaml), else top level, else default"""
+        safety = (self.config.get('remediation') or {}).get('safety') or {}
+        return safety.get(key, self.config.get(key, default))
+
+    def submit(
+        self,
+        incident_type: str,
+        severity: str = "high",
+        context: Optional[Dict] = None
+    ) -> Future:
+        """Run remediate() on the worker pool; returns a Future of RemediationResult"""
+        return self._executor.submit(self.remediate, incident_type, severity, context)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Interrupt polling waits and stop the worker pool"""
+        self._stop.set()
+        self._executor.shutdown(wait=wait)
+
+    @contextmanager
+    def _resource_locks(self, playbook: Dict) -> Iterator[bool]:
+        """
+        Hold the locks of every resource the playbook touches (`resources`,
+        default its action). Yields False if they stay busy past the timeout.
+        """
+        resources = sorted(set(playbook.get('resources') or [playbook.get('action', playbook['name'])]))
+        with self._locks_guard:
+            locks = [self._locks.setdefault(name, threading.Lock()) for name in resources]
+
+        deadline = time.monotonic() + self._setting('resource_lock_timeout_seconds', 300)
+        held = []
+        try:
+            for name, lock in zip(resources, locks):  # Sorted order, so no lock-order deadlocks
+                if not lock.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                    logger.warning(f"⏳ Resource '{name}' still busy with another remediation")
+                    yield False
+                    return
+                held.append(lock)
+            yield True
+        finally:
+            for lock in reversed(held):
+                lock.release()
+
     def remediate(
         self,
         incident_type: str,
@@ -157,30 +252,47 @@ class Remediator:
                 )
             logger.info("✓ Dry-run passed")
 
-        # Create snapshot for rollback
-        snapshot_id = self._create_rollback_snapshot()
-
-        # Execute playbook
-        logger.info(f"⚡ Executing playbook: {playbook['name']}")
-        execution_success, execution_details = self._execute_playbook(playbook, context)
-
-        # Wait for system to stabilize
-        logger.info(f"⏳ Waiting {self.config['verification_wait_seconds']}s for stabilization...")
-        time.sleep(self.config['verification_wait_seconds'])
+        with self._resource_locks(playbook) as acquired:
+            if not acquired:
+                return RemediationResult(
+                    success=False,
+                    action_taken="resource_busy",
+                    playbook_used=playbook['name'],
+                    execution_time_seconds=time.time() - start_time,
+                    verification_passed=False,
+                    rollback_executed=False,
+                    details={"error": "Resources locked by another remediation"},
+                    timestamp=datetime.utcnow().isoformat()
+                )
 
-        # Verify remediation
-        verification_passed = False
-        if execution_success and self.verification_required:
-            logger.info("🔍 Verifying remediation...")
-            verification_passed = self._verify_remediation(playbook, context)
-            logger.info(f"Verification: {'✓ PASSED' if verification_passed else '❌ FAILED'}")
+            # Create snapshot for rollback
+            snapshot_id = self._create_rollback_snapshot()
+
+            # Baseline for regression checks while verifying
+            verification = playbook.get('verification') or {}
+            baseline = {}
+            if self.verification_required and verification.get('metrics_check'):
+                baseline = self._sample_metrics(verification['metrics_check'])
+
+            # Execute playbook
+            logger.info(f"⚡ Executing playbook: {playbook['name']}")
+            execution_success, execution_details = self._execute_playbook(playbook, context)
+
+            # Poll until recovered, regressed or out of time
+            verification_passed = False
+            if execution_success and self.verification_required:
+                logger.info("🔍 Verifying remediation...")
+                verification_passed, execution_details['verification'] = self._await_recovery(
+                    playbook, context, baseline
+                )
+                logger.info(f"Verification: {'✓ PASSED' if verification_passed else '❌ FAILED'}")
 
-        # Rollback if verification failed
-        rollback_executed = False
-        if execution_success and not verification_passed and self.auto_rollback:
-            logger.warning("⚠️  Verification failed. Rolling back...")
-            rollback_executed = self._rollback(snapshot_id)
-            logger.info(f"Rollback: {'✓ SUCCESS' if rollback_executed else '❌ FAILED'}")
+            # Rollback if verification failed
+            rollback_executed = False
+            if execution_success and not verification_passed and self.verification_required and self.auto_rollback:
+                logger.warning("⚠️  Verification failed. Rolling back...")
+                rollback_executed = self._rollback(snapshot_id)
+                logger.info(f"Rollback: {'✓ SUCCESS' if rollback_executed else '❌ FAILED'}")
 
         # Calculate result
         success = execution_success and (verification_passed or not self.verification_required)
@@ -225,21 +337,22 @@ class Remediator:
             logger.error(f"No playbook mapping for incident: {incident_type}")
             return None
 
-        playbook_path = self.playbooks_dir / playbook_file
-        if not playbook_path.exists():
-            logger.error(f"Playbook not found: {playbook_path}")
+        playbook = self.playbooks.get(playbook_file)
+        if playbook is None:
+            logger.error(f"Playbook missing or invalid: {self.playbooks_dir / playbook_file}")
             return None
 
-        try:
-            with open(playbook_path, 'r') as f:
-                playbook = yaml.safe_load(f)
-
-            logger.info(f"✓ Selected playbook: {playbook['name']}")
-            return playbook
+        logger.info(f"✓ Selected playbook: {playbook['name']}")
+        return playbook
 
-        except Exception as e:
-            logger.error(f"Playbook load error: {e}")
-            return None
+    def warm_up(self) -> None:
+        """Run every playbook's dry-run checks once so the first remediation hits the cache"""
+        started = time.time()
+        for filename in self.playbooks.names():
+            playbook = self.playbooks.get(filename)
+            if playbook is not None and not self._stop.is_set():
+                self._dry_run_playbook(playbook)
+        logger.info(f"🔥 Dry-run checks warmed in {time.time() - started:.1f}s ({self.dry_run_cache.get_stats()['entries']} cached)")
 
     def _dry_run_playbook(self, playbook: Dict) -> bool:
         """Execute playbook in dry-run mode"""
@@ -252,20 +365,22 @@ class Remediator:
                 if step.type == 'command':
                     # Check command exists
                     cmd = step.params.get('command', '').split()[0]
-                    if not self._command_exists(cmd):
+                    if not self.dry_run_cache.check('command', cmd, lambda: self._command_exists(cmd)):
                         logger.error(f"Command not found: {cmd}")
                         return False
 
                 elif step.type == 'api':
                     # Check API endpoint is reachable
                     url = step.params.get('url', '')
-                    if not self._check_api_reachable(url):
+                    if not self.dry_run_cache.check('api', url, lambda: self._check_api_reachable(url)):
                         logger.error(f"API not reachable: {url}")
                         return False
 
                 elif step.type == 'terraform':
-                    # Check terraform plan
-                    if not self._terraform_plan_check():
+                    # Check terraform plan (re-planned when state or configuration files change)
+                    tf_dir = step.params.get('directory', 'infrastructure/terraform')
+                    key = f"{tf_dir}@{terraform_fingerprint(Path(tf_dir))}"
+                    if not self.dry_run_cache.check('terraform', key, lambda: self._terraform_plan_check(tf_dir)):
                         logger.error("Terraform plan failed")
                         return False
 
@@ -298,8 +413,7 @@ class Remediator:
                 elif step.type == 'terraform':
                     step_success = self._execute_terraform(step)
                 elif step.type == 'wait':
-                    time.sleep(step.params.get('seconds', 10))
-                    step_success = True
+                    step_success = self._wait_step(step, playbook)
 
                 details['step_results'].append({
                     'name': step.name,
@@ -402,77 +516,175 @@ class Remediator:
             logger.error(f"Terraform execution error: {e}")
             return False
 
-    def _verify_remediation(self, playbook: Dict, context: Optional[Dict]) -> bool:
-        """Verify remediation was successful"""
+    def _wait_step(self, step: PlaybookStep, playbook: Dict) -> bool:
+        """
+        Playbook `wait` step: `seconds` is an upper bound - returns as soon as
+        the playbook health check passes `consecutive_passes` times in a row.
+        """
+        seconds = step.params.get('seconds', 10)
+        health_check = (playbook.get('verification') or {}).get('health_check')
+        if not health_check:
+            self._stop.wait(seconds)
+            return not self._stop.is_set()
+
+        interval = self._setting('verification_poll_seconds', 5)
+        required = self._setting('verification_consecutive_passes', 3)
+        deadline = time.monotonic() + seconds
+        passes = 0
+        while not self._stop.is_set():
+            passes = passes + 1 if self._verify_health(health_check) else 0
+            if passes >= required:
+                logger.info(f"    Ready after {seconds - (deadline - time.monotonic()):.1f}s (max {seconds}s)")
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True  # Waited the full time, as before; verification decides
+            self._stop.wait(min(interval, remaining))
+        return False
+
+    def _await_recovery(self, playbook: Dict, context: Optional[Dict], baseline: Dict) -> Tuple[bool, Dict]:
+        """
+        Poll verification until it passes `verification_consecutive_passes`
+        times in a row (success), a metric regresses past its baseline for
+        `regression_samples` polls (fail fast), or `verification_wait_seconds`
+        runs out (failure).
+        """
+        budget = (playbook.get('safety') or {}).get(
+            'verification_wait_seconds', self._setting('verification_wait_seconds', 30)
+        )
+        interval = self._setting('verification_poll_seconds', 5)
+        required = self._setting('verification_consecutive_passes', 3)
+        regression_limit = self._setting('regression_samples', 2)
+
+        started = time.monotonic()
+        polls = passes = regressions = 0
+        outcome = 'timeout'
+        while not self._stop.is_set():
+            polls += 1
+            passed, regressed = self._verify_remediation(playbook, context, baseline)
+            passes = passes + 1 if passed else 0
+            regressions = regressions + 1 if regressed else 0
+
+            if passes >= required:
+                outcome = 'recovered'
+                break
+            if regressions >= regression_limit:
+                outcome = 'regressed'
+                logger.error(f"📉 Metrics regressed past baseline {regressions} polls in a row - failing fast")
+                break
+            remaining = budget - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            self._stop.wait(min(interval, remaining))
+        else:
+            outcome = 'interrupted'
+
+        elapsed = time.monotonic() - started
+        logger.info(f"    Verification {outcome} after {polls} polls ({elapsed:.1f}s, budget {budget}s)")
+        return outcome == 'recovered', {
+            'outcome': outcome,
+            'polls': polls,
+            'seconds': round(elapsed, 2),
+            'budget_seconds': budget
+        }
+
+    def _verify_remediation(self, playbook: Dict, context: Optional[Dict], baseline: Optional[Dict] = None) -> Tuple[bool, bool]:
+        """One verification poll; returns (passed, regressed past baseline)"""
         verification = playbook.get('verification', {})
         if not verification:
-            return True  # No verification steps defined
+            return True, False  # No verification steps defined
 
         try:
             # Check metrics improved
             metrics_check = verification.get('metrics_check', {})
+            regressed = False
             if metrics_check:
-                if not self._verify_metrics(metrics_check):
-                    return False
+                values = self._sample_metrics(metrics_check)
+                regressed = self._metrics_regressed(metrics_check, values, baseline or {})
+                if not self._verify_metrics(metrics_check, values):
+                    return False, regressed
 
             # Check health endpoints
             health_check = verification.get('health_check', {})
             if health_check:
                 if not self._verify_health(health_check):
-                    return False
+                    return False, regressed
 
             # Custom verification script
             script = verification.get('script')
             if script:
                 result = subprocess.run(script, shell=True, capture_output=True)
                 if result.returncode != 0:
-                    return False
+                    return False, regressed
 
-            return True
+            return True, regressed
 
         except Exception as e:
             logger.error(f"Verification error: {e}")
-            return False
+            return False, False
 
-    def _verify_metrics(self, metrics_check: Dict) -> bool:
-        """Verify metrics are within acceptable range"""
-        try:
-            prometheus_url = os.getenv("PROMETHEUS_URL", "http://localhost:9090")
+    def _sample_metrics(self, metrics_check: Dict) -> Dict[str, Optional[float]]:
+        """Current value of every checked metric (None when the query fails or is empty)"""
+        prometheus_url = os.getenv("PROMETHEUS_URL", "http://localhost:9090")
+        queries = {name: expected.get('query', f'avg({name})') for name, expected in metrics_check.items()}
 
-            for metric_name, expected in metrics_check.items():
-                query = expected.get('query', f'avg({metric_name})')
-                threshold = expected.get('threshold', 100)
-                condition = expected.get('condition', 'less_than')
+        if COLLECTOR_AVAILABLE:
+            return get_collector(prometheus_url).query_many(queries, max_age=0)
 
+        values = {}
+        for metric_name, query in queries.items():
+            try:
                 response = requests.get(
                     f"{prometheus_url}/api/v1/query",
                     params={'query': query},
                     timeout=10
                 )
+                result = response.json() if response.status_code == 200 else {}
+                if result.get('status') != 'success' or not result['data']['result']:
+                    values[metric_name] = None
+                else:
+                    values[metric_name] = float(result['data']['result'][0]['value'][1])
+            except Exception as e:
+                logger.error(f"Failed to query metric {metric_name}: {e}")
+                values[metric_name] = None
+        return values
 
-                if response.status_code != 200:
-                    logger.error(f"Failed to query metric: {metric_name}")
-                    return False
-
-                result = response.json()
-                if result['status'] != 'success' or not result['data']['result']:
-                    logger.error(f"No data for metric: {metric_name}")
-                    return False
-
-                value = float(result['data']['result'][0]['value'][1])
+    def _verify_metrics(self, metrics_check: Dict, values: Dict[str, Optional[float]]) -> bool:
+        """Verify metrics are within acceptable range"""
+        for metric_name, expected in metrics_check.items():
+            threshold = expected.get('threshold', 100)
+            condition = expected.get('condition', 'less_than')
+            value = values.get(metric_name)
 
-                if condition == 'less_than' and value >= threshold:
-                    logger.error(f"Metric {metric_name} = {value} (expected < {threshold})")
-                    return False
-                elif condition == 'greater_than' and value <= threshold:
-                    logger.error(f"Metric {metric_name} = {value} (expected > {threshold})")
-                    return False
+            if value is None:
+                logger.error(f"No data for metric: {metric_name}")
+                return False
 
-            return True
+            if condition == 'less_than' and value >= threshold:
+                logger.info(f"    Metric {metric_name} = {value} (expected < {threshold})")
+                return False
+            elif condition == 'greater_than' and value <= threshold:
+                logger.info(f"    Metric {metric_name} = {value} (expected > {threshold})")
+                return False
 
-        except Exception as e:
-            logger.error(f"Metrics verification error: {e}")
-            return False
+        return True
+
+    def _metrics_regressed(self, metrics_check: Dict, values: Dict, baseline: Dict) -> bool:
+        """True if any failing metric is `regression_tolerance` worse than its pre-remediation value"""
+        tolerance = self._setting('regression_tolerance', 0.2)
+        for metric_name, expected in metrics_check.items():
+            before, now = baseline.get(metric_name), values.get(metric_name)
+            if before is None or now is None:
+                continue
+            threshold = expected.get('threshold', 100)
+            if expected.get('condition', 'less_than') == 'less_than':
+                if now >= threshold and now > before + abs(before) * tolerance:
+                    logger.warning(f"    Metric {metric_name} regressed: {before} -> {now}")
+                    return True
+            elif now <= threshold and now < before - abs(before) * tolerance:
+                logger.warning(f"    Metric {metric_name} regressed: {before} -> {now}")
+                return True
+        return False
 
     def _verify_health(self, health_check: Dict) -> bool:
         """Verify health endpoints are responding"""
@@ -495,7 +707,7 @@ class Remediator:
 
     def _create_rollback_snapshot(self) -> str:
         """Create snapshot for rollback"""
-        snapshot_id = f"snapshot_{int(time.time())}"
+        snapshot_id = f"snapshot_{int(time.time())}_{uuid.uuid4().hex[:6]}"  # Unique across concurrent runs
 
         try:
             # Save current Terraform state
@@ -612,10 +824,17 @@ class Remediator:
         self._log_to_notion(result, incident_type)
 
     def _send_slack(self, message: str) -> None:
-        """Send Slack notification"""
+        """Send Slack notification (queued; bursts are merged into one post)"""
         if not self.slack_webhook:
             return
 
+        if OUTBOX_AVAILABLE:
+            try:
+                get_outbox().enqueue('slack', self.slack_webhook, {'text': message})
+            except Exception as e:
+                logger.debug(f"Slack notification error: {e}")
+            return
+
         try:
             requests.post(
                 self.slack_webhook,
@@ -626,18 +845,27 @@ class Remediator:
             logger.debug(f"Slack notification error: {e}")
 
     def _create_grafana_annotation(self, text: str) -> None:
-        """Create Grafana annotation"""
+        """Create Grafana annotation (queued when the outbox is available)"""
         if not self.grafana_url:
             return
 
+        annotation = {
+            'text': text,
+            'tags': ['remediation', 'autonomous'],
+            'time': int(time.time() * 1000)  # Event time, not delivery time
+        }
+
+        if OUTBOX_AVAILABLE:
+            try:
+                get_outbox().enqueue('grafana', f"{self.grafana_url}/api/annotations", annotation)
+            except Exception as e:
+                logger.debug(f"Grafana annotation error: {e}")
+            return
+
         try:
             requests.post(
                 f"{self.grafana_url}/api/annotations",
-                json={
-                    'text': text,
-                    'tags': ['remediation', 'autonomous'],
-                    'time': int(time.time() * 1000)
-                },
+                json=annotation,
                 timeout=10
             )
         except Exception as e:
@@ -665,11 +893,11 @@ class Remediator:
         except:
             return False
 
-    def _terraform_plan_check(self) -> bool:
+    def _terraform_plan_check(self, tf_dir: str = "infrastructure/terraform") -> bool:
         """Check if terraform plan succeeds"""
         try:
             result = subprocess.run(
-                "cd infrastructure/terraform && terraform plan -detailed-exitcode",
+                f"cd {tf_dir} && terraform plan -detailed-exitcode",
                 shell=True,
                 capture_output=True,
                 timeout=120
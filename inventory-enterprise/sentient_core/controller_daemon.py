@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Sentient Controller Daemon
+
+Long-running mode for the MasterController.
+
+- Components (Ops Brain, Forecast Engine, Remediator) stay resident between cycles
+- Internal scheduler with jitter; a cycle never overlaps another one, in-process
+  or from a cron-launched controller (shared lock file)
+- Hot-reloads models when their files change on disk between cycles
+- Local HTTP status endpoint (TCP on 127.0.0.1 or a Unix socket)
+
+Usage:
+    python3 sentient_core/master_controller.py --daemon --status-port 8787
+    curl -s localhost:8787/status | jq .
+    curl -s -X POST localhost:8787/trigger
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import fcntl
+import json
+import logging
+import os
+import random
+import signal
+import socketserver
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger('sentient_daemon')
+
+CYCLE_LOCK_PATH = 'sentient_core/models/controller.lock'
+
+
+def acquire_cycle_lock(lock_path: str = CYCLE_LOCK_PATH):
+    """
+    Take the cross-process cycle lock without blocking.
+
+    Returns the open lock file (keep it open for the cycle's duration, close
+    to release), or None if another controller is mid-cycle.
+    """
+    path = Path(lock_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 'a+' does not truncate: a losing contender must not erase the holder's pid
+    lock_file = open(path, 'a+')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    return lock_file
+
+
+class ModelWatcher:
+    """
+    Detects model files changed on disk since the last snapshot.
+
+    Snapshots are taken after each cycle, so files the cycle writes itself
+    are absorbed; only changes made between cycles (e.g. by a training job)
+    trigger a reload.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        # component -> glob patterns (relative to the working directory)
+        self.patterns = patterns
+        self._mtimes: Dict[str, Dict[str, float]] = {}
+        self.snapshot()
+
+    def _scan(self, component: str) -> Dict[str, float]:
+        mtimes = {}
+        for pattern in self.patterns[component]:
+            for path in Path('.').glob(pattern):
+                try:
+                    mtimes[str(path)] = path.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+        return mtimes
+
+    def snapshot(self) -> None:
+        """Record current mtimes as the baseline"""
+        self._mtimes = {component: self._scan(component) for component in self.patterns}
+
+    def changed(self) -> Dict[str, List[str]]:
+        """Components whose files changed since the snapshot, with the changed paths"""
+        changes = {}
+        for component in self.patterns:
+            current = self._scan(component)
+            previous = self._mtimes.get(component, {})
+            paths = sorted(path for path in set(current) | set(previous) if current.get(path) != previous.get(path))
+            if paths:
+                changes[component] = paths
+        return changes
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """HTTP over a Unix domain socket"""
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ('unix', 0)
+
+
+class SentientDaemon:
+    """
+    Scheduler + status server around a resident MasterController.
+    """
+
+    MODEL_FILES = {
+        'forecast_engine': [
+            'sentient_core/models/lstm_model.npz',
+            'sentient_core/models/lstm_model.h5',
+            'sentient_core/models/gbdt_model.pkl',
+            'sentient_core/models/prophet_*.meta.json'
+        ],
+        'ops_brain': [
+            'ai_ops/models/anomaly_model.pkl',
+            'ai_ops/models/scaler.pkl',
+            'ai_ops/models/anomaly_thresholds.json'
+        ]
+    }
+
+    def __init__(
+        self,
+        controller,
+        interval_seconds: float,
+        jitter_seconds: float = 0.0,
+        status_port: Optional[int] = None,
+        status_socket: Optional[str] = None,
+        lock_path: str = CYCLE_LOCK_PATH
+    ):
+        self.controller = controller
+        self.interval_seconds = float(interval_seconds)
+        self.jitter_seconds = float(jitter_seconds)
+        self.status_port = status_port
+        self.status_socket = status_socket
+        self.lock_path = lock_path
+
+        self._stop = threading.Event()
+        self._trigger = threading.Event()
+        self._cycle_lock = threading.Lock()
+        self._server = None
+
+        self.watcher = ModelWatcher(self.MODEL_FILES)
+
+        # Status
+        self.started_at = datetime.utcnow().isoformat()
+        self.status = {
+            'state': 'starting',
+            'cycles': 0,
+            'failed_cycles': 0,
+            'skipped_overlaps': 0,
+            'missed_slots': 0,
+            'reloads': {},
+            'warmup_ms': None,
+            'last_cycle': None,
+            'next_cycle_at': None
+        }
+        self.cycle_durations_ms = deque(maxlen=200)
+
+    # ==================== Lifecycle ====================
+
+    def warm_up(self) -> None:
+        """Construct components up front so cycle latency excludes startup"""
+        start = time.perf_counter()
+
+        from ai_ops.ops_brain import OpsBrain
+        from sentient_core.predictive.forecast_engine import ForecastEngine
+        from sentient_core.agents.remediator import Remediator
+
+        if self.controller.ops_brain is None:
+            self.controller.ops_brain = OpsBrain()
+        if self.controller.forecast_engine is None:
+            self.controller.forecast_engine = ForecastEngine()
+        if self.controller.remediator is None:
+            self.controller.remediator = Remediator(self.controller.config)
+
+        self.watcher.snapshot()
+        self.status['warmup_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        logger.info(f"🔥 Components resident (warm-up {self.status['warmup_ms']:.0f}ms)")
+
+    def run(self) -> None:
+        """Run until SIGTERM/SIGINT"""
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: self.stop())
+
+        self.warm_up()
+        self._start_status_server()
+
+        logger.info(f"🛰️  Sentient daemon running (interval {self.interval_seconds:.0f}s, jitter ≤{self.jitter_seconds:.0f}s)")
+        self.status['state'] = 'idle'
+
+        next_slot = time.time()
+        while not self._stop.is_set():
+            run_at = next_slot + random.uniform(0, self.jitter_seconds)
+            self.status['next_cycle_at'] = datetime.utcfromtimestamp(run_at).isoformat()
+
+            # Sleep until the slot, a manual trigger, or shutdown
+            while not self._stop.is_set() and time.time() < run_at:
+                if self._trigger.wait(timeout=min(1.0, max(0.0, run_at - time.time()))):
+                    break
+
+            if self._stop.is_set():
+                break
+
+            triggered = self._trigger.is_set()
+            self._trigger.clear()
+            self.run_cycle(reason='trigger' if triggered else 'schedule')
+
+            if not triggered:
+                # Skip slots that elapsed while the cycle ran (no catch-up burst)
+                next_slot += self.interval_seconds
+                if next_slot < time.time():
+                    missed = int((time.time() - next_slot) // self.interval_seconds) + 1
+                    self.status['missed_slots'] += missed
+                    next_slot += missed * self.interval_seconds
+
+        self.status['state'] = 'stopped'
+        self._stop_status_server()
+        if self.controller.forecast_engine is not None:
+            self.controller.forecast_engine.shutdown()
+        logger.info("🛑 Sentient daemon stopped")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ==================== Cycles ====================
+
+    def run_cycle(self, reason: str = 'schedule') -> Optional[Dict]:
+        """Run one sentient cycle unless another one is running (here or in another process)"""
+        if not self._cycle_lock.acquire(blocking=False):
+            self.status['skipped_overlaps'] += 1
+            logger.warning("⏭️  Cycle already running, skipping")
+            return None
+
+        try:
+            lock_file = acquire_cycle_lock(self.lock_path)
+            if lock_file is None:
+                self.status['skipped_overlaps'] += 1
+                logger.warning("⏭️  Another controller holds the cycle lock, skipping")
+                return None
+
+            with lock_file:
+                self._reload_changed_models()
+
+                self.status['state'] = 'running'
+                started = datetime.utcnow()
+                start = time.perf_counter()
+
+                summary = self.controller.run_sentient_cycle()
+
+                duration_ms = (time.perf_counter() - start) * 1000
+                self.cycle_durations_ms.append(duration_ms)
+
+                # Files written by the cycle itself don't count as external changes
+                self.watcher.snapshot()
+
+                failed = bool(summary.get('error'))
+                self.status['cycles'] += 1
+                self.status['failed_cycles'] += int(failed)
+                self.status['last_cycle'] = {
+                    'started_at': started.isoformat(),
+                    'duration_ms': round(duration_ms, 1),
+                    'reason': reason,
+                    'success': not failed,
+                    'error': summary.get('error')
+                }
+                return summary
+
+        finally:
+            self.status['state'] = 'idle'
+            self._cycle_lock.release()
+
+    def _reload_changed_models(self) -> None:
+        """Reload resident components whose model files changed since the last cycle"""
+        changes = self.watcher.changed()
+        if not changes:
+            return
+
+        reloaders: Dict[str, Callable[[], None]] = {
+            'forecast_engine': self._reload_forecast_engine,
+            'ops_brain': self._reload_ops_brain
+        }
+
+        for component, paths in changes.items():
+            try:
+                reloaders[component]()
+                self.status['reloads'][component] = self.status['reloads'].get(component, 0) + 1
+                logger.info(f"♻️  Reloaded {component} ({', '.join(paths)})")
+            except Exception as e:
+                logger.error(f"Hot reload failed for {component}: {e}")
+
+        self.watcher.snapshot()
+
+    def _reload_forecast_engine(self) -> None:
+        if self.controller.forecast_engine is not None:
+            self.controller.forecast_engine.reload_models()
+
+    def _reload_ops_brain(self) -> None:
+        brain = self.controller.ops_brain
+        if brain is not None:
+            brain.anomaly_model = brain._load_or_init_model()
+            brain.scaler = brain._load_or_init_scaler()
+            # The joint-likelihood scorer holds its own mixture, scaler and thresholds
+            brain.multivariate = brain._init_multivariate_scorer()
+
+    # ==================== Status endpoint ====================
+
+    def get_status(self) -> Dict:
+        """Status snapshot (served as JSON)"""
+        durations = np.array(self.cycle_durations_ms) if self.cycle_durations_ms else None
+        engine = self.controller.forecast_engine
+
+        return {
+            **self.status,
+            'pid': os.getpid(),
+            'started_at': self.started_at,
+            'interval_seconds': self.interval_seconds,
+            'jitter_seconds': self.jitter_seconds,
+            'cycle_ms': {
+                'count': len(self.cycle_durations_ms),
+                'p50': round(float(np.percentile(durations, 50)), 1),
+                'p95': round(float(np.percentile(durations, 95)), 1),
+                'max': round(float(durations.max()), 1)
+            } if durations is not None else None,
+            'forecast_branches': getattr(engine, 'last_execution', None),
+            'controller': {
+                'cycle_count': self.controller.state.get('cycle_count'),
+                'last_cycle': self.controller.state.get('last_cycle')
+            }
+        }
+
+    def _start_status_server(self) -> None:
+        if self.status_port is None and self.status_socket is None:
+            return
+
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status: int, body: Dict) -> None:
+                payload = json.dumps(body, default=str).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path in ('/', '/status'):
+                    self._send(200, daemon.get_status())
+                elif self.path == '/healthz':
+                    self._send(200, {'ok': daemon.status['state'] != 'stopped'})
+                else:
+                    self._send(404, {'error': 'not found'})
+
+            def do_POST(self):
+                if self.path != '/trigger':
+                    self._send(404, {'error': 'not found'})
+                elif daemon.status['state'] == 'running':
+                    self._send(409, {'error': 'cycle already running'})
+                else:
+                    daemon._trigger.set()
+                    self._send(202, {'triggered': True})
+
+            def log_message(self, format, *args):
+                pass
+
+        if self.status_socket:
+            socket_path = Path(self.status_socket)
+            if socket_path.exists():
+                socket_path.unlink()
+            self._server = _UnixHTTPServer(str(socket_path), Handler)
+            where = f"unix:{socket_path}"
+        else:
+            self._server = ThreadingHTTPServer(('127.0.0.1', self.status_port), Handler)
+            self._server.daemon_threads = True
+            where = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+        threading.Thread(target=self._server.serve_forever, daemon=True, name='status-server').start()
+        logger.info(f"📡 Status endpoint on {where}")
+
+    def _stop_status_server(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if self.status_socket:
+                try:
+                    os.unlink(self.status_socket)
+                except FileNotFoundError:
+                    pass
+            self._server = None
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Sentient Event Store
+
+Append-only, indexed history of predictions and remediations for the
+Master Controller.
+
+- SQLite in WAL mode: each event is one INSERT, so per-cycle I/O is constant
+- Indexed by timestamp and incident / action type
+- Windowed success rates answered by query instead of list scans
+- Unbounded retention by default; compaction rolls old rows into daily
+  aggregates and reclaims space
+- One-time import of the legacy predictions/remediations JSON files
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger('sentient_event_store')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    incident_type TEXT NOT NULL,
+    probability REAL,
+    time_to_event_hours REAL,
+    model_source TEXT,
+    validated INTEGER,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_ts ON predictions (ts);
+CREATE INDEX IF NOT EXISTS idx_predictions_type_ts ON predictions (incident_type, ts);
+
+CREATE TABLE IF NOT EXISTS remediations (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    action_type TEXT NOT NULL,
+    playbook TEXT,
+    success INTEGER NOT NULL,
+    verification_passed INTEGER,
+    duration_seconds REAL,
+    confidence REAL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_remediations_ts ON remediations (ts);
+CREATE INDEX IF NOT EXISTS idx_remediations_action_ts ON remediations (action_type, ts);
+
+-- Daily rollups of compacted rows
+CREATE TABLE IF NOT EXISTS predictions_daily (
+    day TEXT NOT NULL,
+    incident_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    validated INTEGER NOT NULL,
+    probability_sum REAL NOT NULL,
+    PRIMARY KEY (day, incident_type)
+);
+CREATE TABLE IF NOT EXISTS remediations_daily (
+    day TEXT NOT NULL,
+    action_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    duration_sum REAL NOT NULL,
+    PRIMARY KEY (day, action_type)
+);
+"""
+
+
+def _to_epoch(timestamp) -> float:
+    """ISO string / datetime (naive = UTC) -> unix seconds"""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    return time.time()
+
+
+class EventStore:
+    """
+    SQLite event store for predictions and remediations.
+
+    Events are immutable once written, except a prediction's `validated`
+    flag, which is set when its outcome is known.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ==================== Appends ====================
+
+    def append_predictions(self, predictions: Iterable[Dict]) -> int:
+        """Append prediction events (one transaction); returns rows written"""
+        rows = [
+            (
+                _to_epoch(p.get('timestamp')),
+                p.get('incident_type', 'unknown'),
+                p.get('probability'),
+                p.get('time_to_event_hours'),
+                p.get('model_source'),
+                None if p.get('validated') is None else int(bool(p['validated'])),
+                json.dumps(p, default=str)
+            )
+            for p in predictions
+        ]
+        if not rows:
+            return 0
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO predictions (ts, incident_type, probability, time_to_event_hours, "
+                    "model_source, validated, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+        return len(rows)
+
+    def append_remediation(self, remediation: Dict) -> None:
+        """Append one remediation event"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO remediations (ts, action_type, playbook, success, verification_passed, "
+                "duration_seconds, confidence, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    _to_epoch(remediation.get('timestamp')),
+                    remediation.get('action_type', 'unknown'),
+                    remediation.get('playbook'),
+                    int(bool(remediation.get('success', False))),
+                    int(bool(remediation.get('verification_passed', False))),
+                    remediation.get('duration_seconds'),
+                    remediation.get('confidence'),
+                    json.dumps(remediation, default=str)
+                )
+            )
+
+    def mark_prediction(self, prediction_id: int, validated: bool) -> None:
+        """Record whether a prediction turned out correct"""
+        with self._lock:
+            self._conn.execute("UPDATE predictions SET validated = ? WHERE id = ?", (int(validated), prediction_id))
+
+    # ==================== Queries ====================
+
+    def count(self, table: str) -> int:
+        """Raw events held in 'predictions' or 'remediations'"""
+        if table not in ('predictions', 'remediations'):
+            raise ValueError(f"Unknown event table: {table}")
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def prediction_success_rate(
+        self,
+        window_hours: float = 24,
+        incident_type: Optional[str] = None,
+        last_n: Optional[int] = None
+    ) -> Optional[float]:
+        """
+        Share of predictions in the window that were validated (unvalidated count as correct).
+
+        Args:
+            window_hours: Look back this far
+            incident_type: Restrict to one incident type
+            last_n: Only consider the most recent N predictions
+
+        Returns:
+            Rate in [0, 1], or None if no predictions fall in the window
+        """
+        cutoff = time.time() - window_hours * 3600
+        where, params = "ts >= ?", [cutoff]
+        if incident_type:
+            where += " AND incident_type = ?"
+            params.append(incident_type)
+
+        source = "predictions"
+        if last_n:
+            source = f"(SELECT ts, incident_type, validated FROM predictions ORDER BY id DESC LIMIT {int(last_n)})"
+
+        with self._lock:
+            total, ok = self._conn.execute(
+                f"SELECT COUNT(*), SUM(COALESCE(validated, 1)) FROM {source} WHERE {where}", params
+            ).fetchone()
+
+        return ok / total if total else None
+
+    def remediation_success_rate(
+        self,
+        last_n: Optional[int] = None,
+        window_hours: Optional[float] = None,
+        action_type: Optional[str] = None
+    ) -> Optional[float]:
+        """Share of successful remediations among the last N and/or within a window"""
+        clauses, params = [], []
+        if window_hours is not None:
+            clauses.append("ts >= ?")
+            params.append(time.time() - window_hours * 3600)
+        if action_type:
+            clauses.append("action_type = ?")
+            params.append(action_type)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        limit = f"LIMIT {int(last_n)}" if last_n else ""
+
+        with self._lock:
+            total, successes = self._conn.execute(
+                f"SELECT COUNT(*), SUM(success) FROM "
+                f"(SELECT success FROM remediations {where} ORDER BY id DESC {limit})",
+                params
+            ).fetchone()
+
+        return successes / total if total else None
+
+    def recent(self, table: str, limit: int = 100) -> List[Dict]:
+        """Most recent events (payloads), newest last"""
+        if table not in ('predictions', 'remediations'):
+            raise ValueError(f"Unknown event table: {table}")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT payload FROM {table} ORDER BY id DESC LIMIT ?", (int(limit),)
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in reversed(rows)]
+
+    # ==================== Maintenance ====================
+
+    def compact(self, raw_retention_days: Optional[int] = None) -> Dict[str, int]:
+        """
+        Roll raw events older than `raw_retention_days` into daily aggregates,
+        delete them, and checkpoint / vacuum the database.
+
+        With raw_retention_days=None nothing is deleted; only the WAL is
+        checkpointed and query statistics refreshed.
+        """
+        result = {'predictions_compacted': 0, 'remediations_compacted': 0}
+
+        with self._lock:
+            if raw_retention_days is not None:
+                cutoff = time.time() - raw_retention_days * 86400
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    self._conn.execute("""
+                        INSERT INTO predictions_daily (day, incident_type, count, validated, probability_sum)
+                        SELECT date(ts, 'unixepoch'), incident_type, COUNT(*),
+                               SUM(COALESCE(validated, 1)), SUM(COALESCE(probability, 0))
+                        FROM predictions WHERE ts < ? GROUP BY 1, 2
+                        ON CONFLICT (day, incident_type) DO UPDATE SET
+                            count = count + excluded.count,
+                            validated = validated + excluded.validated,
+                            probability_sum = probability_sum + excluded.probability_sum
+                    """, (cutoff,))
+                    result['predictions_compacted'] = self._conn.execute(
+                        "DELETE FROM predictions WHERE ts < ?", (cutoff,)
+                    ).rowcount
+
+                    self._conn.execute("""
+                        INSERT INTO remediations_daily (day, action_type, count, successes, duration_sum)
+                        SELECT date(ts, 'unixepoch'), action_type, COUNT(*), SUM(success),
+                               SUM(COALESCE(duration_seconds, 0))
+                        FROM remediations WHERE ts < ? GROUP BY 1, 2
+                        ON CONFLICT (day, action_type) DO UPDATE SET
+                            count = count + excluded.count,
+                            successes = successes + excluded.successes,
+                            duration_sum = duration_sum + excluded.duration_sum
+                    """, (cutoff,))
+                    result['remediations_compacted'] = self._conn.execute(
+                        "DELETE FROM remediations WHERE ts < ?", (cutoff,)
+                    ).rowcount
+
+                if result['predictions_compacted'] or result['remediations_compacted']:
+                    self._conn.execute("VACUUM")
+
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("ANALYZE")
+
+        logger.info(f"🗜️  Event store compacted: {result}")
+        return result
+
+    def import_legacy_json(self, predictions_path: Path, remediations_path: Path) -> Dict[str, int]:
+        """
+        One-time import of the pre-v17.7 history files into empty tables.
+        Imported files are renamed to *.migrated.
+        """
+        imported = {'predictions': 0, 'remediations': 0}
+
+        for table, path in (('predictions', Path(predictions_path)), ('remediations', Path(remediations_path))):
+            if not path.exists() or self.count(table):
+                continue
+
+            try:
+                with open(path, 'r') as f:
+                    events = json.load(f)
+
+                if table == 'predictions':
+                    imported[table] = self.append_predictions(events)
+                else:
+                    for event in events:
+                        self.append_remediation(event)
+                    imported[table] = len(events)
+
+                path.rename(path.with_suffix(path.suffix + '.migrated'))
+                logger.info(f"✓ Imported {imported[table]} {table} from {path}")
+
+            except Exception as e:
+                logger.warning(f"Failed to import {path}: {e}")
+
+        return imported
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Audit Ledger
+
+Hash-chained, group-committed, indexed audit trail for Memory Core.
+
+- Daily JSONL segments (ledger_YYYYMMDD.jsonl), one JSON object per line.
+  Each entry carries `prev` (first key) and `hash` (last key) =
+  SHA-256 of the line without its hash, chaining entries across segments
+- The writer keeps the current segment open and group-commits: fsync
+  every `fsync_batch` entries or `fsync_interval` seconds
+- Any number of writers (threads or processes) may share a ledger: each
+  append holds an flock on the ledger directory and first adopts entries
+  other writers appended, so the chain never forks. One writer per
+  directory per process via get_ledger_writer()
+- Sparse offset index per segment (ledger_YYYYMMDD.idx: seq, epoch,
+  byte offset every `index_every` entries) for time-range and sequence
+  lookups without reading whole segments
+- Verifier checks segments in parallel processes, then the links between
+  them; entries only need byte slicing and one SHA-256 each
+- Pre-v17.7 lines (no hash) are reported as legacy, not as failures
+
+Usage:
+    python3 sentient_core/genesis/audit_ledger.py verify --workers 8
+    python3 sentient_core/genesis/audit_ledger.py range --start 2025-10-01 --end 2025-10-02
+
+Author: NeuroPilot Genesis Team
+Version: 17.7.0
+"""
+
+import argparse
+import atexit
+import bisect
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+GENESIS_HASH = '0' * 64
+
+_PREFIX = b'{"prev":"'
+_HASH_KEY = b',"hash":"'
+_SUFFIX_LEN = len(_HASH_KEY) + 64 + len(b'"}')  # ,"hash":"<64 hex>"}
+
+INDEX_DTYPE = np.dtype([('seq', '<i8'), ('ts', '<f8'), ('offset', '<i8')])
+
+
+def _to_epoch(timestamp: str) -> float:
+    """ISO string (naive = UTC) -> unix seconds"""
+    parsed = datetime.fromisoformat(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _seal(entry: Dict) -> Tuple[bytes, str]:
+    """Serialized line (with trailing newline) and hash for an entry whose first key is `prev`"""
+    body = json.dumps(entry, separators=(',', ':'), default=str)  # ASCII-only, no raw newlines
+    digest = hashlib.sha256(body.encode()).hexdigest()
+    return f'{body[:-1]},"hash":"{digest}"}}\n'.encode(), digest
+
+
+def _last_line(path: Path, block: int = 65536) -> Tuple[Optional[bytes], int]:
+    """Last complete line of a file and the offset just past it (bytes after it are a torn tail)"""
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        buffer = b''
+        line_end = None  # Offset of the last newline, relative to `position`
+        while position > 0:
+            start = max(0, position - block)
+            f.seek(start)
+            buffer = f.read(position - start) + buffer
+            position = start
+
+            if line_end is None:
+                newline = buffer.rfind(b'\n')
+                if newline == -1:
+                    continue
+                line_end = position + newline
+            line_start = buffer.rfind(b'\n', 0, line_end - position)
+            if line_start != -1 or position == 0:
+                return buffer[line_start + 1:line_end - position], line_end + 1
+    return None, 0
+
+
+def segment_paths(ledger_dir: Path) -> List[Path]:
+    """Segments in chronological order"""
+    return sorted(Path(ledger_dir).glob('ledger_*.jsonl'))
+
+
+class LedgerWriter:
+    """
+    Appends chained entries to the current day's segment.
+
+    Each entry reaches the OS before the ledger lock is released, so other
+    writers see it. Entries are durable once committed: every `fsync_batch`
+    entries, after `fsync_interval` seconds (background flusher), or on
+    commit() / close(). fsync_batch=1 syncs every entry; fsync_batch=0
+    never fsyncs.
+    """
+
+    def __init__(
+        self,
+        ledger_dir: Path,
+        fsync_batch: int = 32,
+        fsync_interval: float = 1.0,
+        index_every: int = 64
+    ):
+        self.ledger_dir = Path(ledger_dir)
+        self.ledger_dir.mkdir(parents=True, exist_ok=True)
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.index_every = index_every
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._index = None
+        self._day: Optional[str] = None
+        self._offset = 0
+        self._pending = 0
+        self._pending_since = 0.0
+        self._closed = False
+
+        # Cross-process append lock (held only while chaining + writing one entry)
+        self._lock_file = open(self.ledger_dir / 'ledger.lock', 'a+b')
+        with self._locked():
+            self.prev_hash, self.seq = self._recover()
+
+        self._wake = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name='ledger-flusher', daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive ledger lock across processes (and across writers in this one)"""
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    # ==================== Recovery ====================
+
+    def _recover(self) -> Tuple[str, int]:
+        """Last hash and sequence number, repairing a torn tail of the newest chained segment"""
+        for path in reversed(segment_paths(self.ledger_dir)):
+            line, end = _last_line(path)
+            if path.stat().st_size != end:
+                logger.warning(f"Truncating torn ledger tail: {path} ({path.stat().st_size - end} bytes)")
+                with open(path, 'r+b') as f:
+                    f.truncate(end)
+            if line is None or not line.startswith(_PREFIX):
+                continue  # Empty or legacy segment; the chain (if any) ends further back
+
+            last = json.loads(line)
+            self._repair_index(path, last['seq'])
+            return last['hash'], last['seq']
+        return GENESIS_HASH, 0
+
+    def _repair_index(self, path: Path, last_seq: int) -> None:
+        """Rebuild a segment's index if it points past the data or lags behind it"""
+        index_path = path.with_suffix('.idx')
+        index = np.fromfile(index_path, dtype=INDEX_DTYPE) if index_path.exists() else np.empty(0, INDEX_DTYPE)
+        if len(index) and index['offset'][-1] < path.stat().st_size and last_seq - index['seq'][-1] < self.index_every:
+            return
+        build_index(path, self.index_every)
+
+    def _adopt_tail(self) -> None:
+        """Chain after entries other writers appended to the open segment (caller holds both locks)"""
+        size = os.fstat(self._file.fileno()).st_size
+        if size == self._offset:
+            return
+
+        with open(self._file.name, 'rb') as f:
+            f.seek(self._offset)
+            tail = f.read(size - self._offset)
+        end = tail.rfind(b'\n') + 1
+        if end < len(tail):
+            # A partial line under the lock can only be a crashed writer's torn tail
+            logger.warning(f"Truncating torn ledger tail: {self._file.name} ({len(tail) - end} bytes)")
+            os.ftruncate(self._file.fileno(), self._offset + end)
+
+        if end:
+            last = json.loads(tail[tail.rfind(b'\n', 0, end - 1) + 1:end])
+            self.prev_hash, self.seq = last['hash'], last['seq']
+        self._offset += end
+
+    # ==================== Appends ====================
+
+    def _open_segment(self, day: str) -> None:
+        self._close_segment()
+        path = self.ledger_dir / f"ledger_{day}.jsonl"
+        # Unbuffered: every entry is written before the ledger lock is released
+        self._file = open(path, 'ab', buffering=0)
+        self._index = open(path.with_suffix('.idx'), 'ab', buffering=0)
+        self._offset = self._file.tell()
+        self._day = day
+        self._segment_first = True
+
+    def _close_segment(self) -> None:
+        if self._file is not None:
+            self._commit()
+            self._file.close()
+            self._index.close()
+            self._file = self._index = None
+
+    def append(self, entry_type: str, entry_id: str, data: Dict, timestamp: Optional[datetime] = None) -> Dict:
+        """Chain and write one entry; returns {'seq', 'hash', 'timestamp'}"""
+        timestamp = timestamp or datetime.utcnow()
+        day = timestamp.strftime('%Y%m%d')
+
+        with self._lock, self._locked():
+            if self._closed:
+                raise RuntimeError("Ledger writer is closed")
+            if day != self._day:
+                # Re-read the chain head: other writers may have moved it since
+                self.prev_hash, self.seq = self._recover()
+                self._open_segment(day)
+            else:
+                self._adopt_tail()
+
+            seq = self.seq + 1
+            line, digest = _seal({
+                'prev': self.prev_hash,
+                'seq': seq,
+                'type': entry_type,
+                'id': entry_id,
+                'timestamp': timestamp.isoformat(),
+                'data': data
+            })
+            self._file.write(line)
+
+            if self._segment_first or seq % self.index_every == 0:
+                record = np.array([(seq, _to_epoch(timestamp.isoformat()), self._offset)], dtype=INDEX_DTYPE)
+                self._index.write(record.tobytes())
+                self._segment_first = False
+
+            self._offset += len(line)
+            self.seq, self.prev_hash = seq, digest
+
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending += 1
+            if self.fsync_batch and self._pending >= self.fsync_batch:
+                self._commit()
+            elif self._pending == 1:
+                self._wake.set()
+
+        return {'seq': seq, 'hash': digest, 'timestamp': timestamp.isoformat()}
+
+    def _commit(self) -> None:
+        """fsync pending entries (the index is rebuildable, so not synced); caller holds the lock"""
+        if not self._pending or self._file is None:
+            return
+        if self.fsync_batch:
+            os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def commit(self) -> None:
+        with self._lock:
+            self._commit()
+
+    def _flush_loop(self) -> None:
+        """Commit pending entries at most `fsync_interval` after the first was written"""
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                due = self._pending_since + self.fsync_interval - time.monotonic()
+            if due > 0:
+                time.sleep(due)
+            with self._lock:
+                if self._pending and time.monotonic() - self._pending_since >= self.fsync_interval:
+                    self._commit()
+                elif self._pending:
+                    self._wake.set()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._close_segment()
+            self._lock_file.close()
+            self._closed = True
+        self._wake.set()
+
+
+_writers: Dict[Path, LedgerWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_ledger_writer(ledger_dir: Path, **kwargs) -> LedgerWriter:
+    """Process-wide writer for a ledger directory (created on first use, or after close())"""
+    key = Path(ledger_dir).resolve()
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = _writers[key] = LedgerWriter(key, **kwargs)
+        return writer
+
+
+def build_index(path: Path, index_every: int = 64) -> int:
+    """(Re)write a segment's sparse index from its chained lines; returns records written"""
+    records = []
+    offset = 0
+    first = True
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.startswith(_PREFIX) and line.endswith(b'\n'):
+                entry = json.loads(line)
+                if first or entry['seq'] % index_every == 0:
+                    records.append((entry['seq'], _to_epoch(entry['timestamp']), offset))
+                    first = False
+            offset += len(line)
+
+    index_path = path.with_suffix('.idx')
+    tmp_path = index_path.with_suffix('.idx.tmp')
+    np.array(records, dtype=INDEX_DTYPE).tofile(tmp_path)
+    os.replace(tmp_path, index_path)
+    return len(records)
+
+
+# ==================== Reads ====================
+
+class LedgerReader:
+    """Range and sequence lookups through the sparse segment indexes"""
+
+    def __init__(self, ledger_dir: Path):
+        self.ledger_dir = Path(ledger_dir)
+        self._indexes: Dict[Path, Tuple[float, np.ndarray]] = {}  # path -> (index mtime, records)
+        self._first_seqs: Dict[Path, int] = {}  # A segment's first entry never changes once indexed
+
+    def _index(self, path: Path) -> np.ndarray:
+        index_path = path.with_suffix('.idx')
+        if not index_path.exists():
+            return np.empty(0, INDEX_DTYPE)
+        mtime = index_path.stat().st_mtime
+        cached = self._indexes.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, np.fromfile(index_path, dtype=INDEX_DTYPE))
+            self._indexes[path] = cached
+        return cached[1]
+
+    def _scan(self, path: Path, offset: int) -> Iterator[Dict]:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if line.endswith(b'\n'):
+                    yield json.loads(line)
+
+    def range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Dict]:
+        """Entries with start <= timestamp <= end (naive = UTC), oldest first"""
+        start_ts = _to_epoch(start.isoformat()) if start else -np.inf
+        end_ts = _to_epoch(end.isoformat()) if end else np.inf
+        first_day = start.strftime('%Y%m%d') if start else ''
+        last_day = end.strftime('%Y%m%d') if end else '99999999'
+
+        for path in segment_paths(self.ledger_dir):
+            day = path.stem.split('_', 1)[1]
+            if day < first_day or day > last_day:
+                continue
+
+            # Seek to the last indexed entry at or before `start`
+            index = self._index(path)
+            offset = 0
+            if len(index) and start is not None:
+                position = int(np.searchsorted(index['ts'], start_ts, side='right')) - 1
+                offset = int(index['offset'][position]) if position >= 0 else 0
+
+            for entry in self._scan(path, offset):
+                ts = _to_epoch(entry['timestamp'])
+                if ts > end_ts:
+                    break
+                if ts >= start_ts:
+                    yield entry
+
+    def get(self, seq: int) -> Optional[Dict]:
+        """Entry by sequence number"""
+        current = segment_paths(self.ledger_dir)
+        for path in current:
+            if path not in self._first_seqs and len(self._index(path)):
+                self._first_seqs[path] = int(self._index(path)['seq'][0])
+        paths = sorted((p for p in current if p in self._first_seqs), key=self._first_seqs.get)
+        firsts = [self._first_seqs[p] for p in paths]
+        position = bisect.bisect_right(firsts, seq) - 1
+        if position < 0:
+            return None
+
+        path = paths[position]
+        index = self._index(path)
+        record = int(np.searchsorted(index['seq'], seq, side='right')) - 1
+        for entry in self._scan(path, int(index['offset'][record])):
+            if entry.get('seq') == seq:
+                return entry
+            if entry.get('seq', 0) > seq:
+                break
+        return None
+
+    def find(self, entry_id: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict]:
+        """Entries recorded for an experiment / snapshot id, optionally within a time range"""
+        return [entry for entry in self.range(start, end) if entry.get('id') == entry_id]
+
+
+# ==================== Verification ====================
+
+def verify_segment(path: Path) -> Dict:
+    """Hashes and in-segment links of one segment (runs in a worker process)"""
+    with open(path, 'rb') as f:
+        lines = f.read().split(b'\n')
+
+    result = {'path': str(path), 'entries': 0, 'legacy': 0, 'first_prev': None, 'last_hash': None, 'errors': []}
+    if lines[-1]:
+        result['errors'].append((len(lines), 'incomplete trailing line'))
+    last = None
+
+    for number, line in enumerate(lines[:-1], start=1):
+        if not line.startswith(_PREFIX):
+            if last is None:
+                result['legacy'] += 1  # Pre-chain entries
+            else:
+                result['errors'].append((number, 'unchained entry after chain start'))
+            continue
+
+        prev = line[len(_PREFIX):len(_PREFIX) + 64].decode()
+        digest = line[-_SUFFIX_LEN + len(_HASH_KEY):-2].decode()
+        if line[-_SUFFIX_LEN:-_SUFFIX_LEN + len(_HASH_KEY)] != _HASH_KEY:
+            result['errors'].append((number, 'malformed entry'))
+            continue
+        if hashlib.sha256(line[:-_SUFFIX_LEN] + b'}').hexdigest() != digest:
+            result['errors'].append((number, 'hash mismatch (entry modified)'))
+        if last is None:
+            result['first_prev'] = prev
+        elif prev != last:
+            result['errors'].append((number, 'broken link to previous entry'))
+        last = digest
+        result['entries'] += 1
+
+    result['last_hash'] = last
+    return result
+
+
+def verify_ledger(ledger_dir: Path, workers: Optional[int] = None) -> Dict:
+    """
+    Verify every segment in parallel, then the links between segments.
+
+    Returns:
+        {'valid', 'segments', 'entries', 'legacy_entries', 'errors': [...], 'seconds'}
+    """
+    started = time.perf_counter()
+    paths = segment_paths(ledger_dir)
+    workers = workers or os.cpu_count() or 1
+
+    if workers > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(verify_segment, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    else:
+        results = [verify_segment(path) for path in paths]
+
+    errors = []
+    expected = GENESIS_HASH
+    for result in results:
+        errors.extend(f"{Path(result['path']).name}:{line}: {message}" for line, message in result['errors'])
+        if result['entries']:
+            if result['first_prev'] != expected:
+                errors.append(f"{Path(result['path']).name}: chain break with previous segment")
+            expected = result['last_hash']
+
+    return {
+        'valid': not errors,
+        'segments': len(paths),
+        'entries': sum(r['entries'] for r in results),
+        'legacy_entries': sum(r['legacy'] for r in results),
+        'errors': errors,
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+
+
+def main():
+    """Main entry point"""
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description='Memory Core audit ledger')
+    parser.add_argument('command', choices=['verify', 'range', 'get', 'rebuild-index'])
+    parser.add_argument('--dir', default='sentient_core/memory/ledger', help='Ledger directory')
+    parser.add_argument('--workers', type=int, default=None, help='Verifier processes (default: CPU count)')
+    parser.add_argument('--start', help='Range start (ISO, UTC)')
+    parser.add_argument('--end', help='Range end (ISO, UTC)')
+    parser.add_argument('--seq', type=int, help='Sequence number for get')
+    args = parser.parse_args()
+
+    if args.command == 'verify':
+        report = verify_ledger(Path(args.dir), args.workers)
+        print(json.dumps(report, indent=2))
+        raise SystemExit(0 if report['valid'] else 1)
+    elif args.command == 'range':
+        start = datetime.fromisoformat(args.start) if args.start else None
+        end = datetime.fromisoformat(args.end) if args.end else None
+        for entry in LedgerReader(Path(args.dir)).range(start, end):
+            print(json.dumps(entry))
+    elif args.command == 'get':
+        print(json.dumps(LedgerReader(Path(args.dir)).get(args.seq), indent=2))
+    else:
+        for path in segment_paths(Path(args.dir)):
+            print(f"{path.name}: {build_index(path)} index records")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Experiment Store
+
+Indexed SQLite storage for Memory Core experiments, best configurations and
+snapshots.
+
+- SQLite in WAL mode: storing an experiment is one transaction of B-tree
+  inserts (O(log n)), no matter how much history is kept
+- Indexed on outcome, timestamp and performance_gain, so best-configuration
+  recall, regression baselines and learning stats are queries, not scans
+- Unbounded retention
+- One-time import of the legacy memstore_v17_6.json and snapshot files
+
+Author: NeuroPilot Genesis Team
+Version: 17.7.0
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    id INTEGER PRIMARY KEY,
+    experiment_id TEXT NOT NULL UNIQUE,
+    ts TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    performance_gain REAL NOT NULL,
+    cost_impact REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_experiments_ts ON experiments (ts);
+CREATE INDEX IF NOT EXISTS idx_experiments_outcome_id ON experiments (outcome, id);
+CREATE INDEX IF NOT EXISTS idx_experiments_gain ON experiments (performance_gain);
+
+CREATE TABLE IF NOT EXISTS best_configurations (
+    experiment_id TEXT PRIMARY KEY,
+    ts TEXT NOT NULL,
+    performance_gain REAL NOT NULL,
+    cost_impact REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_best_gain ON best_configurations (performance_gain);
+CREATE INDEX IF NOT EXISTS idx_best_cost ON best_configurations (cost_impact);
+CREATE INDEX IF NOT EXISTS idx_best_ts ON best_configurations (ts);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_id TEXT PRIMARY KEY,
+    ts TEXT NOT NULL,
+    version TEXT NOT NULL,
+    is_stable INTEGER NOT NULL,
+    checksum TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_stable_ts ON snapshots (is_stable, ts);
+"""
+
+# recall_best_configurations() metric -> indexed column
+_BEST_ORDER = {
+    'performance_gain': 'performance_gain',
+    'cost_impact': 'cost_impact',
+    'timestamp': 'ts'
+}
+
+
+class ExperimentStore:
+    """
+    SQLite store behind MemoryCore.
+
+    Timestamps are ISO-8601 UTC strings, which sort chronologically as text.
+    "Recent" means most recently stored (insertion order), as in the
+    original in-memory lists.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ==================== Writes ====================
+
+    def _insert_experiment(self, experiment: Dict) -> None:
+        """Upsert one experiment, plus its best-configuration row if it was a gain (caller holds the lock)"""
+        self._conn.execute(
+            "INSERT INTO experiments (experiment_id, ts, outcome, performance_gain, cost_impact, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (experiment_id) DO UPDATE SET "
+            "ts = excluded.ts, outcome = excluded.outcome, performance_gain = excluded.performance_gain, "
+            "cost_impact = excluded.cost_impact, payload = excluded.payload",
+            (
+                experiment['experiment_id'],
+                experiment['timestamp'],
+                experiment['outcome'],
+                float(experiment['performance_gain']),
+                float(experiment['cost_impact']),
+                json.dumps(experiment, default=str)
+            )
+        )
+
+        if experiment['outcome'] == 'success' and experiment['performance_gain'] > 0:
+            self._insert_best({
+                'experiment_id': experiment['experiment_id'],
+                'configuration': experiment['configuration'],
+                'performance_gain': experiment['performance_gain'],
+                'cost_impact': experiment['cost_impact'],
+                'timestamp': experiment['timestamp']
+            })
+
+    def _insert_best(self, entry: Dict) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO best_configurations (experiment_id, ts, performance_gain, cost_impact, payload) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                entry['experiment_id'],
+                entry['timestamp'],
+                float(entry['performance_gain']),
+                float(entry['cost_impact']),
+                json.dumps(entry, default=str)
+            )
+        )
+
+    def add_experiment(self, experiment: Dict) -> None:
+        """Store an experiment (asdict(Experiment)) in one transaction"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._insert_experiment(experiment)
+
+    def add_snapshot(self, snapshot: Dict) -> None:
+        """Store a snapshot (asdict(MemorySnapshot))"""
+        with self._lock:
+            self._insert_snapshot(snapshot)
+
+    def _insert_snapshot(self, snapshot: Dict) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO snapshots (snapshot_id, ts, version, is_stable, checksum, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                snapshot['snapshot_id'],
+                snapshot['timestamp'],
+                snapshot['version'],
+                int(bool(snapshot['is_stable'])),
+                snapshot['checksum'],
+                json.dumps(snapshot, default=str)
+            )
+        )
+
+    # ==================== Queries ====================
+
+    def count_experiments(self, outcome: Optional[str] = None) -> int:
+        with self._lock:
+            if outcome is None:
+                return self._conn.execute("SELECT COUNT(*) FROM experiments").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM experiments WHERE outcome = ?", (outcome,)).fetchone()[0]
+
+    def recent_experiments(self, limit: int, outcome: Optional[str] = None) -> List[Dict]:
+        """
+        Experiments among the last `limit` stored, newest last; with `outcome`,
+        only those of the last `limit` that had that outcome.
+        """
+        where = "WHERE outcome = ?" if outcome else ""
+        params = (int(limit), outcome) if outcome else (int(limit),)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT payload FROM (SELECT id, outcome, payload FROM experiments ORDER BY id DESC LIMIT ?) "
+                f"{where} ORDER BY id",
+                params
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def experiment_stats(self, last_n: int) -> Dict:
+        """Count, success rate and mean gain / cost impact over the last N experiments"""
+        with self._lock:
+            count, successes, avg_gain, avg_cost = self._conn.execute(
+                "SELECT COUNT(*), SUM(outcome = 'success'), AVG(performance_gain), AVG(cost_impact) "
+                "FROM (SELECT outcome, performance_gain, cost_impact FROM experiments ORDER BY id DESC LIMIT ?)",
+                (int(last_n),)
+            ).fetchone()
+        return {
+            'count': count,
+            'success_rate': (successes / count) if count else 0.0,
+            'avg_performance_gain': avg_gain,
+            'avg_cost_impact': avg_cost
+        }
+
+    def best_configurations(self, metric: str = 'performance_gain', top_n: int = 5) -> List[Dict]:
+        """Best configurations by a metric, highest first (index-ordered)"""
+        column = _BEST_ORDER.get(metric)
+        if column is None:
+            raise ValueError(f"Unknown configuration metric: {metric} (expected one of {sorted(_BEST_ORDER)})")
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT payload FROM best_configurations ORDER BY {column} DESC LIMIT ?", (int(top_n),)
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def get_snapshot(self, snapshot_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM snapshots WHERE snapshot_id = ?", (snapshot_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def last_stable_snapshot(self) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM snapshots WHERE is_stable = 1 ORDER BY ts DESC LIMIT 1"
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def snapshot_counts(self) -> Dict[str, int]:
+        with self._lock:
+            total, stable = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(is_stable), 0) FROM snapshots").fetchone()
+        return {'total': total, 'stable': stable}
+
+    # ==================== Migration ====================
+
+    def import_legacy(self, memstore_path: Path, snapshots_dir: Path) -> Dict[str, int]:
+        """
+        One-time import of the v17.6 JSON memstore (renamed to *.migrated
+        afterwards) and of snapshot files not yet in the table. Snapshot
+        files are left in place.
+        """
+        imported = {'experiments': 0, 'best_configurations': 0, 'snapshots': 0}
+        memstore_path = Path(memstore_path)
+
+        if memstore_path.exists():
+            try:
+                with open(memstore_path, 'r') as f:
+                    memory = json.load(f)
+
+                with self._lock:
+                    with self._conn:
+                        self._conn.execute("BEGIN")
+                        for experiment in memory.get('experiments', []):
+                            self._insert_experiment(experiment)
+                            imported['experiments'] += 1
+                        # Best configurations may outlive the 100 experiments the JSON kept
+                        for entry in memory.get('best_configurations', []):
+                            self._insert_best(entry)
+                            imported['best_configurations'] += 1
+
+                memstore_path.rename(memstore_path.with_suffix(memstore_path.suffix + '.migrated'))
+                logger.info(f"✓ Imported {imported['experiments']} experiments from {memstore_path}")
+
+            except Exception as e:
+                logger.warning(f"Failed to import {memstore_path}: {e}")
+
+        snapshot_files = sorted(Path(snapshots_dir).glob("snapshot_*.json")) if Path(snapshots_dir).exists() else []
+        if snapshot_files:
+            with self._lock:
+                known = {row[0] for row in self._conn.execute("SELECT snapshot_id FROM snapshots")}
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    for path in snapshot_files:
+                        if path.stem in known:
+                            continue
+                        try:
+                            with open(path, 'r') as f:
+                                self._insert_snapshot(json.load(f))
+                            imported['snapshots'] += 1
+                        except Exception as e:
+                            logger.warning(f"Skipping snapshot file {path}: {e}")
+            if imported['snapshots']:
+                logger.info(f"✓ Imported {imported['snapshots']} snapshots from {snapshots_dir}")
+
+        return imported
@@ -5,6 +5,10 @@ NeuroPilot v17.6 - Memory Core
 Persistent long-term learning memory with encrypted storage.
 Stores experiment outcomes, recalls best configurations, and detects regressions.
 
+v17.7: Experiments, best configurations and snapshots live in an indexed
+SQLite store (unbounded history); the v17.6 JSON memstore is imported once.
+The audit ledger is hash-chained, group-committed and indexed.
+
 Author: NeuroPilot Genesis Team
 Version: 17.6.0
 """
@@ -19,6 +23,13 @@ from typing import Dict, List, Optional
 
 import numpy as np
 
+try:
+    from .audit_ledger import LedgerReader, get_ledger_writer, verify_ledger
+    from .experiment_store import ExperimentStore
+except ImportError:
+    from audit_ledger import LedgerReader, get_ledger_writer, verify_ledger
+    from experiment_store import ExperimentStore
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -61,12 +72,17 @@ class MemoryCore:
     - Immutable audit trail
 
     Storage:
-    - sentient_core/memory/memstore_v17_6.json (encrypted)
-    - sentient_core/memory/snapshots/ (version checkpoints)
-    - sentient_core/memory/ledger/ (immutable audit log)
+    - sentient_core/memory/memstore.db (experiments, best configurations, snapshots)
+    - sentient_core/memory/ledger/ (hash-chained audit log, daily segments + sparse indexes)
+    - memstore_v17_6.json / snapshots/ (legacy, imported on first start)
     """
 
-    def __init__(self, memory_dir: str = "sentient_core/memory"):
+    def __init__(
+        self,
+        memory_dir: str = "sentient_core/memory",
+        ledger_fsync_batch: int = 32,
+        ledger_fsync_interval: float = 1.0
+    ):
         self.memory_dir = Path(memory_dir)
         self.memory_dir.mkdir(parents=True, exist_ok=True)
 
@@ -76,21 +92,26 @@ class MemoryCore:
         self.ledger_dir = self.memory_dir / "ledger"
         self.ledger_dir.mkdir(parents=True, exist_ok=True)
 
-        self.memstore_path = self.memory_dir / "memstore_v17_6.json"
+        self.memstore_path = self.memory_dir / "memstore_v17_6.json"  # Legacy, imported once
 
-        # Load existing memory
-        self.memory = self._load_memory()
+        # Indexed experiment / configuration / snapshot store
+        self.store = ExperimentStore(self.memory_dir / "memstore.db")
+        self.store.import_legacy(self.memstore_path, self.snapshots_dir)
 
-        # Experiments history
-        self.experiments: List[Experiment] = []
-        self.snapshots: List[MemorySnapshot] = []
-
-        # Load from storage
-        self._load_experiments()
-        self._load_snapshots()
+        # Audit ledger (segment kept open, group-committed; one writer per process)
+        self.ledger = get_ledger_writer(
+            self.ledger_dir,
+            fsync_batch=ledger_fsync_batch,
+            fsync_interval=ledger_fsync_interval
+        )
 
         logger.info("🧠 Memory Core initialized")
 
+    def close(self) -> None:
+        """Commit pending ledger entries and close the store (the shared ledger writer stays open)"""
+        self.ledger.commit()
+        self.store.close()
+
     def store_experiment(self, experiment: Experiment) -> None:
         """
         Store experiment outcome in memory.
@@ -100,25 +121,8 @@ class MemoryCore:
         """
         logger.info(f"💾 Storing experiment: {experiment.experiment_id}")
 
-        # Add to experiments list
-        self.experiments.append(experiment)
-
-        # Update memory store
-        if 'experiments' not in self.memory:
-            self.memory['experiments'] = []
-
-        self.memory['experiments'].append(asdict(experiment))
-
-        # Keep only last 100 experiments
-        if len(self.memory['experiments']) > 100:
-            self.memory['experiments'] = self.memory['experiments'][-100:]
-
-        # Update best configurations if this was successful
-        if experiment.outcome == 'success' and experiment.performance_gain > 0:
-            self._update_best_configurations(experiment)
-
-        # Save to disk
-        self._save_memory()
+        # One transaction; successful gains also become best-configuration rows
+        self.store.add_experiment(asdict(experiment))
 
         # Append to immutable ledger
         self._append_to_ledger('experiment', experiment.experiment_id, asdict(experiment))
@@ -136,19 +140,7 @@ class MemoryCore:
         """
         logger.info(f"🔍 Recalling top {top_n} configurations by {metric}")
 
-        if 'best_configurations' not in self.memory:
-            return []
-
-        best_configs = self.memory['best_configurations']
-
-        # Sort by metric
-        sorted_configs = sorted(
-            best_configs,
-            key=lambda x: x.get(metric, 0),
-            reverse=True
-        )
-
-        return sorted_configs[:top_n]
+        return self.store.best_configurations(metric, top_n)
 
     def detect_regression(self, current_metrics: Dict) -> Optional[Dict]:
         """
@@ -162,14 +154,8 @@ class MemoryCore:
         """
         logger.info("📊 Checking for performance regression...")
 
-        if not self.experiments:
-            return None
-
         # Get recent successful experiments
-        recent_successful = [
-            e for e in self.experiments[-20:]
-            if e.outcome == 'success'
-        ]
+        recent_successful = [Experiment(**e) for e in self.store.recent_experiments(20, outcome='success')]
 
         if len(recent_successful) < 5:
             return None
@@ -234,12 +220,7 @@ class MemoryCore:
         )
 
         # Store snapshot
-        self.snapshots.append(snapshot)
-
-        # Save to disk
-        snapshot_path = self.snapshots_dir / f"{snapshot_id}.json"
-        with open(snapshot_path, 'w') as f:
-            json.dump(asdict(snapshot), f, indent=2)
+        self.store.add_snapshot(asdict(snapshot))
 
         # Append to ledger
         self._append_to_ledger('snapshot', snapshot_id, asdict(snapshot))
@@ -260,15 +241,12 @@ class MemoryCore:
         """
         logger.info(f"🔄 Restoring snapshot: {snapshot_id}")
 
-        snapshot_path = self.snapshots_dir / f"{snapshot_id}.json"
+        snapshot_data = self.store.get_snapshot(snapshot_id)
 
-        if not snapshot_path.exists():
+        if snapshot_data is None:
             logger.error(f"  ❌ Snapshot not found: {snapshot_id}")
             return None
 
-        with open(snapshot_path, 'r') as f:
-            snapshot_data = json.load(f)
-
         snapshot = MemorySnapshot(**snapshot_data)
 
         # Verify checksum
@@ -287,12 +265,12 @@ class MemoryCore:
 
     def get_last_stable_snapshot(self) -> Optional[MemorySnapshot]:
         """Get most recent stable snapshot"""
-        stable_snapshots = [s for s in self.snapshots if s.is_stable]
+        snapshot_data = self.store.last_stable_snapshot()
 
-        if not stable_snapshots:
+        if snapshot_data is None:
             return None
 
-        return max(stable_snapshots, key=lambda s: s.timestamp)
+        return MemorySnapshot(**snapshot_data)
 
     def adapt_thresholds(self, current_performance: Dict) -> Dict:
         """
@@ -306,13 +284,12 @@ class MemoryCore:
         """
         logger.info("⚙️  Adapting thresholds based on historical data...")
 
-        if len(self.experiments) < 10:
+        if self.store.count_experiments() < 10:
             logger.info("  ℹ️  Insufficient data for adaptation")
             return {}
 
         # Analyze recent experiments
-        recent = self.experiments[-20:]
-        successful = [e for e in recent if e.outcome == 'success']
+        successful = [Experiment(**e) for e in self.store.recent_experiments(20, outcome='success')]
 
         if len(successful) < 5:
             return {}
@@ -336,94 +313,39 @@ class MemoryCore:
 
     def get_learning_stats(self) -> Dict:
         """Get statistics about learning progress"""
-        if not self.experiments:
+        total = self.store.count_experiments()
+        if not total:
             return {}
 
-        recent_experiments = self.experiments[-50:]
+        recent = self.store.experiment_stats(last_n=50)
+        snapshots = self.store.snapshot_counts()
 
         stats = {
-            'total_experiments': len(self.experiments),
-            'recent_experiments': len(recent_experiments),
-            'success_rate': len([e for e in recent_experiments if e.outcome == 'success']) / len(recent_experiments),
-            'avg_performance_gain': np.mean([e.performance_gain for e in recent_experiments]),
-            'avg_cost_impact': np.mean([e.cost_impact for e in recent_experiments]),
-            'total_snapshots': len(self.snapshots),
-            'stable_snapshots': len([s for s in self.snapshots if s.is_stable])
+            'total_experiments': total,
+            'recent_experiments': recent['count'],
+            'success_rate': recent['success_rate'],
+            'avg_performance_gain': recent['avg_performance_gain'],
+            'avg_cost_impact': recent['avg_cost_impact'],
+            'total_snapshots': snapshots['total'],
+            'stable_snapshots': snapshots['stable']
         }
 
         return stats
 
-    # ==================== Helper Methods ====================
+    def verify_audit_trail(self, workers: Optional[int] = None) -> Dict:
+        """Check the ledger hash chain across all segments (committing pending entries first)"""
+        self.ledger.commit()
+        report = verify_ledger(self.ledger_dir, workers)
+        status = "✅ intact" if report['valid'] else f"❌ {len(report['errors'])} errors"
+        logger.info(f"🔐 Audit trail {status}: {report['entries']} entries in {report['seconds']}s")
+        return report
 
-    def _load_memory(self) -> Dict:
-        """Load memory from disk"""
-        if not self.memstore_path.exists():
-            return {
-                'experiments': [],
-                'best_configurations': [],
-                'metadata': {
-                    'created': datetime.utcnow().isoformat(),
-                    'version': '17.6.0'
-                }
-            }
-
-        try:
-            with open(self.memstore_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading memory: {e}")
-            return {}
+    def audit_history(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict]:
+        """Ledger entries in a time range (UTC), via the segment indexes"""
+        self.ledger.commit()
+        return list(LedgerReader(self.ledger_dir).range(start, end))
 
-    def _save_memory(self) -> None:
-        """Save memory to disk"""
-        try:
-            with open(self.memstore_path, 'w') as f:
-                json.dump(self.memory, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving memory: {e}")
-
-    def _load_experiments(self) -> None:
-        """Load experiments from memory"""
-        if 'experiments' in self.memory:
-            for exp_data in self.memory['experiments']:
-                try:
-                    exp = Experiment(**exp_data)
-                    self.experiments.append(exp)
-                except:
-                    pass
-
-    def _load_snapshots(self) -> None:
-        """Load snapshots from disk"""
-        for snapshot_file in self.snapshots_dir.glob("snapshot_*.json"):
-            try:
-                with open(snapshot_file, 'r') as f:
-                    snapshot_data = json.load(f)
-                snapshot = MemorySnapshot(**snapshot_data)
-                self.snapshots.append(snapshot)
-            except:
-                pass
-
-    def _update_best_configurations(self, experiment: Experiment) -> None:
-        """Update best configurations list"""
-        if 'best_configurations' not in self.memory:
-            self.memory['best_configurations'] = []
-
-        config_entry = {
-            'experiment_id': experiment.experiment_id,
-            'configuration': experiment.configuration,
-            'performance_gain': experiment.performance_gain,
-            'cost_impact': experiment.cost_impact,
-            'timestamp': experiment.timestamp
-        }
-
-        self.memory['best_configurations'].append(config_entry)
-
-        # Keep only top 20
-        self.memory['best_configurations'] = sorted(
-            self.memory['best_configurations'],
-            key=lambda x: x['performance_gain'],
-            reverse=True
-        )[:20]
+    # ==================== Helper Methods ====================
 
     def _calculate_baseline(self, experiments: List[Experiment]) -> Dict:
         """Calculate baseline metrics from experiments"""
@@ -466,18 +388,7 @@ class MemoryCore:
 
     def _append_to_ledger(self, entry_type: str, entry_id: str, data: Dict) -> None:
         """Append to immutable audit ledger"""
-        ledger_entry = {
-            'type': entry_type,
-            'id': entry_id,
-            'timestamp': datetime.utcnow().isoformat(),
-            'data': data
-        }
-
-        # Append to daily ledger file
-        ledger_file = self.ledger_dir / f"ledger_{datetime.utcnow().strftime('%Y%m%d')}.jsonl"
-
-        with open(ledger_file, 'a') as f:
-            f.write(json.dumps(ledger_entry) + '\n')
+        self.ledger.append(entry_type, entry_id, data)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Forecast Feature Store
+
+Running normalization statistics for the Forecast Engine's LSTM features.
+
+- Per-metric count / mean / M2, updated online (Welford, batched via Chan's merge)
+- Exact transform / inverse_transform for batches of any leading shape
+- Incremental by timestamp: rows already seen are not counted twice
+- Persisted as JSON next to the models (atomic replace)
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FeatureStore:
+    """
+    Welford running statistics per feature, StandardScaler-compatible.
+
+    Scale is the population standard deviation (ddof=0) and zero-variance
+    features get scale 1, as in sklearn's StandardScaler, so models trained
+    against either normalize identically.
+    """
+
+    def __init__(self, path: Path, features: List[str]):
+        self.path = Path(path)
+        self.features = list(features)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all statistics"""
+        n = len(self.features)
+        self.count = np.zeros(n)
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        self.last_timestamp: Optional[pd.Timestamp] = None
+
+    @property
+    def is_fitted(self) -> bool:
+        return bool(np.all(self.count > 0))
+
+    @property
+    def scale(self) -> np.ndarray:
+        variance = np.divide(self.m2, self.count, out=np.zeros_like(self.m2), where=self.count > 0)
+        scale = np.sqrt(variance)
+        scale[scale == 0] = 1.0
+        return scale
+
+    def update(self, values: np.ndarray) -> int:
+        """
+        Fold a batch of rows (n, features) into the running statistics.
+
+        NaNs are skipped per feature. Returns the number of rows folded in.
+        """
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.features))
+        if len(values) == 0:
+            return 0
+
+        valid = ~np.isnan(values)
+        n_b = valid.sum(axis=0).astype(np.float64)
+        filled = np.where(valid, values, 0.0)
+        mean_b = np.divide(filled.sum(axis=0), n_b, out=np.zeros_like(n_b), where=n_b > 0)
+        m2_b = (np.where(valid, values - mean_b, 0.0) ** 2).sum(axis=0)
+
+        with self._lock:
+            # Chan et al. parallel merge of (count, mean, M2)
+            n_a = self.count
+            total = n_a + n_b
+            delta = mean_b - self.mean
+            safe_total = np.where(total > 0, total, 1.0)
+            self.mean = self.mean + delta * n_b / safe_total
+            self.m2 = self.m2 + m2_b + delta ** 2 * n_a * n_b / safe_total
+            self.count = total
+
+        return len(values)
+
+    def update_from_frame(self, df: pd.DataFrame) -> int:
+        """
+        Fold in rows of a metrics frame not seen before (by `timestamp`).
+
+        Frames without a timestamp column are folded in whole.
+        """
+        if 'timestamp' not in df.columns:
+            return self.update(df[self.features].values)
+
+        timestamps = pd.to_datetime(df['timestamp'])
+        new = df
+        if self.last_timestamp is not None:
+            new = df[timestamps > self.last_timestamp]
+        if new.empty:
+            return 0
+
+        added = self.update(new[self.features].values)
+        self.last_timestamp = pd.to_datetime(new['timestamp']).max()
+        return added
+
+    def fit(self, values: np.ndarray, last_timestamp: Optional[pd.Timestamp] = None) -> None:
+        """Reset and compute statistics from scratch"""
+        self.reset()
+        self.update(values)
+        self.last_timestamp = last_timestamp
+
+    def transform(self, values: np.ndarray) -> np.ndarray:
+        """Normalize values of shape (..., features)"""
+        return ((np.asarray(values, dtype=np.float64) - self.mean) / self.scale).astype(np.float32)
+
+    def inverse_transform(self, values: np.ndarray) -> np.ndarray:
+        """Map normalized values of shape (..., features) back to metric units"""
+        return np.asarray(values, dtype=np.float64) * self.scale + self.mean
+
+    def seed_from_scaler(self, scaler) -> bool:
+        """Initialize from a fitted sklearn StandardScaler (legacy scaler.pkl)"""
+        if not hasattr(scaler, 'mean_') or len(scaler.mean_) != len(self.features):
+            return False
+
+        self.count = np.broadcast_to(np.asarray(scaler.n_samples_seen_, dtype=np.float64), self.mean.shape).copy()
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64).copy()
+        self.m2 = np.asarray(scaler.var_, dtype=np.float64) * self.count
+        return True
+
+    def save(self) -> None:
+        """Persist statistics (write-then-rename)"""
+        with self._lock:
+            state = {
+                'features': self.features,
+                'count': self.count.tolist(),
+                'mean': self.mean.tolist(),
+                'm2': self.m2.tolist(),
+                'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+                'updated_at': datetime.utcnow().isoformat()
+            }
+
+        try:
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save feature store: {e}")
+
+    def load(self) -> bool:
+        """Load persisted statistics; False if missing or for a different feature set"""
+        if not self.path.exists():
+            return False
+
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+
+            if state.get('features') != self.features:
+                logger.warning("Feature store feature set changed, ignoring persisted statistics")
+                return False
+
+            self.count = np.asarray(state['count'], dtype=np.float64)
+            self.mean = np.asarray(state['mean'], dtype=np.float64)
+            self.m2 = np.asarray(state['m2'], dtype=np.float64)
+            self.last_timestamp = pd.Timestamp(state['last_timestamp']) if state.get('last_timestamp') else None
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to load feature store: {e}")
+            return False
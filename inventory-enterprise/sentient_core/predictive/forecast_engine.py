@@ -16,27 +16,26 @@ Author: NeuroPilot AI Ops Team
 Version: 17.5.0
 """
 
+import importlib.util
 import logging
-import os
 import pickle
+import time
 import warnings
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+import yaml
 
-# Deep Learning
-try:
-    import tensorflow as tf
-    from tensorflow import keras
-    from tensorflow.keras import layers
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
-    warnings.warn("TensorFlow not available. LSTM predictions disabled.")
+# Deep Learning (imported lazily: only training / fine-tuning needs TensorFlow,
+# inference runs on the NumPy backend over exported weights)
+TENSORFLOW_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
+if not TENSORFLOW_AVAILABLE:
+    warnings.warn("TensorFlow not available. LSTM training disabled.")
 
 # Time Series
 try:
@@ -54,13 +53,36 @@ except ImportError:
     XGBOOST_AVAILABLE = False
     warnings.warn("XGBoost not available. GBDT predictions disabled.")
 
-# Standard ML
-from sklearn.preprocessing import StandardScaler
+# v17.7: Fingerprinted / warm-started Prophet training, fast LSTM inference,
+# cached delta-fetching metric history
+try:
+    from .prophet_trainer import ProphetTrainer
+    from .lstm_inference import CompiledLSTM, NumpyLSTM, export_lstm_weights
+    from .metrics_cache import PrometheusHistoryLoader
+    from .window_dataset import WindowDataset
+    from .gbdt_features import CURRENT_COLUMNS, GBDT_CLASSES, latest_features, rolling_feature_matrix
+    from .feature_store import FeatureStore
+    from .prediction_log import PredictionLog
+except ImportError:
+    from prophet_trainer import ProphetTrainer
+    from lstm_inference import CompiledLSTM, NumpyLSTM, export_lstm_weights
+    from metrics_cache import PrometheusHistoryLoader
+    from window_dataset import WindowDataset
+    from gbdt_features import CURRENT_COLUMNS, GBDT_CLASSES, latest_features, rolling_feature_matrix
+    from feature_store import FeatureStore
+    from prediction_log import PredictionLog
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _import_keras():
+    """Import Keras on first use (multi-second TensorFlow startup)"""
+    from tensorflow import keras
+    from tensorflow.keras import layers
+    return keras, layers
+
+
 @dataclass
 class Prediction:
     """Incident prediction result"""
@@ -72,6 +94,7 @@ class Prediction:
     recommended_action: str
     model_source: str
     timestamp: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -99,17 +122,25 @@ class ForecastEngine:
 
     def __init__(self, config_path: str = "sentient_core/config/sentient_config.yaml"):
         self.config_path = config_path
+        self.config = self._load_config()
         self.models_dir = Path("sentient_core/models")
         self.models_dir.mkdir(parents=True, exist_ok=True)
 
         # Model components
-        self.lstm_model: Optional[keras.Model] = None
+        self.lstm_model = None  # Keras model, only loaded for training
+        self.lstm_runner: Optional[object] = None  # NumpyLSTM or CompiledLSTM
         self.prophet_models: Dict[str, Prophet] = {}
+        self.prophet_trainer = ProphetTrainer(self.models_dir)
         self.gbdt_model: Optional[xgb.XGBClassifier] = None
-        self.scaler = StandardScaler()
+        self.history_loader = PrometheusHistoryLoader(self.models_dir / "metrics_cache.db")
 
         # Configuration
         self.window_size = 48  # 48 × 30min = 24 hours
+        self.lstm_features = ['cpu_usage', 'memory_usage', 'p95_latency', 'error_rate', 'request_rate']
+        self.lstm_horizon = 1  # steps per forward pass for newly built models
+
+        # v17.7: Running normalization statistics for LSTM features (persisted)
+        self.feature_store = FeatureStore(self.models_dir / "feature_store.json", self.lstm_features)
         self.forecast_horizon = 12  # hours
         self.min_training_samples = 100
 
@@ -123,27 +154,58 @@ class ForecastEngine:
             'gbdt': 0.25
         }
 
-        # Performance tracking
-        self.prediction_history = []
-        self.accuracy_tracker = {
-            'lstm': [],
-            'prophet': [],
-            'gbdt': []
+        # v17.7: Concurrent model branches with per-branch deadlines (seconds).
+        # Threads suffice: TF/NumPy kernels, Stan (subprocess) and XGBoost
+        # all release the GIL during the heavy work.
+        self.branch_timeouts = {
+            'lstm': 10.0,
+            'prophet': 45.0,
+            'gbdt': 5.0,
+            **{
+                branch: float(seconds)
+                for branch, seconds in (self.config.get('forecasting', {}).get('branch_timeouts') or {}).items()
+            }
+        }
+        self.prophet_metrics = ['cpu_usage', 'memory_usage', 'p95_latency', 'error_rate']
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='forecast')
+        self._inflight: Dict[str, Future] = {}  # task key -> last submitted future
+        self.branch_stats = {
+            branch: {'runs': 0, 'timeouts': 0, 'last_latency_ms': 0.0}
+            for branch in self.branch_timeouts
         }
+        self.last_execution: Dict[str, Any] = {}
+
+        # Performance tracking (v17.7: memory-mapped ring buffer of outcomes)
+        self.prediction_log = PredictionLog(self.models_dir / "prediction_log.bin", capacity=10000)
 
         # Load existing models
         self._load_models()
 
         logger.info("🔮 Forecast Engine v17.5 initialized (online learning: enabled)")
 
+    def _load_config(self) -> Dict:
+        """Load sentient configuration (empty if missing or unreadable)"""
+        try:
+            if Path(self.config_path).exists():
+                with open(self.config_path, 'r') as f:
+                    return yaml.safe_load(f) or {}
+        except Exception as e:
+            logger.warning(f"Config load error: {e}")
+        return {}
+
     def _load_models(self) -> None:
         """Load pre-trained models from disk"""
         try:
-            # LSTM
+            # LSTM: prefer exported NumPy weights (no TensorFlow import)
             lstm_path = self.models_dir / "lstm_model.h5"
-            if lstm_path.exists() and TENSORFLOW_AVAILABLE:
-                self.lstm_model = keras.models.load_model(str(lstm_path))
-                logger.info("✓ LSTM model loaded")
+            lstm_npz_path = self.models_dir / "lstm_model.npz"
+            if lstm_npz_path.exists() and (
+                not lstm_path.exists() or lstm_npz_path.stat().st_mtime >= lstm_path.stat().st_mtime
+            ):
+                self.lstm_runner = NumpyLSTM.load(lstm_npz_path)
+                logger.info("✓ LSTM weights loaded (NumPy backend)")
+            elif lstm_path.exists() and TENSORFLOW_AVAILABLE:
+                self._load_keras_lstm()
 
             # GBDT
             gbdt_path = self.models_dir / "gbdt_model.pkl"
@@ -152,16 +214,47 @@ class ForecastEngine:
                     self.gbdt_model = pickle.load(f)
                 logger.info("✓ GBDT model loaded")
 
-            # Scaler
+            # Feature store (seeded from a legacy scaler.pkl on first run)
             scaler_path = self.models_dir / "scaler.pkl"
-            if scaler_path.exists():
+            if self.feature_store.load():
+                logger.info("✓ Feature store loaded")
+            elif scaler_path.exists():
                 with open(scaler_path, 'rb') as f:
-                    self.scaler = pickle.load(f)
-                logger.info("✓ Scaler loaded")
+                    if self.feature_store.seed_from_scaler(pickle.load(f)):
+                        self.feature_store.save()
+                        logger.info("✓ Feature store seeded from legacy scaler")
 
         except Exception as e:
             logger.warning(f"Model loading error: {e}")
 
+    def reload_models(self) -> None:
+        """Drop resident models and load them again from disk (daemon hot reload)"""
+        self.lstm_model = None
+        self.lstm_runner = None
+        self.gbdt_model = None
+        self.prophet_trainer.models.clear()
+        self.prophet_trainer.fingerprints.clear()
+        self._load_models()
+
+    def _load_keras_lstm(self) -> bool:
+        """Load the Keras LSTM (for training) and refresh its NumPy export"""
+        lstm_path = self.models_dir / "lstm_model.h5"
+        if not lstm_path.exists() or not TENSORFLOW_AVAILABLE:
+            return False
+
+        keras, _ = _import_keras()
+        self.lstm_model = keras.models.load_model(str(lstm_path))
+        self._export_lstm()
+        logger.info("✓ LSTM model loaded")
+        return True
+
+    def _export_lstm(self) -> None:
+        """Export current Keras LSTM weights for the NumPy inference backend"""
+        try:
+            export_lstm_weights(self.lstm_model, self.models_dir / "lstm_model.npz")
+        except Exception as e:
+            logger.warning(f"LSTM weight export failed: {e}")
+
     def predict_incidents(
         self,
         metrics: Metrics,
@@ -191,16 +284,26 @@ class ForecastEngine:
             logger.warning("Insufficient historical data for predictions")
             return predictions
 
-        # Run each model
-        lstm_preds = self._run_lstm_predictions(metrics, historical_data, forecast_hours)
-        prophet_preds = self._run_prophet_predictions(historical_data, forecast_hours)
-        gbdt_preds = self._run_gbdt_predictions(metrics, historical_data)
+        # Run model branches concurrently (Prophet fans out per metric)
+        started = time.monotonic()
+        branches = {
+            'lstm': [self._submit_timed('lstm', self._run_lstm_predictions, metrics, historical_data, forecast_hours)],
+            'prophet': [
+                self._submit_timed(
+                    f'prophet:{metric_name}', self._run_prophet_metric, historical_data, metric_name, forecast_hours
+                )
+                for metric_name in self.prophet_metrics
+            ],
+            'gbdt': [self._submit_timed('gbdt', self._run_gbdt_predictions, metrics, historical_data)]
+        }
 
-        # Combine predictions
-        all_preds = lstm_preds + prophet_preds + gbdt_preds
+        # Combine predictions (branches past their deadline are dropped)
+        all_preds, execution = self._collect_branches(branches, started)
 
         # Ensemble voting: aggregate by incident type
         predictions = self._ensemble_predictions(all_preds)
+        for pred in predictions:
+            pred.metadata['execution'] = execution
 
         # Sort by probability (highest first)
         predictions.sort(key=lambda p: p.probability, reverse=True)
@@ -214,6 +317,93 @@ class ForecastEngine:
 
         return predictions
 
+    def _submit_timed(self, key: str, fn: Callable, *args) -> Optional[Future]:
+        """
+        Submit fn to the branch pool; the future yields (result, elapsed_ms).
+
+        Returns None (task skipped) while the previous task under `key` is
+        still running past its deadline, so a hanging branch holds at most
+        one worker instead of stacking a new task every cycle.
+        """
+        previous = self._inflight.get(key)
+        if previous is not None and not previous.done():
+            logger.warning(f"⏱️  {key} still running from a previous cycle - skipping")
+            return None
+
+        def timed():
+            start = time.perf_counter()
+            result = fn(*args)
+            return result, (time.perf_counter() - start) * 1000
+
+        future = self._executor.submit(timed)
+        self._inflight[key] = future
+        return future
+
+    def shutdown(self) -> None:
+        """Cancel queued branch tasks and release the pool (running tasks finish in the background)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _collect_branches(self, branches: Dict[str, List], started: float) -> Tuple[List[Prediction], Dict[str, Any]]:
+        """
+        Gather branch results under per-branch deadlines.
+
+        Each deadline counts from `started` since all branches run at once.
+        Tasks that miss it are cancelled if still queued; a task that is
+        already running can't be interrupted and finishes in the background,
+        but its result is never used. Tasks skipped because their previous
+        run is still in flight (None) count as skipped.
+
+        Returns:
+            (predictions, execution metadata per branch)
+        """
+        predictions: List[Prediction] = []
+        branch_meta: Dict[str, Dict] = {}
+
+        for branch, futures in branches.items():
+            deadline = started + self.branch_timeouts.get(branch, 30.0)
+            latencies, timeouts, errors = [], 0, 0
+            skipped = sum(future is None for future in futures)
+
+            for future in futures:
+                if future is None:
+                    continue
+                try:
+                    preds, elapsed_ms = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    predictions.extend(preds)
+                    latencies.append(elapsed_ms)
+                except FuturesTimeout:
+                    future.cancel()
+                    timeouts += 1
+                except Exception as e:
+                    logger.error(f"{branch} branch error: {e}")
+                    errors += 1
+
+            latency_ms = max(latencies) if latencies else 0.0
+            if timeouts:
+                latency_ms = self.branch_timeouts.get(branch, 30.0) * 1000
+                logger.warning(f"⏱️  {branch} branch missed its deadline ({timeouts}/{len(futures)} tasks dropped)")
+
+            stats = self.branch_stats.setdefault(branch, {'runs': 0, 'timeouts': 0, 'last_latency_ms': 0.0})
+            stats['runs'] += 1
+            stats['timeouts'] += timeouts
+            stats['last_latency_ms'] = round(latency_ms, 1)
+
+            branch_meta[branch] = {
+                'latency_ms': round(latency_ms, 1),
+                'tasks': len(futures),
+                'timeouts': timeouts,
+                'skipped': skipped,
+                'errors': errors,
+                'total_timeouts': stats['timeouts']
+            }
+
+        execution = {
+            'branches': branch_meta,
+            'total_ms': round((time.monotonic() - started) * 1000, 1)
+        }
+        self.last_execution = execution
+        return predictions, execution
+
     def _run_lstm_predictions(
         self,
         metrics: Metrics,
@@ -221,7 +411,7 @@ class ForecastEngine:
         forecast_hours: int
     ) -> List[Prediction]:
         """Run LSTM sequence predictions"""
-        if not TENSORFLOW_AVAILABLE or self.lstm_model is None:
+        if self._get_lstm_runner() is None:
             return []
 
         try:
@@ -254,22 +444,28 @@ class ForecastEngine:
         predictions = []
 
         # Predict each key metric
-        metrics_to_forecast = ['cpu_usage', 'memory_usage', 'p95_latency', 'error_rate']
-
-        for metric_name in metrics_to_forecast:
-            try:
-                pred = self._prophet_forecast_metric(
-                    historical_data,
-                    metric_name,
-                    forecast_hours
-                )
-                if pred:
-                    predictions.append(pred)
-            except Exception as e:
-                logger.debug(f"Prophet forecast failed for {metric_name}: {e}")
+        for metric_name in self.prophet_metrics:
+            predictions.extend(self._run_prophet_metric(historical_data, metric_name, forecast_hours))
 
         return predictions
 
+    def _run_prophet_metric(
+        self,
+        historical_data: pd.DataFrame,
+        metric_name: str,
+        forecast_hours: int
+    ) -> List[Prediction]:
+        """Run a single Prophet metric forecast (one concurrent task)"""
+        if not PROPHET_AVAILABLE:
+            return []
+
+        try:
+            pred = self._prophet_forecast_metric(historical_data, metric_name, forecast_hours)
+            return [pred] if pred else []
+        except Exception as e:
+            logger.debug(f"Prophet forecast failed for {metric_name}: {e}")
+            return []
+
     def _run_gbdt_predictions(
         self,
         metrics: Metrics,
@@ -280,26 +476,17 @@ class ForecastEngine:
             return []
 
         try:
-            # Extract features
+            # Extract features (unscaled, as in training)
             features = self._extract_features(metrics, historical_data)
-            features_scaled = self.scaler.transform([features])
 
             # Predict incident probability
-            proba = self.gbdt_model.predict_proba(features_scaled)[0]
+            proba = self.gbdt_model.predict_proba(np.array([features]))[0]
 
             predictions = []
 
-            # Convert class probabilities to predictions
-            incident_types = [
-                'cpu_overload',
-                'memory_exhaustion',
-                'latency_spike',
-                'error_surge',
-                'cost_overrun'
-            ]
-
-            for i, incident_type in enumerate(incident_types):
-                if proba[i] > 0.3:  # 30% threshold
+            # Convert class probabilities to predictions (label 0 is "normal")
+            for i, incident_type in enumerate(GBDT_CLASSES[:len(proba)]):
+                if i > 0 and proba[i] > 0.3:  # 30% threshold
                     predictions.append(Prediction(
                         incident_type=incident_type,
                         probability=float(proba[i]),
@@ -322,36 +509,48 @@ class ForecastEngine:
         if len(df) < self.window_size:
             return None
 
-        # Select features
-        feature_cols = [
-            'cpu_usage', 'memory_usage', 'p95_latency',
-            'error_rate', 'request_rate'
-        ]
+        # Fold new samples into the running statistics
+        if self.feature_store.update_from_frame(df):
+            self.feature_store.save()
 
         # Get last window_size samples
-        recent = df.tail(self.window_size)[feature_cols].values
+        recent = df.tail(self.window_size)[self.lstm_features].values
 
         # Normalize
-        sequence = self.scaler.fit_transform(recent)
+        sequence = self.feature_store.transform(recent)
 
         # Reshape for LSTM: (1, timesteps, features)
-        return sequence.reshape(1, self.window_size, len(feature_cols))
+        return sequence.reshape(1, self.window_size, len(self.lstm_features))
 
     def _predict_sequence(self, sequence: np.ndarray, steps: int) -> np.ndarray:
         """Predict future sequence using LSTM"""
-        predictions = []
-        current_seq = sequence.copy()
+        return self.predict_sequences_batch(sequence, steps)[0]
+
+    def predict_sequences_batch(self, sequences: np.ndarray, steps: int) -> np.ndarray:
+        """
+        Multi-step LSTM forecast for many windows in one rollout.
 
-        for _ in range(steps):
-            # Predict next step
-            next_pred = self.lstm_model.predict(current_seq, verbose=0)
-            predictions.append(next_pred[0])
+        Args:
+            sequences: Normalized windows, shape (batch, window_size, features)
+            steps: Number of 30min steps to forecast
 
-            # Update sequence (rolling window)
-            current_seq = np.roll(current_seq, -1, axis=1)
-            current_seq[0, -1, :] = next_pred[0]
+        Returns:
+            Forecast array, shape (batch, steps, features)
+        """
+        return self._get_lstm_runner().predict_steps(sequences, steps)
 
-        return np.array(predictions)
+    def _get_lstm_runner(self):
+        """
+        Inference backend for the LSTM.
+
+        NumPy weights when only inference is needed; a compiled wrapper around
+        the resident Keras model once it has been loaded for training.
+        """
+        if self.lstm_model is not None:
+            if not isinstance(self.lstm_runner, CompiledLSTM) or self.lstm_runner.model is not self.lstm_model:
+                n_features = int(self.lstm_model.input_shape[-1])
+                self.lstm_runner = CompiledLSTM(self.lstm_model, n_features)
+        return self.lstm_runner
 
     def _analyze_lstm_output(
         self,
@@ -372,18 +571,15 @@ class ForecastEngine:
             'error_rate': 5.0
         }
 
-        feature_names = ['cpu_usage', 'memory_usage', 'p95_latency', 'error_rate', 'request_rate']
+        # Inverse transform to original scale
+        future_original = self.feature_store.inverse_transform(future_values)
 
-        for i, feature_name in enumerate(feature_names[:4]):  # Check first 4
+        for i, feature_name in enumerate(self.lstm_features):
             if feature_name not in thresholds:
                 continue
 
             threshold = thresholds[feature_name]
-            values = future_values[:, i]
-
-            # Inverse transform to original scale
-            # Note: This is simplified; proper inverse_transform would need full feature set
-            values_original = values * 100  # Approximation
+            values_original = future_original[:, i]
 
             # Find first breach
             breach_idx = np.where(values_original > threshold)[0]
@@ -425,17 +621,15 @@ class ForecastEngine:
             'y': df[metric_name]
         })
 
-        # Initialize or retrieve model
-        if metric_name not in self.prophet_models:
-            model = Prophet(
-                daily_seasonality=True,
-                weekly_seasonality=True,
-                interval_width=0.95
-            )
-            model.fit(prophet_df)
-            self.prophet_models[metric_name] = model
-        else:
-            model = self.prophet_models[metric_name]
+        # Fit or reuse model (skipped when data is unchanged, warm-started otherwise)
+        model, _ = self.prophet_trainer.fit(
+            metric_name,
+            prophet_df,
+            daily_seasonality=True,
+            weekly_seasonality=True,
+            interval_width=0.95
+        )
+        self.prophet_models[metric_name] = model
 
         # Create future dataframe
         future = model.make_future_dataframe(periods=forecast_hours, freq='H')
@@ -486,37 +680,32 @@ class ForecastEngine:
         return None
 
     def _extract_features(self, metrics: Metrics, historical_data: pd.DataFrame) -> List[float]:
-        """Extract features for GBDT model"""
-        recent_df = historical_data.tail(20)
-
-        features = [
-            metrics.cpu_usage,
-            metrics.memory_usage,
-            metrics.p95_latency,
-            metrics.p99_latency,
-            metrics.error_rate,
-            metrics.request_rate,
-            metrics.database_query_time,
-            float(metrics.active_instances),
-            metrics.current_cost,
-
-            # Statistical features
-            recent_df['cpu_usage'].mean(),
-            recent_df['cpu_usage'].std(),
-            recent_df['memory_usage'].mean(),
-            recent_df['memory_usage'].std(),
-            recent_df['p95_latency'].mean(),
-            recent_df['p95_latency'].std(),
-            recent_df['error_rate'].mean(),
-            recent_df['error_rate'].std(),
-
-            # Trend features
-            recent_df['cpu_usage'].diff().mean(),  # CPU trend
-            recent_df['memory_usage'].diff().mean(),  # Memory trend
-            recent_df['p95_latency'].diff().mean(),  # Latency trend
-        ]
-
-        return features
+        """Extract features for GBDT model (last row of the rolling feature matrix)"""
+        current = {col: float(getattr(metrics, col)) for col in CURRENT_COLUMNS}
+        return latest_features(current, historical_data, window=20)
+
+    def score_gbdt_batch(self, historical_data: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        GBDT class probabilities for every timestamp of a history in one call.
+
+        Args:
+            historical_data: Metrics history (oldest first)
+
+        Returns:
+            DataFrame of class probabilities (one row per sample, `timestamp`
+            column kept when present), or None if GBDT is unavailable
+        """
+        if not XGBOOST_AVAILABLE or self.gbdt_model is None:
+            return None
+
+        X = rolling_feature_matrix(historical_data, window=20)
+        proba = self.gbdt_model.predict_proba(X.values)
+
+        scores = pd.DataFrame(proba, index=historical_data.index, columns=GBDT_CLASSES[:proba.shape[1]])
+        if 'timestamp' in historical_data.columns:
+            scores.insert(0, 'timestamp', historical_data['timestamp'])
+
+        return scores
 
     def _ensemble_predictions(self, all_predictions: List[Prediction]) -> List[Prediction]:
         """Ensemble predictions from multiple models"""
@@ -564,58 +753,9 @@ class ForecastEngine:
         return final_predictions
 
     def _fetch_historical_metrics(self) -> Optional[pd.DataFrame]:
-        """Fetch historical metrics from Prometheus"""
+        """Fetch historical metrics (last 48h) via the local cache, requesting only new samples"""
         try:
-            import requests
-
-            prometheus_url = os.getenv("PROMETHEUS_URL", "http://localhost:9090")
-
-            # Query last 48 hours
-            queries = {
-                'cpu_usage': 'avg(cpu_usage_percent)',
-                'memory_usage': 'avg(memory_usage_percent)',
-                'p95_latency': 'histogram_quantile(0.95, http_request_duration_ms)',
-                'p99_latency': 'histogram_quantile(0.99, http_request_duration_ms)',
-                'error_rate': 'sum(rate(http_requests_total{status=~"5.."}[5m]))',
-                'request_rate': 'sum(rate(http_requests_total[5m]))',
-                'database_query_time': 'avg(database_query_duration_ms)'
-            }
-
-            end = datetime.utcnow()
-            start = end - timedelta(hours=48)
-
-            data = []
-
-            for metric_name, query in queries.items():
-                response = requests.get(
-                    f"{prometheus_url}/api/v1/query_range",
-                    params={
-                        'query': query,
-                        'start': start.timestamp(),
-                        'end': end.timestamp(),
-                        'step': '30m'
-                    },
-                    timeout=10
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if result['status'] == 'success' and result['data']['result']:
-                        values = result['data']['result'][0]['values']
-                        for timestamp, value in values:
-                            data.append({
-                                'timestamp': datetime.fromtimestamp(timestamp),
-                                metric_name: float(value)
-                            })
-
-            if not data:
-                return None
-
-            df = pd.DataFrame(data)
-            df = df.groupby('timestamp').first().reset_index()
-            df = df.sort_values('timestamp')
-
-            return df
+            return self.history_loader.fetch(hours=48)
 
         except Exception as e:
             logger.error(f"Failed to fetch historical metrics: {e}")
@@ -692,43 +832,57 @@ class ForecastEngine:
 
     def _train_lstm(self, df: pd.DataFrame) -> float:
         """Train LSTM model"""
-        # Prepare sequences
-        feature_cols = ['cpu_usage', 'memory_usage', 'p95_latency', 'error_rate', 'request_rate']
-        data = df[feature_cols].values
-
-        # Normalize
-        data_scaled = self.scaler.fit_transform(data)
-
-        # Create sequences
-        X, y = [], []
-        for i in range(len(data_scaled) - self.window_size - 1):
-            X.append(data_scaled[i:i + self.window_size])
-            y.append(data_scaled[i + self.window_size])
-
-        X = np.array(X)
-        y = np.array(y)
+        feature_cols = self.lstm_features
+        keras, layers = _import_keras()
 
         # Build model if not exists
-        if self.lstm_model is None:
+        if self.lstm_model is None and not self._load_keras_lstm():
             self.lstm_model = keras.Sequential([
                 layers.LSTM(64, activation='relu', input_shape=(self.window_size, len(feature_cols))),
                 layers.Dropout(0.2),
                 layers.Dense(32, activation='relu'),
-                layers.Dense(len(feature_cols))
+                layers.Dense(len(feature_cols) * self.lstm_horizon)
             ])
 
             self.lstm_model.compile(optimizer='adam', loss='mse', metrics=['mae'])
 
+        # Normalize (one set of statistics across services)
+        series = self._lstm_series(df)
+        last_timestamp = pd.to_datetime(df['timestamp']).max() if 'timestamp' in df.columns else None
+        self.feature_store.fit(np.concatenate(series), last_timestamp)
+
+        # Windowed dataset (strided views, mini-batches gathered per step)
+        dataset = WindowDataset(
+            [self.feature_store.transform(values) for values in series],
+            self.window_size,
+            horizon=self._lstm_model_horizon(),
+            batch_size=32,
+            shuffle=True
+        )
+        train, val = dataset.split(0.2)
+
         # Train
         history = self.lstm_model.fit(
-            X, y,
+            train.to_keras(keras),
+            validation_data=val.to_keras(keras) if len(val) else None,
             epochs=50,
-            batch_size=32,
-            validation_split=0.2,
             verbose=0
         )
 
-        return float(history.history['val_loss'][-1])
+        losses = history.history.get('val_loss') or history.history['loss']
+        return float(losses[-1])
+
+    def _lstm_series(self, df: pd.DataFrame) -> List[np.ndarray]:
+        """LSTM feature arrays, one per service when a `service` column is present"""
+        if 'service' in df.columns:
+            return [group[self.lstm_features].values for _, group in df.groupby('service', sort=False)]
+        return [df[self.lstm_features].values]
+
+    def _lstm_model_horizon(self) -> int:
+        """Steps per forward pass of the resident Keras LSTM"""
+        if self.lstm_model is None:
+            return self.lstm_horizon
+        return max(1, int(self.lstm_model.output_shape[-1]) // len(self.lstm_features))
 
     def _train_prophet(self, df: pd.DataFrame) -> Dict[str, float]:
         """Train Prophet models"""
@@ -740,47 +894,31 @@ class ForecastEngine:
                 'y': df[metric_name]
             })
 
-            model = Prophet(daily_seasonality=True, weekly_seasonality=True)
-            model.fit(prophet_df)
+            model, mode = self.prophet_trainer.fit(
+                metric_name,
+                prophet_df,
+                daily_seasonality=True,
+                weekly_seasonality=True
+            )
 
             self.prophet_models[metric_name] = model
             metrics[f'prophet_{metric_name}_trained'] = 1.0
+            metrics[f'prophet_{metric_name}_warm_start'] = 1.0 if mode == 'warm_start' else 0.0
 
         return metrics
 
     def _train_gbdt(self, df: pd.DataFrame) -> float:
         """Train GBDT classifier"""
-        # Create labels based on thresholds
+        # Create labels based on thresholds (see GBDT_CLASSES)
         df['label'] = 0  # Normal
         df.loc[df['cpu_usage'] > 85, 'label'] = 1  # CPU overload
         df.loc[df['memory_usage'] > 85, 'label'] = 2  # Memory exhaustion
         df.loc[df['p95_latency'] > 400, 'label'] = 3  # Latency spike
         df.loc[df['error_rate'] > 5, 'label'] = 4  # Error surge
 
-        # Prepare features
-        X = []
-        y = df['label'].values
-
-        for idx in range(20, len(df)):
-            features = self._extract_features(
-                Metrics(
-                    timestamp=df.iloc[idx]['timestamp'],
-                    cpu_usage=df.iloc[idx]['cpu_usage'],
-                    memory_usage=df.iloc[idx]['memory_usage'],
-                    p95_latency=df.iloc[idx]['p95_latency'],
-                    p99_latency=df.iloc[idx].get('p99_latency', df.iloc[idx]['p95_latency']),
-                    error_rate=df.iloc[idx]['error_rate'],
-                    request_rate=df.iloc[idx].get('request_rate', 100),
-                    database_query_time=df.iloc[idx].get('database_query_time', 50),
-                    active_instances=1,
-                    current_cost=30.0
-                ),
-                df.iloc[:idx]
-            )
-            X.append(features)
-
-        X = np.array(X)
-        y = y[20:]
+        # Prepare features (one vectorized pass; first 20 rows lack a full window)
+        X = rolling_feature_matrix(df, window=20).values[20:]
+        y = df['label'].values[20:]
 
         # Train
         self.gbdt_model = xgb.XGBClassifier(n_estimators=100, max_depth=6, learning_rate=0.1)
@@ -795,13 +933,13 @@ class ForecastEngine:
         try:
             if self.lstm_model and TENSORFLOW_AVAILABLE:
                 self.lstm_model.save(str(self.models_dir / "lstm_model.h5"))
+                self._export_lstm()
 
             if self.gbdt_model and XGBOOST_AVAILABLE:
                 with open(self.models_dir / "gbdt_model.pkl", 'wb') as f:
                     pickle.dump(self.gbdt_model, f)
 
-            with open(self.models_dir / "scaler.pkl", 'wb') as f:
-                pickle.dump(self.scaler, f)
+            self.feature_store.save()
 
             logger.info("✓ Models saved to disk")
 
@@ -826,25 +964,19 @@ class ForecastEngine:
         try:
             logger.info(f"📈 Incrementally updating Prophet model for {metric_name}")
 
-            # Get or create Prophet model for this metric
-            if metric_name not in self.prophet_models:
-                self.prophet_models[metric_name] = Prophet(
-                    daily_seasonality=True,
-                    weekly_seasonality=True,
-                    changepoint_prior_scale=0.05
-                )
-
-            model = self.prophet_models[metric_name]
-
-            # Fit on new data (Prophet handles incremental updates internally)
-            model.fit(new_data)
-
-            # Save updated model
-            model_path = self.models_dir / f"prophet_{metric_name}.pkl"
-            with open(model_path, 'wb') as f:
-                pickle.dump(model, f)
+            # Prophet models can only be fit once, so "incremental" means a new
+            # fit warm-started from the previous parameters (or skipped entirely
+            # when the data fingerprint is unchanged)
+            model, mode = self.prophet_trainer.fit(
+                metric_name,
+                new_data,
+                daily_seasonality=True,
+                weekly_seasonality=True,
+                changepoint_prior_scale=0.05
+            )
+            self.prophet_models[metric_name] = model
 
-            logger.info(f"✓ Prophet model updated for {metric_name}")
+            logger.info(f"✓ Prophet model updated for {metric_name} ({mode})")
             return True
 
         except Exception as e:
@@ -861,34 +993,38 @@ class ForecastEngine:
         Returns:
             True if fine-tuning succeeded
         """
-        if not TENSORFLOW_AVAILABLE or self.lstm_model is None or not self.online_learning_enabled:
+        if not TENSORFLOW_AVAILABLE or not self.online_learning_enabled:
             return False
 
         try:
+            if self.lstm_model is None and not self._load_keras_lstm():
+                return False
+
             logger.info("🧠 Fine-tuning LSTM model with recent data")
 
-            # Prepare mini-batch
-            X, y = self._prepare_lstm_training_data(recent_data)
+            # Prepare mini-batches
+            dataset = self._prepare_lstm_training_data(recent_data, horizon=self._lstm_model_horizon())
 
-            if X is None or len(X) < self.mini_batch_size:
+            if dataset is None or len(dataset) < self.mini_batch_size:
                 logger.warning("Insufficient data for LSTM fine-tuning")
                 return False
 
             # Fine-tune with low learning rate
+            keras, _ = _import_keras()
             optimizer = keras.optimizers.Adam(learning_rate=0.0001)
             self.lstm_model.compile(optimizer=optimizer, loss='mse', metrics=['mae'])
 
             # Train for a few epochs
             history = self.lstm_model.fit(
-                X, y,
+                dataset.to_keras(keras),
                 epochs=self.fine_tune_epochs,
-                batch_size=self.mini_batch_size,
                 verbose=0
             )
 
             # Save updated model
             model_path = self.models_dir / "lstm_model.h5"
             self.lstm_model.save(str(model_path))
+            self._export_lstm()
 
             final_loss = history.history['loss'][-1]
             logger.info(f"✓ LSTM fine-tuned (loss: {final_loss:.4f})")
@@ -899,38 +1035,31 @@ class ForecastEngine:
             logger.error(f"LSTM fine-tuning failed: {e}")
             return False
 
-    def _prepare_lstm_training_data(self, data: pd.DataFrame) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
-        """Prepare training data for LSTM from recent observations"""
+    def _prepare_lstm_training_data(self, data: pd.DataFrame, horizon: int = 1) -> Optional[WindowDataset]:
+        """Windowed, normalized LSTM training data from recent observations"""
         try:
-            # Extract feature columns
-            feature_cols = ['cpu_usage', 'memory_usage', 'p95_latency', 'error_rate']
-            available_cols = [col for col in feature_cols if col in data.columns]
-
-            if not available_cols:
-                return None, None
-
-            # Create sequences
-            values = data[available_cols].values
-            sequences = []
-            targets = []
+            if not all(col in data.columns for col in self.lstm_features):
+                return None
 
-            for i in range(len(values) - self.window_size - 1):
-                seq = values[i:i + self.window_size]
-                target = values[i + self.window_size]
-                sequences.append(seq)
-                targets.append(target)
+            series = self._lstm_series(data)
 
-            if not sequences:
-                return None, None
+            # Running statistics, extended with any samples not seen yet
+            if self.feature_store.update_from_frame(data):
+                self.feature_store.save()
 
-            X = np.array(sequences)
-            y = np.array(targets)
+            dataset = WindowDataset(
+                [self.feature_store.transform(values) for values in series],
+                self.window_size,
+                horizon=horizon,
+                batch_size=self.mini_batch_size,
+                shuffle=True
+            )
 
-            return X, y
+            return dataset if len(dataset) else None
 
         except Exception as e:
             logger.debug(f"LSTM data preparation error: {e}")
-            return None, None
+            return None
 
     def optimize_ensemble_weights(self) -> None:
         """
@@ -938,20 +1067,17 @@ class ForecastEngine:
 
         Uses recent accuracy to adjust weights dynamically.
         """
-        if not self.accuracy_tracker['lstm'] or not self.online_learning_enabled:
+        if self.prediction_log.accuracy('lstm') is None or not self.online_learning_enabled:
             return
 
         try:
             logger.info("⚖️  Optimizing ensemble weights")
 
-            # Calculate recent accuracy for each model
+            # Calculate recent accuracy for each model (last 10 predictions)
             accuracies = {}
             for model_name in ['lstm', 'prophet', 'gbdt']:
-                recent_acc = self.accuracy_tracker[model_name][-10:]  # Last 10 predictions
-                if recent_acc:
-                    accuracies[model_name] = np.mean(recent_acc)
-                else:
-                    accuracies[model_name] = 0.5  # Default
+                recent_acc = self.prediction_log.accuracy(model_name, last=10)
+                accuracies[model_name] = recent_acc if recent_acc is not None else 0.5  # Default
 
             # Normalize to sum to 1.0 (softmax-like)
             total = sum(accuracies.values())
@@ -984,31 +1110,23 @@ class ForecastEngine:
             return
 
         try:
-            # Calculate accuracy (1.0 if correct, 0.0 if wrong)
-            predicted_positive = prediction.probability > 0.70
-            accuracy = 1.0 if predicted_positive == actual_incident else 0.0
-
-            # Record accuracy by model source
-            model_source = prediction.model_source.lower()
-            if model_source in self.accuracy_tracker:
-                self.accuracy_tracker[model_source].append(accuracy)
-
-                # Keep only last 100 predictions
-                if len(self.accuracy_tracker[model_source]) > 100:
-                    self.accuracy_tracker[model_source] = self.accuracy_tracker[model_source][-100:]
-
-            # Store prediction history
-            self.prediction_history.append({
-                'timestamp': prediction.timestamp,
-                'incident_type': prediction.incident_type,
-                'probability': prediction.probability,
-                'actual': actual_incident,
-                'accuracy': accuracy,
-                'model': prediction.model_source
-            })
+            try:
+                timestamp = pd.Timestamp(prediction.timestamp).timestamp()
+            except (TypeError, ValueError):
+                timestamp = time.time()
+
+            # Store outcome (accuracy is derived: (probability > 0.70) == actual)
+            self.prediction_log.append(
+                timestamp,
+                prediction.incident_type,
+                prediction.probability,
+                actual_incident,
+                prediction.model_source
+            )
 
             # Trigger ensemble weight optimization if we have enough data
-            if len(self.prediction_history) % 20 == 0:
+            if self.prediction_log.total % 20 == 0:
+                self.prediction_log.flush()
                 self.optimize_ensemble_weights()
 
         except Exception as e:
@@ -1024,18 +1142,9 @@ class ForecastEngine:
         drift_scores = {}
 
         try:
-            for model_name, accuracies in self.accuracy_tracker.items():
-                if len(accuracies) < 20:
-                    drift_scores[model_name] = 0.0
-                    continue
-
-                # Compare recent accuracy to historical accuracy
-                recent = np.mean(accuracies[-10:])
-                historical = np.mean(accuracies[:-10])
-
-                # Drift = absolute difference in accuracy
-                drift = abs(recent - historical)
-                drift_scores[model_name] = drift
+            for model_name in ['lstm', 'prophet', 'gbdt']:
+                # Drift = |last 10 accuracy - accuracy of the 90 before|
+                drift_scores[model_name] = self.prediction_log.drift(model_name, recent=10, history=100)
 
             # Log significant drift
             for model_name, drift in drift_scores.items():
@@ -1047,6 +1156,21 @@ class ForecastEngine:
 
         return drift_scores
 
+    def get_calibration_stats(self, last: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Reliability of predicted probabilities per model source.
+
+        Args:
+            last: Only the last N recorded outcomes per model (default: all held)
+
+        Returns:
+            Dict of model -> calibration stats (bins, ECE, Brier score)
+        """
+        return {
+            model_name: self.prediction_log.calibration(model_name, last=last)
+            for model_name in ['lstm', 'prophet', 'gbdt', 'ensemble']
+        }
+
     def trigger_online_learning(self, recent_metrics: pd.DataFrame) -> Dict[str, bool]:
         """
         Trigger online learning update for all models.
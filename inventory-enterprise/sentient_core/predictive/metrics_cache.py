@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Cached Prometheus History Loader
+
+Local time-series cache for the Forecast Engine's historical metrics.
+
+- SQLite store, one (metric, ts) -> value row per sample (WITHOUT ROWID, clustered by metric/ts)
+- Delta fetch: only the range since the last cached sample is requested
+- Concurrent query_range calls over a pooled requests.Session
+- Aligned frame assembled from NumPy arrays (no per-point dicts / groupby)
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Forecast Engine history queries (metric name -> PromQL)
+DEFAULT_QUERIES = {
+    'cpu_usage': 'avg(cpu_usage_percent)',
+    'memory_usage': 'avg(memory_usage_percent)',
+    'p95_latency': 'histogram_quantile(0.95, http_request_duration_ms)',
+    'p99_latency': 'histogram_quantile(0.99, http_request_duration_ms)',
+    'error_rate': 'sum(rate(http_requests_total{status=~"5.."}[5m]))',
+    'request_rate': 'sum(rate(http_requests_total[5m]))',
+    'database_query_time': 'avg(database_query_duration_ms)'
+}
+
+
+class PrometheusHistoryLoader:
+    """
+    Delta-fetching, cached loader for Prometheus range queries.
+
+    Samples are stored on the query step grid (timestamps are multiples of
+    step_seconds), so a new fetch starts at the last cached timestamp and
+    lines up with what is already stored. The last cached point is always
+    re-requested because Prometheus may still revise the newest sample.
+    """
+
+    def __init__(
+        self,
+        cache_path: Path,
+        prometheus_url: Optional[str] = None,
+        queries: Optional[Dict[str, str]] = None,
+        step_seconds: int = 1800,
+        retention_hours: int = 7 * 24,
+        timeout: float = 10.0,
+        max_workers: int = 8
+    ):
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.prometheus_url = prometheus_url or os.getenv("PROMETHEUS_URL", "http://localhost:9090")
+        self.queries = dict(queries or DEFAULT_QUERIES)
+        self.step_seconds = int(step_seconds)
+        self.retention_hours = retention_hours
+        self.timeout = timeout
+        self.max_workers = max_workers
+
+        self._session = None
+        self._lock = threading.Lock()
+
+        # Fetch accounting (points downloaded vs served from cache)
+        self.stats = {
+            'fetches': 0,
+            'queries': 0,
+            'query_errors': 0,
+            'points_fetched': 0,
+            'last_fetch_ms': 0.0
+        }
+
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection (one per call; sqlite3 connections aren't shared across threads)"""
+        conn = sqlite3.connect(str(self.cache_path), timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_db(self) -> None:
+        """Create the samples table"""
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS samples (
+                    metric TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (metric, ts)
+                ) WITHOUT ROWID
+            """)
+
+    def _get_session(self):
+        """Pooled HTTP session shared by all metric queries"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+
+        return self._session
+
+    def last_timestamps(self) -> Dict[str, int]:
+        """Newest cached timestamp per metric"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT metric, MAX(ts) FROM samples GROUP BY metric").fetchall()
+        return {metric: int(ts) for metric, ts in rows}
+
+    def fetch(self, hours: int = 48, end: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """
+        Return the aligned history frame for the last `hours`, fetching only the delta.
+
+        Args:
+            hours: Lookback window
+            end: Window end (unix seconds, default now)
+
+        Returns:
+            DataFrame with a `timestamp` column plus one column per metric, or None if empty
+        """
+        started = time.perf_counter()
+
+        end_ts = int(end if end is not None else time.time())
+        end_ts -= end_ts % self.step_seconds
+        window_start = end_ts - hours * 3600
+
+        last = self.last_timestamps()
+        ranges = {
+            metric: (max(window_start, last.get(metric, window_start)), end_ts)
+            for metric in self.queries
+        }
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='prom-history') as pool:
+            results = list(pool.map(lambda item: self._query_range(item[0], *item[1]), ranges.items()))
+
+        rows = [row for batch in results for row in batch]
+        if rows:
+            with self._connect() as conn:
+                conn.executemany("INSERT OR REPLACE INTO samples (metric, ts, value) VALUES (?, ?, ?)", rows)
+
+        self._prune(end_ts)
+
+        df = self.load(window_start, end_ts)
+
+        with self._lock:
+            self.stats['fetches'] += 1
+            self.stats['points_fetched'] += len(rows)
+            self.stats['last_fetch_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+        return df
+
+    def _query_range(self, metric: str, start_ts: int, end_ts: int) -> List[Tuple[str, int, float]]:
+        """Run one query_range call; returns (metric, ts, value) rows"""
+        with self._lock:
+            self.stats['queries'] += 1
+
+        try:
+            response = self._get_session().get(
+                f"{self.prometheus_url}/api/v1/query_range",
+                params={
+                    'query': self.queries[metric],
+                    'start': start_ts,
+                    'end': end_ts,
+                    'step': self.step_seconds
+                },
+                timeout=self.timeout
+            )
+
+            if response.status_code != 200:
+                raise RuntimeError(f"HTTP {response.status_code}")
+
+            result = response.json()
+            if result.get('status') != 'success' or not result['data']['result']:
+                return []
+
+            rows = []
+            for timestamp, value in result['data']['result'][0]['values']:
+                value = float(value)
+                if np.isfinite(value):
+                    rows.append((metric, int(float(timestamp)), value))
+            return rows
+
+        except Exception as e:
+            with self._lock:
+                self.stats['query_errors'] += 1
+            logger.warning(f"History query failed for {metric}: {e}")
+            return []
+
+    def load(self, start_ts: int, end_ts: int) -> Optional[pd.DataFrame]:
+        """
+        Build the aligned frame for [start_ts, end_ts] from the cache.
+
+        Each metric is read as two arrays and scattered into a shared
+        timestamp grid with searchsorted; timestamps a metric lacks are NaN.
+        """
+        series: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+        with self._connect() as conn:
+            for metric in self.queries:
+                rows = conn.execute(
+                    "SELECT ts, value FROM samples WHERE metric = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                    (metric, start_ts, end_ts)
+                ).fetchall()
+                if rows:
+                    arr = np.array(rows, dtype=np.float64)
+                    series[metric] = (arr[:, 0].astype(np.int64), arr[:, 1])
+
+        if not series:
+            return None
+
+        timestamps = np.unique(np.concatenate([ts for ts, _ in series.values()]))
+
+        columns = {'timestamp': pd.to_datetime(timestamps, unit='s')}
+        for metric, (ts, values) in series.items():
+            column = np.full(len(timestamps), np.nan)
+            column[np.searchsorted(timestamps, ts)] = values
+            columns[metric] = column
+
+        return pd.DataFrame(columns)
+
+    def _prune(self, end_ts: int) -> None:
+        """Drop samples older than the retention window"""
+        cutoff = end_ts - self.retention_hours * 3600
+        with self._connect() as conn:
+            conn.execute("DELETE FROM samples WHERE ts < ?", (cutoff,))
+
+    def close(self) -> None:
+        """Release pooled HTTP connections"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Prediction Outcome Log
+
+Fixed-capacity ring buffer of prediction outcomes for the Forecast Engine.
+
+- Struct-of-arrays columns (timestamp, incident type, probability, actual, model)
+- O(1) append, oldest records overwritten once full
+- Vectorized windowed accuracy, drift and calibration statistics
+- Backed by a memory-mapped file, so history survives restarts without parsing
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INCIDENT_TYPES = [
+    'cpu_overload',
+    'memory_exhaustion',
+    'latency_spike',
+    'error_surge',
+    'cost_overrun',
+    'unknown_incident'
+]
+
+MODELS = ['lstm', 'prophet', 'gbdt', 'ensemble']
+
+# File layout: int64 header [magic, version, capacity, count], then one
+# contiguous region per column
+_MAGIC = 0x4E50_4C4F47  # "NPLOG"
+_VERSION = 1
+_HEADER_BYTES = 4 * 8
+_COLUMNS = [
+    ('timestamp', np.float64),
+    ('incident', np.int16),
+    ('probability', np.float32),
+    ('actual', np.int8),
+    ('model', np.int8)
+]
+
+
+def model_code(model_source: str) -> int:
+    """Model column code for a Prediction.model_source ('LSTM', 'Ensemble(2 models)', ...)"""
+    source = model_source.lower()
+    if source.startswith('ensemble'):
+        return MODELS.index('ensemble')
+    return MODELS.index(source) if source in MODELS else -1
+
+
+def incident_code(incident_type: str) -> int:
+    """Incident column code (-1 for types outside INCIDENT_TYPES)"""
+    return INCIDENT_TYPES.index(incident_type) if incident_type in INCIDENT_TYPES else -1
+
+
+class PredictionLog:
+    """
+    Memory-mapped ring buffer of (timestamp, incident, probability, actual, model).
+
+    A prediction counts as correct when (probability > threshold) == actual,
+    matching the engine's 70% action threshold.
+    """
+
+    def __init__(self, path: Path, capacity: int = 10000, threshold: float = 0.70):
+        self.path = Path(path)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._open(int(capacity))
+
+    def _open(self, capacity: int) -> None:
+        """Map the file, (re)creating it if missing or laid out differently"""
+        size = _HEADER_BYTES + sum(np.dtype(dtype).itemsize * capacity for _, dtype in _COLUMNS)
+
+        fresh = True
+        if self.path.exists() and self.path.stat().st_size == size:
+            header = np.memmap(self.path, dtype=np.int64, mode='r', shape=(4,))
+            fresh = not (header[0] == _MAGIC and header[1] == _VERSION and header[2] == capacity)
+            del header
+
+        if fresh:
+            if self.path.exists():
+                logger.warning(f"Prediction log layout changed, starting a new log at {self.path}")
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'wb') as f:
+                f.truncate(size)
+
+        self._header = np.memmap(self.path, dtype=np.int64, mode='r+', shape=(4,))
+        if fresh:
+            self._header[:] = [_MAGIC, _VERSION, capacity, 0]
+
+        self.capacity = capacity
+        self.columns: Dict[str, np.memmap] = {}
+        offset = _HEADER_BYTES
+        for name, dtype in _COLUMNS:
+            self.columns[name] = np.memmap(self.path, dtype=dtype, mode='r+', offset=offset, shape=(capacity,))
+            offset += np.dtype(dtype).itemsize * capacity
+
+    @property
+    def total(self) -> int:
+        """Records ever appended"""
+        return int(self._header[3])
+
+    def __len__(self) -> int:
+        """Records currently held"""
+        return min(self.total, self.capacity)
+
+    def append(self, timestamp: float, incident_type: str, probability: float, actual: bool, model_source: str) -> None:
+        """Append one outcome (overwrites the oldest record when full)"""
+        with self._lock:
+            slot = self.total % self.capacity
+            self.columns['timestamp'][slot] = timestamp
+            self.columns['incident'][slot] = incident_code(incident_type)
+            self.columns['probability'][slot] = probability
+            self.columns['actual'][slot] = int(bool(actual))
+            self.columns['model'][slot] = model_code(model_source)
+            self._header[3] += 1
+
+    def flush(self) -> None:
+        """Write dirty pages to disk"""
+        self._header.flush()
+        for column in self.columns.values():
+            column.flush()
+
+    def _slots(self) -> np.ndarray:
+        """Buffer positions of held records, oldest first"""
+        total = self.total
+        return np.arange(total - len(self), total) % self.capacity
+
+    def records(self, model: Optional[str] = None, last: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Chronological column arrays (copies), optionally for one model and the last N of its records.
+        """
+        slots = self._slots()
+        if model is not None:
+            slots = slots[self.columns['model'][slots] == MODELS.index(model)]
+        if last is not None:
+            slots = slots[-last:] if last > 0 else slots[:0]
+
+        return {name: np.asarray(column[slots]) for name, column in self.columns.items()}
+
+    def correct(self, records: Dict[str, np.ndarray]) -> np.ndarray:
+        """Per-record correctness (1.0 / 0.0)"""
+        return ((records['probability'] > self.threshold) == records['actual'].astype(bool)).astype(np.float64)
+
+    def accuracy(self, model: Optional[str] = None, last: Optional[int] = None) -> Optional[float]:
+        """Mean correctness over the last N records (None if there are none)"""
+        records = self.records(model, last)
+        if len(records['probability']) == 0:
+            return None
+        return float(self.correct(records).mean())
+
+    def drift(self, model: str, recent: int = 10, history: int = 100, min_records: int = 20) -> float:
+        """
+        |accuracy(last `recent`) - accuracy(the `history - recent` before)| for one model.
+
+        Returns 0.0 with fewer than `min_records` records.
+        """
+        correct = self.correct(self.records(model, history))
+        if len(correct) < min_records:
+            return 0.0
+        return float(abs(correct[-recent:].mean() - correct[:-recent].mean()))
+
+    def calibration(self, model: Optional[str] = None, bins: int = 10, last: Optional[int] = None) -> Dict:
+        """
+        Reliability statistics: per-bin mean predicted probability vs observed
+        incident rate, expected calibration error and Brier score.
+        """
+        records = self.records(model, last)
+        probability = records['probability'].astype(np.float64)
+        actual = records['actual'].astype(np.float64)
+        n = len(probability)
+        if n == 0:
+            return {'count': 0}
+
+        edges = np.linspace(0.0, 1.0, bins + 1)
+        bin_idx = np.clip(np.digitize(probability, edges[1:-1]), 0, bins - 1)
+        counts = np.bincount(bin_idx, minlength=bins)
+        predicted_sum = np.bincount(bin_idx, weights=probability, minlength=bins)
+        observed_sum = np.bincount(bin_idx, weights=actual, minlength=bins)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            predicted = predicted_sum / counts
+            observed = observed_sum / counts
+
+        populated = counts > 0
+        ece = float(np.sum(counts[populated] * np.abs(predicted[populated] - observed[populated])) / n)
+
+        return {
+            'count': n,
+            'bin_edges': edges.tolist(),
+            'bin_counts': counts.tolist(),
+            'mean_predicted': np.where(populated, predicted, np.nan).tolist(),
+            'observed_rate': np.where(populated, observed, np.nan).tolist(),
+            'ece': ece,
+            'brier': float(np.mean((probability - actual) ** 2))
+        }
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Sliding-Window LSTM Dataset
+
+Training windows for the Forecast Engine LSTM without materialising them.
+
+- Windows and targets are strided views (sliding_window_view), not copies
+- Mini-batches are gathered on demand, so only batch_size windows exist at once
+- Multi-horizon targets: next `horizon` steps, flattened to features × horizon
+- Multiple services: one series per service, windows never cross a service boundary
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import logging
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class WindowDataset:
+    """
+    Sliding-window (X, y) dataset over one or more (timesteps, features) series.
+
+    Sample k of a series is X = series[k:k + window_size] and
+    y = series[k + window_size:k + window_size + horizon], flattened to
+    (horizon × features,), which is the layout a Dense(features × horizon)
+    head and lstm_inference.rollout() expect.
+    """
+
+    def __init__(
+        self,
+        series: Sequence[np.ndarray],
+        window_size: int,
+        horizon: int = 1,
+        batch_size: int = 32,
+        shuffle: bool = False,
+        seed: Optional[int] = None
+    ):
+        self.window_size = int(window_size)
+        self.horizon = max(1, int(horizon))
+        self.batch_size = int(batch_size)
+        self.shuffle = shuffle
+        self._rng = np.random.default_rng(seed)
+
+        self.series: List[np.ndarray] = []
+        self._windows: List[np.ndarray] = []
+        self._targets: List[np.ndarray] = []
+        index = []
+
+        for data in series:
+            data = np.ascontiguousarray(data, dtype=np.float32)
+            if data.ndim != 2:
+                raise ValueError(f"Expected (timesteps, features) series, got shape {data.shape}")
+
+            n_samples = len(data) - self.window_size - self.horizon + 1
+            if n_samples <= 0:
+                continue
+
+            service = len(self.series)
+            self.series.append(data)
+
+            # (n, features, window) views -> (n, window, features), still views
+            self._windows.append(
+                sliding_window_view(data, self.window_size, axis=0)[:n_samples].transpose(0, 2, 1)
+            )
+            self._targets.append(
+                sliding_window_view(data[self.window_size:], self.horizon, axis=0).transpose(0, 2, 1)
+            )
+            index.append(np.stack([np.full(n_samples, service), np.arange(n_samples)], axis=1))
+
+        self.n_features = int(self.series[0].shape[1]) if self.series else 0
+        self._index = np.concatenate(index) if index else np.empty((0, 2), dtype=np.int64)
+        self._order = np.arange(len(self._index))
+
+    def __len__(self) -> int:
+        """Number of (X, y) samples"""
+        return len(self._index)
+
+    @property
+    def n_batches(self) -> int:
+        return -(-len(self) // self.batch_size)
+
+    @property
+    def target_dim(self) -> int:
+        return self.n_features * self.horizon
+
+    def batch(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Gather mini-batch i (only these windows are copied)"""
+        rows = self._index[self._order[i * self.batch_size:(i + 1) * self.batch_size]]
+        return self._gather(rows)
+
+    def batches(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Iterate over one epoch of mini-batches"""
+        if self.shuffle:
+            self.reshuffle()
+        for i in range(self.n_batches):
+            yield self.batch(i)
+
+    def reshuffle(self) -> None:
+        """New sample order (no-op unless shuffle=True)"""
+        if self.shuffle:
+            self._rng.shuffle(self._order)
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Materialise every sample (small datasets / debugging only)"""
+        return self._gather(self._index)
+
+    def split(self, validation_fraction: float) -> Tuple["WindowDataset", "WindowDataset"]:
+        """
+        Chronological train/validation split: the last fraction of every
+        service's samples goes to validation (like Keras validation_split).
+        """
+        train_rows, val_rows = [], []
+
+        for service in range(len(self.series)):
+            rows = self._index[self._index[:, 0] == service]
+            n_val = int(len(rows) * validation_fraction)
+            train_rows.append(rows[:len(rows) - n_val])
+            val_rows.append(rows[len(rows) - n_val:])
+
+        return self._subset(train_rows), self._subset(val_rows, shuffle=False)
+
+    def to_keras(self, keras):
+        """Wrap as a keras.utils.Sequence (PyDataset on Keras 3), reshuffled per epoch"""
+        dataset = self
+
+        class _WindowSequence(keras.utils.Sequence):
+            def __init__(self):
+                super().__init__()
+                dataset.reshuffle()
+
+            def __len__(self):
+                return dataset.n_batches
+
+            def __getitem__(self, i):
+                return dataset.batch(i)
+
+            def on_epoch_end(self):
+                dataset.reshuffle()
+
+        return _WindowSequence()
+
+    def _gather(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Copy the windows/targets for (service, start) rows into dense arrays"""
+        X = np.empty((len(rows), self.window_size, self.n_features), dtype=np.float32)
+        y = np.empty((len(rows), self.horizon, self.n_features), dtype=np.float32)
+
+        for service in np.unique(rows[:, 0]):
+            mask = rows[:, 0] == service
+            starts = rows[mask, 1]
+            X[mask] = self._windows[service][starts]
+            y[mask] = self._targets[service][starts]
+
+        return X, y.reshape(len(rows), self.target_dim)
+
+    def _subset(self, rows: List[np.ndarray], shuffle: Optional[bool] = None) -> "WindowDataset":
+        """Dataset sharing this one's views, restricted to the given rows"""
+        subset = WindowDataset.__new__(WindowDataset)
+        subset.__dict__.update(self.__dict__)
+        subset.shuffle = self.shuffle if shuffle is None else shuffle
+        subset._rng = np.random.default_rng(self._rng.integers(1 << 32))
+        subset._index = np.concatenate(rows) if rows else np.empty((0, 2), dtype=np.int64)
+        subset._order = np.arange(len(subset._index))
+        return subset
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Prometheus Collector Benchmark
+
+Runs the Ops Brain metric queries against a local fake Prometheus and
+compares sequential requests.get calls with the concurrent collector
+(cold and cached), then checks deadline / failure accounting with one
+slow and one failing query.
+
+Usage:
+    python3 sentient_core/scripts/benchmark_collector.py --repeats 10 --latency-ms 25
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import requests
+
+# Add sentient_core/scripts and the project root to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fake_prometheus import FakePrometheus
+from ai_ops.prometheus_collector import PrometheusCollector
+
+QUERIES = {
+    'cpu_usage': 'avg(process_cpu_percent{environment="production"})',
+    'memory_usage': 'avg((process_resident_memory_bytes / 1024 / 1024 / 512) * 100)',
+    'p95_latency': 'histogram_quantile(0.95, rate(http_request_duration_ms_bucket[5m]))',
+    'p99_latency': 'histogram_quantile(0.99, rate(http_request_duration_ms_bucket[5m]))',
+    'error_rate': 'sum(rate(http_requests_total{status=~"5.."}[5m])) / sum(rate(http_requests_total[5m])) * 100',
+    'request_rate': 'sum(rate(http_requests_total[5m]))',
+    'active_instances': 'count(up{job="neuropilot-backend"} == 1)',
+    'database_query_time': 'rate(db_query_duration_ms_sum[5m]) / rate(db_query_duration_ms_count[5m])',
+    'cost_current': 'sum(neuropilot_cost_total)'
+}
+
+
+def _legacy_collect(url: str) -> Dict[str, float]:
+    """Pre-v17.7 collect_metrics(): one fresh requests.get per query, in order"""
+    values = {}
+    for name, query in QUERIES.items():
+        response = requests.get(f"{url}/api/v1/query", params={'query': query}, timeout=10)
+        values[name] = float(response.json()['data']['result'][0]['value'][1])
+    return values
+
+
+def _summary(samples_ms) -> Dict[str, float]:
+    samples = np.asarray(samples_ms)
+    return {'p50_ms': round(float(np.median(samples)), 1), 'max_ms': round(float(samples.max()), 1)}
+
+
+def benchmark(repeats: int, latency_ms: float) -> Dict:
+    results = {}
+
+    with FakePrometheus(latency_ms=latency_ms) as server:
+        legacy, cold, cached = [], [], []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            _legacy_collect(server.url)
+            legacy.append((time.perf_counter() - started) * 1000)
+
+            collector = PrometheusCollector(server.url, staleness_seconds=60)
+            collector.query_many(QUERIES)
+            cold.append(collector.last_collection['elapsed_ms'])
+            collector.query_many(QUERIES)
+            cached.append(collector.last_collection['elapsed_ms'])
+
+        results['sequential'] = _summary(legacy)
+        results['concurrent_cold'] = _summary(cold)
+        results['concurrent_cached'] = _summary(cached)
+
+    # One query slower than the deadline, one failing
+    slow = {'sum(neuropilot_cost_total)': 2000.0}
+    failing = ['db_query_duration_ms_sum']
+    with FakePrometheus(latency_ms=latency_ms, slow_queries=slow, failing_queries=failing) as server:
+        collector = PrometheusCollector(server.url, deadline_seconds=0.5)
+        values = collector.query_many(QUERIES)
+        stats = collector.get_stats()
+        results['degraded'] = {
+            'collection': collector.last_collection,
+            'missing': sorted(name for name, value in values.items() if value is None),
+            'cost_current_stats': stats[QUERIES['cost_current']],
+            'database_query_time_stats': stats[QUERIES['database_query_time']]
+        }
+
+    return results
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Prometheus collector benchmark')
+    parser.add_argument('--repeats', type=int, default=10, help='Timed repetitions')
+    parser.add_argument('--latency-ms', type=float, default=25.0, help='Fake Prometheus latency per request')
+    args = parser.parse_args()
+
+    print(json.dumps(benchmark(args.repeats, args.latency_ms), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Local Prometheus Stand-In
+
+Minimal Prometheus HTTP API for benchmarks and local runs without a cluster.
+Serves deterministic synthetic series (daily sine + noise per query) on
+/api/v1/query and /api/v1/query_range, with optional per-request latency,
+slow queries and failing queries.
+
+Usage:
+    python3 sentient_core/scripts/fake_prometheus.py --port 9090 --latency-ms 25
+    PROMETHEUS_URL=http://127.0.0.1:9090 python3 sentient_core/master_controller.py
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def synthetic_value(query: str, timestamps: np.ndarray) -> np.ndarray:
+    """Deterministic series for a query: level + daily sine + hashed noise"""
+    seed = zlib.crc32(query.encode())
+    level = 20 + seed % 60
+    phase = (seed % 360) * np.pi / 180
+    noise = ((timestamps.astype(np.int64) * 2654435761 + seed) % 1000) / 1000.0 - 0.5
+
+    return level + 10 * np.sin(2 * np.pi * timestamps / 86400 + phase) + noise
+
+
+def parse_duration(value: str) -> float:
+    """Prometheus step: plain seconds ('1800') or a duration ('30m', '1h')"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    value = str(value)
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+class FakePrometheus:
+    """Threaded stand-in server; use as a context manager or call start()/stop()"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        slow_queries: Optional[Dict[str, float]] = None,
+        failing_queries: Optional[List[str]] = None
+    ):
+        self.latency_ms = latency_ms
+        self.slow_queries = slow_queries or {}  # query substring -> extra latency (ms)
+        self.failing_queries = failing_queries or []  # query substrings answered with HTTP 500
+        self.requests = 0
+        self.points_served = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # keep-alive responses are written in two parts
+
+            def do_GET(self):
+                status, body = server._handle(self.path)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakePrometheus":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakePrometheus":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _handle(self, path: str) -> Tuple[int, Dict]:
+        """Route a GET request to the query / query_range handlers"""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        parsed = urlparse(path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        query = params.get('query', '')
+
+        for pattern, extra_ms in self.slow_queries.items():
+            if pattern in query:
+                time.sleep(extra_ms / 1000)
+        if any(pattern in query for pattern in self.failing_queries):
+            self._count(0)
+            return 500, {'status': 'error', 'error': 'injected failure'}
+
+        if parsed.path == '/api/v1/query_range':
+            start = float(params['start'])
+            end = float(params['end'])
+            step = parse_duration(params.get('step', '60'))
+            timestamps = np.arange(start, end + step / 2, step)
+            values = synthetic_value(query, timestamps)
+            result: List = [[float(ts), f"{val:.6f}"] for ts, val in zip(timestamps, values)]
+            self._count(len(result))
+            return 200, {
+                'status': 'success',
+                'data': {'resultType': 'matrix', 'result': [{'metric': {}, 'values': result}]}
+            }
+
+        if parsed.path == '/api/v1/query':
+            now = float(params.get('time', time.time()))
+            value = synthetic_value(query, np.array([now]))[0]
+            self._count(1)
+            return 200, {
+                'status': 'success',
+                'data': {'resultType': 'vector', 'result': [{'metric': {}, 'value': [now, f"{value:.6f}"]}]}
+            }
+
+        return 404, {'status': 'error', 'error': f"unknown endpoint {parsed.path}"}
+
+    def _count(self, points: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.points_served += points
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Local Prometheus stand-in')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address')
+    parser.add_argument('--port', type=int, default=9090, help='Port')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Added latency per request')
+    args = parser.parse_args()
+
+    server = FakePrometheus(args.host, args.port, args.latency_ms)
+    logger.info(f"🛰️  Fake Prometheus listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
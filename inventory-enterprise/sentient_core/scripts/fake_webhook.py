@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Local Webhook Stand-In
+
+Minimal HTTP endpoint standing in for Slack webhooks, the Notion API and
+Grafana annotations in benchmarks and local runs. Records every POST body
+and can add latency, answer with injected status codes (e.g. 500 or 429
+with Retry-After) for the first requests, or fail a path permanently.
+GET serves Prometheus instant queries from registered gauges and /health.
+
+Usage:
+    python3 sentient_core/scripts/fake_webhook.py --port 9911 --latency-ms 200
+    SLACK_WEBHOOK_URL=http://127.0.0.1:9911/slack python3 sentient_core/master_controller.py
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FakeWebhook:
+    """Threaded stand-in server; use as a context manager or call start()/stop()"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        fail_first: Optional[List[int]] = None,
+        failing_paths: Optional[List[str]] = None,
+        retry_after: float = 1.0
+    ):
+        self.latency_ms = latency_ms
+        self.fail_first = list(fail_first or [])  # Status codes answered to the first requests, in order
+        self.failing_paths = failing_paths or []  # Path prefixes always answered with HTTP 400
+        self.retry_after = retry_after
+        self.received: List[Dict] = []  # {'path', 'body', 'at'} per accepted request
+        self.gauges: Dict[str, Callable[[], float]] = {}  # PromQL -> current value
+        self.health_status = 200
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length)
+                status, headers = server._handle(self.path, body)
+                payload = b'ok' if status < 300 else b'error'
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                status, body = server._handle_get(self.path)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_HEAD(self):
+                status, _ = server._handle_get(self.path)
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeWebhook":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeWebhook":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _handle(self, path: str, body: bytes):
+        """Status and extra headers for one POST"""
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        with self._lock:
+            self.requests += 1
+            if any(path.startswith(prefix) for prefix in self.failing_paths):
+                return 400, {}
+            if self.fail_first:
+                status = self.fail_first.pop(0)
+                headers = {'Retry-After': str(self.retry_after)} if status == 429 else {}
+                return status, headers
+
+            try:
+                parsed = json.loads(body or b'null')
+            except ValueError:
+                parsed = body.decode(errors='replace')
+            self.received.append({'path': path, 'body': parsed, 'at': time.time()})
+            return 200, {}
+
+    def _handle_get(self, path: str):
+        """Prometheus instant query (registered gauges) or health endpoint"""
+        url = urlparse(path)
+        if url.path == '/api/v1/query':
+            query = parse_qs(url.query).get('query', [''])[0]
+            gauge = self.gauges.get(query)
+            result = [{'metric': {}, 'value': [time.time(), str(gauge())]}] if gauge else []
+            return 200, {'status': 'success', 'data': {'resultType': 'vector', 'result': result}}
+        if url.path == '/health':
+            return self.health_status, {'status': 'ok' if self.health_status == 200 else 'unhealthy'}
+        return 404, {'error': 'not found'}
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Local webhook stand-in')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address')
+    parser.add_argument('--port', type=int, default=9911, help='Port')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Added latency per request')
+    args = parser.parse_args()
+
+    server = FakeWebhook(args.host, args.port, args.latency_ms)
+    logger.info(f"📮 Fake webhook listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
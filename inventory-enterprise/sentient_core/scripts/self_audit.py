@@ -13,15 +13,24 @@ import json
 import logging
 import os
 import subprocess
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pooled Prometheus collector (concurrency, timeouts, per-query stats)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+try:
+    from ai_ops.prometheus_collector import get_collector
+    COLLECTOR_AVAILABLE = True
+except ImportError:
+    COLLECTOR_AVAILABLE = False
+
 
 class ComplianceScanner:
     """
@@ -471,32 +480,41 @@ class ComplianceScanner:
             logger.error(f"Operations analysis error: {e}")
             return summary
 
+    def _query_prometheus(self, query: str) -> Optional[float]:
+        """Instant query via the pooled collector; None if unavailable or empty"""
+        prometheus_url = os.getenv("PROMETHEUS_URL", "http://localhost:9090")
+
+        if COLLECTOR_AVAILABLE:
+            return get_collector(prometheus_url).query(query)
+
+        import requests
+
+        response = requests.get(
+            f"{prometheus_url}/api/v1/query",
+            params={'query': query},
+            timeout=10
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+            if result['status'] == 'success' and result['data']['result']:
+                return float(result['data']['result'][0]['value'][1])
+
+        return None
+
     def _check_sla_compliance(self) -> Tuple[bool, float]:
         """Check SLA compliance"""
         logger.info("  ▶ Checking SLA compliance...")
 
         try:
-            import requests
-
-            prometheus_url = os.getenv("PROMETHEUS_URL", "http://localhost:9090")
-
             # Query uptime percentage for last 24h
-            query = 'avg_over_time(up{job="backend"}[24h]) * 100'
-
-            response = requests.get(
-                f"{prometheus_url}/api/v1/query",
-                params={'query': query},
-                timeout=10
-            )
+            uptime_percentage = self._query_prometheus('avg_over_time(up{job="backend"}[24h]) * 100')
 
-            if response.status_code == 200:
-                result = response.json()
-                if result['status'] == 'success' and result['data']['result']:
-                    uptime_percentage = float(result['data']['result'][0]['value'][1])
-                    sla_met = uptime_percentage >= self.sla_target
+            if uptime_percentage is not None:
+                sla_met = uptime_percentage >= self.sla_target
 
-                    logger.info(f"    {'✓' if sla_met else '⚠️ '} SLA: {uptime_percentage:.2f}%")
-                    return sla_met, uptime_percentage
+                logger.info(f"    {'✓' if sla_met else '⚠️ '} SLA: {uptime_percentage:.2f}%")
+                return sla_met, uptime_percentage
 
             # Fallback: assume compliant
             logger.warning("    ⚠️  Could not query SLA metrics")
@@ -511,27 +529,14 @@ class ComplianceScanner:
         logger.info("  ▶ Checking cost compliance...")
 
         try:
-            import requests
-
-            prometheus_url = os.getenv("PROMETHEUS_URL", "http://localhost:9090")
-
             # Query current month cost
-            query = 'sum(cost_usd_daily) * 30'
-
-            response = requests.get(
-                f"{prometheus_url}/api/v1/query",
-                params={'query': query},
-                timeout=10
-            )
+            monthly_cost = self._query_prometheus('sum(cost_usd_daily) * 30')
 
-            if response.status_code == 200:
-                result = response.json()
-                if result['status'] == 'success' and result['data']['result']:
-                    monthly_cost = float(result['data']['result'][0]['value'][1])
-                    cost_compliant = monthly_cost <= self.cost_budget
+            if monthly_cost is not None:
+                cost_compliant = monthly_cost <= self.cost_budget
 
-                    logger.info(f"    {'✓' if cost_compliant else '⚠️ '} Cost: ${monthly_cost:.2f}/mo")
-                    return cost_compliant, monthly_cost
+                logger.info(f"    {'✓' if cost_compliant else '⚠️ '} Cost: ${monthly_cost:.2f}/mo")
+                return cost_compliant, monthly_cost
 
             # Fallback
             logger.warning("    ⚠️  Could not query cost metrics")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Cycle Trace Report
+
+Summarizes the NDJSON span file written by sentient_core/tracing.py:
+per-phase count, p50 / p95 / max duration and share of cycle time over the
+last N cycles of each kind (sentient_cycle, engineering_cycle, genesis_cycle).
+
+Usage:
+    python3 sentient_core/scripts/trace_report.py
+    python3 sentient_core/scripts/trace_report.py --cycles 50 --root sentient_cycle
+    python3 sentient_core/scripts/trace_report.py --file logs/sentient/traces.ndjson --json
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Add sentient_core to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tracing import DEFAULT_TRACE_FILE
+
+
+def load_traces(path: Path) -> Dict[str, List[Dict]]:
+    """Group span lines by traceId (file order is preserved)"""
+    traces: Dict[str, List[Dict]] = defaultdict(list)
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line
+            traces[record['traceId']].append(record)
+    return traces
+
+
+def _duration_ms(record: Dict) -> float:
+    return (int(record['endTimeUnixNano']) - int(record['startTimeUnixNano'])) / 1e6
+
+
+def summarize(traces: Dict[str, List[Dict]], cycles: int, root_name: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Per-root-kind phase statistics over the most recent `cycles` traces.
+
+    Returns:
+        {root_name: {'cycles', 'errors', 'phases': {span_name: {count, p50_ms, p95_ms, max_ms, share}}}}
+    """
+    by_root: Dict[str, List[List[Dict]]] = defaultdict(list)
+    for spans in traces.values():
+        root = next((s for s in spans if not s.get('parentSpanId')), None)
+        if root is None or (root_name and root['name'] != root_name):
+            continue
+        by_root[root['name']].append(spans)
+
+    report = {}
+    for name, kind_traces in by_root.items():
+        kind_traces.sort(key=lambda spans: min(int(s['startTimeUnixNano']) for s in spans))
+        recent = kind_traces[-cycles:]
+
+        durations: Dict[str, List[float]] = defaultdict(list)
+        errors = 0
+        for spans in recent:
+            for record in spans:
+                durations[record['name']].append(_duration_ms(record))
+                if not record.get('parentSpanId') and record.get('status', {}).get('code') == 2:
+                    errors += 1
+
+        root_total = sum(durations[name]) or 1.0
+        phases = {}
+        for span_name, values in durations.items():
+            values_arr = np.asarray(values)
+            phases[span_name] = {
+                'count': len(values),
+                'p50_ms': round(float(np.percentile(values_arr, 50)), 2),
+                'p95_ms': round(float(np.percentile(values_arr, 95)), 2),
+                'max_ms': round(float(values_arr.max()), 2),
+                'share': round(float(values_arr.sum()) / root_total, 4)
+            }
+
+        report[name] = {
+            'cycles': len(recent),
+            'errors': errors,
+            'phases': dict(sorted(phases.items(), key=lambda item: -item[1]['share']))
+        }
+
+    return report
+
+
+def print_report(report: Dict[str, Dict]) -> None:
+    """Human-readable table per cycle kind"""
+    if not report:
+        print("No traces found")
+        return
+
+    for root_name, data in report.items():
+        print(f"\n📈 {root_name} — last {data['cycles']} cycles ({data['errors']} failed)")
+        print(f"   {'span':<40} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'share':>7}")
+        for span_name, stats in data['phases'].items():
+            print(
+                f"   {span_name:<40} {stats['count']:>6} {stats['p50_ms']:>10.1f} "
+                f"{stats['p95_ms']:>10.1f} {stats['max_ms']:>10.1f} {stats['share']:>6.1%}"
+            )
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Summarize sentient cycle traces')
+    parser.add_argument('--file', default=DEFAULT_TRACE_FILE, help='NDJSON trace file')
+    parser.add_argument('--cycles', type=int, default=20, help='Most recent cycles per kind')
+    parser.add_argument('--root', help='Only this cycle kind (e.g. sentient_cycle)')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    args = parser.parse_args()
+
+    path = Path(args.file)
+    if not path.exists():
+        print(f"Trace file not found: {path}")
+        sys.exit(1)
+
+    report = summarize(load_traces(path), args.cycles, args.root)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
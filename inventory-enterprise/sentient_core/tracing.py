@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+NeuroPilot v17.7 - Lightweight Cycle Tracing
+
+Nested timing spans for the sentient, engineering and genesis cycles.
+
+- `with span("phase.forecast") as s: s.set_attribute(...)` or `@traced("name")`
+- Parent/child links via contextvars (nesting follows the call stack)
+- Finished traces are appended to an NDJSON file, one OTLP-shaped span per line
+  (traceId, spanId, parentSpanId, name, start/endTimeUnixNano, attributes, status)
+- Summarize with: python3 sentient_core/scripts/trace_report.py
+
+Author: NeuroPilot AI Ops Team
+Version: 17.7.0
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger('sentient_tracing')
+
+DEFAULT_TRACE_FILE = os.getenv('NEUROPILOT_TRACE_FILE', 'logs/sentient/traces.ndjson')
+SERVICE_NAME = 'neuropilot-sentient'
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar('current_span', default=None)
+
+
+def _otlp_value(value: Any) -> Dict:
+    """OTLP AnyValue encoding"""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+class Span:
+    """One timed operation; children share its trace id"""
+
+    STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Optional[Dict] = None):
+        self.name = name
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status_code = Span.STATUS_UNSET
+        self.status_message = ''
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self._perf_start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+
+        # Finished descendants, flushed with the root span
+        self._finished: List["Span"] = [] if parent is None else parent._finished
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def set_error(self, message: str) -> None:
+        self.status_code = Span.STATUS_ERROR
+        self.status_message = message
+
+    def end(self) -> None:
+        self.duration_ms = (time.perf_counter() - self._perf_start) * 1000
+        self.end_ns = self.start_ns + int(self.duration_ms * 1e6)
+        if self.status_code == Span.STATUS_UNSET:
+            self.status_code = Span.STATUS_OK
+        self._finished.append(self)
+
+    def to_otlp(self) -> Dict:
+        """OTLP/JSON span (plus resource service name, so each line stands alone)"""
+        return {
+            'resource': {'service.name': SERVICE_NAME},
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent.span_id if self.parent else '',
+            'name': self.name,
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.end_ns),
+            'attributes': [{'key': key, 'value': _otlp_value(value)} for key, value in self.attributes.items()],
+            'status': {'code': self.status_code, 'message': self.status_message}
+        }
+
+
+class Tracer:
+    """Creates spans and appends finished traces to an NDJSON file"""
+
+    def __init__(self, path: str = DEFAULT_TRACE_FILE, max_bytes: int = 50 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.enabled = os.getenv('NEUROPILOT_TRACING', '1') != '0'
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, attributes: Optional[Dict] = None) -> Span:
+        return Span(name, _current_span.get(), attributes)
+
+    def span(self, name: str, **attributes):
+        """Context manager: time a block as a child of the current span"""
+        return _SpanContext(self, name, attributes)
+
+    def export(self, spans: List[Span]) -> None:
+        """Append a finished trace (one line per span, parents last)"""
+        if not self.enabled or not spans:
+            return
+
+        lines = ''.join(json.dumps(s.to_otlp(), default=str) + '\n' for s in spans)
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if self.path.exists() and self.path.stat().st_size > self.max_bytes:
+                    os.replace(self.path, self.path.with_suffix(self.path.suffix + '.1'))
+                with open(self.path, 'a') as f:
+                    f.write(lines)
+        except Exception as e:
+            logger.warning(f"Trace export failed: {e}")
+
+
+class _SpanContext:
+    def __init__(self, tracer: Tracer, name: str, attributes: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> Span:
+        self.span = self.tracer.start_span(self.name, self.attributes)
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc is not None:
+            self.span.set_error(f"{exc_type.__name__}: {exc}")
+        self.span.end()
+        _current_span.reset(self.token)
+
+        if self.span.parent is None:
+            self.tracer.export(self.span._finished)
+        return False
+
+
+tracer = Tracer()
+
+
+def span(name: str, **attributes):
+    """Time a block: `with span("phase.remediation", playbook=name) as s: ...`"""
+    return tracer.span(name, **attributes)
+
+
+def current_span() -> Optional[Span]:
+    """Innermost active span in this context (None outside any span)"""
+    return _current_span.get()
+
+
+def set_attributes(**attributes) -> None:
+    """Attach attributes to the current span, if any"""
+    active = _current_span.get()
+    if active is not None:
+        active.set_attributes(attributes)
+
+
+def record_error(message: str) -> None:
+    """Mark the current span failed (for errors caught and handled inside it)"""
+    active = _current_span.get()
+    if active is not None:
+        active.set_error(message)
+
+
+def traced(name: str) -> Callable:
+    """Decorator form of span()"""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator